@@ -6,13 +6,15 @@ import time
 from aiohttp import web
 
 # Core modules
-from core import config, setup_logging, get_logger
+from core import config, setup_logging, get_logger, cache_stats, close_caches
 
 # Database imports
-from db import init_db, close_db, initialize_repositories
+from db import db, init_db, close_db, initialize_repositories
 
 # AI service import
 from services.ai_service import ai_service
+from services.http_client import http_client
+from services.content_pool import pool_stats
 
 # Setup logging
 setup_logging()
@@ -46,6 +48,10 @@ class CerealBot(commands.Bot):
         await initialize_repositories()
         logger.info('✓ Repositories ready')
 
+        # Open the shared HTTP pool before cogs start borrowing it
+        await http_client.start()
+        logger.info('✓ HTTP client ready')
+
         # Initialize AI service
         ai_service.initialize()
         if ai_service.is_ready:
@@ -59,6 +65,7 @@ class CerealBot(commands.Bot):
             'cogs.games',
             'cogs.fun',
             'cogs.utility',
+            'cogs.giveaway',
             'cogs.ai'
         ]
 
@@ -134,6 +141,11 @@ class CerealBot(commands.Bot):
                 'users': len(self.users) if self.users else 0,
                 'latency': round(self.latency * 1000, 2) if self.latency else 0,
                 'uptime': str(time.time() - self.start_time) if hasattr(self, 'start_time') else 'unknown',
+                'database': db.pool_status(),
+                'caches': cache_stats(),
+                'http': http_client.stats(),
+                'content_pools': pool_stats(),
+                'ai': ai_service.stats(),
                 'timestamp': time.time()
             })
         except Exception as e:
@@ -156,6 +168,13 @@ class CerealBot(commands.Bot):
         
         # Close database connections
         await close_db()
+
+        # Stop cache invalidation listeners
+        await close_caches()
+
+        # Close the shared HTTP pools
+        await http_client.close()
+        await ai_service.close()
         
         await super().close()
     
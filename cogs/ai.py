@@ -4,10 +4,12 @@ Provides /ask (smart chat) and /summarize (message summarisation) commands.
 All AI API calls are delegated to the service layer — never called directly.
 """
 
+import asyncio
+
 import discord
 from discord import app_commands
 from discord.ext import commands
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict
 
 from services.ai_service import ai_service
 from core.logger import get_logger
@@ -18,10 +20,13 @@ logger = get_logger(__name__)
 # Constants
 # ---------------------------------------------------------------------------
 
-MAX_CONTEXT_MESSAGES: int = 10       # recent messages to include as context for /ask
+MAX_CONTEXT_MESSAGES: int = 25       # recent messages offered as /ask context; the service keeps what fits its token budget
 MAX_SUMMARY_MESSAGES: int = 200      # upper limit for /summarize fetch
 DEFAULT_SUMMARY_MESSAGES: int = 50   # default when user doesn't specify a count
 DISCORD_MAX_CONTENT: int = 2000       # Discord message content limit
+DISCORD_MAX_EMBED: int = 4096         # Discord embed description limit
+STREAM_EDIT_INTERVAL: float = 1.2     # min seconds between edits (Discord allows 5 per 5s per message)
+STREAM_CURSOR: str = " ▌"             # shown at the end of a response that is still arriving
 
 
 class AI(commands.Cog):
@@ -48,15 +53,17 @@ class AI(commands.Cog):
         # Gather recent messages from the channel for conversational context
         context_messages = await self._gather_context(interaction.channel)
 
-        # Call the service layer
-        response = await ai_service.ask(
-            user_message=question,
-            context_messages=context_messages,
+        # Stream the answer from the service layer into a live-updating embed
+        await self._stream_response(
+            interaction,
+            question,
+            ai_service.ask_stream(
+                user_message=question,
+                context_messages=context_messages,
+                guild_id=interaction.guild_id,
+            ),
         )
 
-        # Send the response — may need to split if it exceeds Discord's limit
-        await self._send_response(interaction, question, response)
-
         logger.info(
             f"/ask used by {interaction.user} in #{interaction.channel.name}: "
             f"{question[:80]}{'…' if len(question) > 80 else ''}"
@@ -97,6 +104,7 @@ class AI(commands.Cog):
         summary = await ai_service.summarize(
             messages_text=messages_text,
             channel_name=channel_name,
+            guild_id=interaction.guild_id,
         )
 
         # Build embed
@@ -133,16 +141,15 @@ class AI(commands.Cog):
         context: List[Dict[str, str]] = []
 
         try:
+            # history() walks from the newest message unless oldest_first is set
+            # (which would start at the channel's very first message instead)
             messages = [
                 msg
-                async for msg in channel.history(
-                    limit=MAX_CONTEXT_MESSAGES,
-                    oldest_first=True,
-                )
+                async for msg in channel.history(limit=MAX_CONTEXT_MESSAGES)
             ]
 
             # oldest → newest order
-            for msg in messages:
+            for msg in reversed(messages):
                 if msg.author.bot:
                     role = "assistant"
                 else:
@@ -210,6 +217,56 @@ class AI(commands.Cog):
 
         return "\n".join(lines), len(lines)
 
+    async def _stream_response(
+        self,
+        interaction: discord.Interaction,
+        question: str,
+        deltas: AsyncIterator[str],
+    ):
+        """
+        Show the AI response while it is generated, editing one followup embed.
+
+        The first text is sent as soon as it arrives; after that the embed is
+        edited at most once per STREAM_EDIT_INTERVAL, the final edit included,
+        to stay clear of Discord's edit rate limit. The final edit always
+        carries the complete answer, spilling into extra embeds if it outgrows one.
+        """
+        loop = asyncio.get_running_loop()
+        title = self._title(question)
+        message = None
+        last_edit = 0.0
+        response = ""
+
+        async for delta in deltas:
+            response += delta
+            if len(response) + len(STREAM_CURSOR) > DISCORD_MAX_EMBED:
+                continue  # the overflow is split out once the stream ends
+            if loop.time() - last_edit < STREAM_EDIT_INTERVAL:
+                continue
+
+            embed = self._answer_embed(interaction, title, response + STREAM_CURSOR)
+            try:
+                if message is None:
+                    message = await interaction.followup.send(embed=embed, wait=True)
+                else:
+                    await message.edit(embed=embed)
+            except discord.HTTPException as exc:
+                logger.warning(f"Progressive /ask edit failed: {exc}")
+            last_edit = loop.time()
+
+        response = response.strip() or "⚠️ AI returned an empty response. Please try again."
+        if message is None:
+            await self._send_response(interaction, question, response)
+            return
+
+        chunks = self._split_text(response, max_len=DISCORD_MAX_EMBED)
+        await asyncio.sleep(last_edit + STREAM_EDIT_INTERVAL - loop.time())
+        await message.edit(embed=self._answer_embed(interaction, title, chunks[0]))
+        for chunk in chunks[1:]:
+            await interaction.followup.send(
+                embed=discord.Embed(description=chunk, color=discord.Color.blurple())
+            )
+
     async def _send_response(
         self,
         interaction: discord.Interaction,
@@ -217,42 +274,37 @@ class AI(commands.Cog):
         response: str,
     ):
         """Send the AI response as a nicely formatted embed, splitting if needed."""
+        chunks = self._split_text(response, max_len=DISCORD_MAX_EMBED)
 
-        # Truncate question for embed title
-        title = f"{question[:80]}{'…' if len(question) > 80 else ''}"
+        # First chunk as embed
+        await interaction.followup.send(
+            embed=self._answer_embed(interaction, self._title(question), chunks[0])
+        )
 
-        # If the response fits in a single embed, send it directly
-        if len(response) <= 4096:
+        # Remaining chunks as follow-ups
+        for chunk in chunks[1:]:
             embed = discord.Embed(
-                title=title,
-                description=response,
+                description=chunk,
                 color=discord.Color.blurple(),
-                timestamp=interaction.created_at,
             )
-            embed.set_footer(text="Powered by Groq")
             await interaction.followup.send(embed=embed)
-            return
 
-        # Otherwise, split into multiple messages
-        chunks = self._split_text(response, max_len=4096)
+    @staticmethod
+    def _title(question: str) -> str:
+        """Truncate the question for use as an embed title."""
+        return f"{question[:80]}{'…' if len(question) > 80 else ''}"
 
-        # First chunk as embed
+    @staticmethod
+    def _answer_embed(interaction: discord.Interaction, title: str, text: str) -> discord.Embed:
+        """The embed an /ask answer is shown in."""
         embed = discord.Embed(
             title=title,
-            description=chunks[0],
+            description=text,
             color=discord.Color.blurple(),
             timestamp=interaction.created_at,
         )
         embed.set_footer(text="Powered by Groq")
-        await interaction.followup.send(embed=embed)
-
-        # Remaining chunks as follow-ups
-        for chunk in chunks[1:]:
-            embed = discord.Embed(
-                description=chunk,
-                color=discord.Color.blurple(),
-            )
-            await interaction.followup.send(embed=embed)
+        return embed
 
     @staticmethod
     def _truncate(text: str, max_len: int = 4096) -> str:
@@ -2,102 +2,149 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import random
-import aiohttp
+
+from services.http_client import http_client
+from services.memes import meme_buffer
+from services.content_pool import ContentPool
+
+# zenquotes allows 5 requests per 30s per IP, and /quotes returns 50 at once
+QUOTE_POOL_SIZE = 50
+QUOTE_MIN_INTERVAL = 7.0
+
+FALLBACK_ROASTS = [
+    "I'd explain it to you but I left my crayons at home.",
+    "you're like a cloud. When you disappear, it's a beautiful day.",
+    "if brains were dynamite, you wouldn't have enough to blow your nose.",
+    "you bring everyone so much joy... when you leave the room.",
+    "I'd agree with you but then we'd both be wrong.",
+    "you're proof that evolution can go in reverse.",
+    "somewhere out there is a tree tirelessly producing oxygen for you. Go apologize to it.",
+]
+
+
+async def _get_json(url: str, **kwargs):
+    """GET a JSON document through the shared client, or None on a non-200"""
+    async with http_client.get(url, **kwargs) as resp:
+        if resp.status != 200:
+            return None
+        return await resp.json(content_type=None)
+
+
+async def fetch_dad_joke():
+    data = await _get_json('https://icanhazdadjoke.com/', headers={'Accept': 'application/json'})
+    return data['joke'] if data else None
+
+
+async def fetch_fact():
+    data = await _get_json('https://uselessfacts.jsph.pl/random.json?language=en')
+    return data['text'] if data else None
+
+
+async def fetch_roast():
+    data = await _get_json('https://evilinsult.com/generate_insult.php?lang=en&type=json')
+    return data['insult'] if data else None
+
+
+async def fetch_quotes():
+    data = await _get_json('https://zenquotes.io/api/quotes')
+    if not data:
+        return None
+    # A rate-limited caller gets a 200 with a notice in place of the quotes
+    return [(quote['q'], quote['a']) for quote in data if quote.get('a') != 'zenquotes.io']
+
+
+async def fetch_joke():
+    # Use JokeAPI for clean jokes
+    data = await _get_json("https://v2.jokeapi.dev/joke/Any?blacklistFlags=nsfw,religious,political,racist,sexist,explicit&type=single")
+    if not data or data.get('error'):
+        return None
+    return data['joke'], data.get('category')
+
+
+async def fetch_nope():
+    data = await _get_json('https://naas.isalman.dev/no', headers={'User-agent': 'Cereal Bot 1.0'})
+    return data.get('reason', 'I just can\'t right now.') if data else None
+
 
 class Fun(commands.Cog):
     """Fun commands and memes"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.session = None
+        # A few items per source are kept warm so commands answer from memory;
+        # quotes come in bulk, paced to zenquotes' rate limit
+        self.pools = {
+            'dadjoke': ContentPool('dadjoke', fetch_dad_joke),
+            'fact': ContentPool('fact', fetch_fact),
+            'roast': ContentPool('roast', fetch_roast),
+            'quote': ContentPool(
+                'quote', fetch_quotes, size=QUOTE_POOL_SIZE, min_interval=QUOTE_MIN_INTERVAL, batch=True
+            ),
+            'joke': ContentPool('joke', fetch_joke),
+            'nope': ContentPool('nope', fetch_nope),
+        }
     
     async def cog_load(self):
-        """Create aiohttp session when cog loads"""
-        self.session = aiohttp.ClientSession()
+        """Start prefetching memes and content when cog loads"""
+        meme_buffer.start()
+        for pool in self.pools.values():
+            pool.start()
     
     async def cog_unload(self):
-        """Close aiohttp session when cog unloads"""
-        if self.session:
-            await self.session.close()
+        """Stop the prefetchers when cog unloads"""
+        await meme_buffer.stop()
+        for pool in self.pools.values():
+            await pool.stop()
     
     @app_commands.command(name='meme', description='Get a random meme from Reddit')
     async def meme(self, interaction: discord.Interaction):
         """Get a random meme from Reddit"""
-        subreddits = ['darkjokes', 'shitpost','dankmemes', 'me_irl', 'funny','shitposting']
+        # Served from the prefetched buffer; only fetches live when it's empty
+        meme = meme_buffer.pop()
+        if meme is None:
+            await interaction.response.defer()
+            meme = await meme_buffer.get()
+        send = interaction.followup.send if interaction.response.is_done() else interaction.response.send_message
+        if meme is None:
+            return await send("❌ Couldn't fetch a meme right now. Try again!", ephemeral=True)
         
-        # Try multiple times to get a valid image meme
-        for attempt in range(5):
-            subreddit = random.choice(subreddits)
-            
-            try:
-                async with self.session.get(
-                    f'https://www.reddit.com/r/{subreddit}/hot.json?limit=100',
-                    headers={'User-agent': 'Cereal Bot 1.0'}
-                ) as resp:
-                    if resp.status != 200:
-                        continue
-                    
-                    data = await resp.json()
-                    posts = data['data']['children']
-                    
-                    # Filter for image posts only
-                    image_posts = [
-                        post['data'] for post in posts 
-                        if post['data'].get('post_hint') == 'image' 
-                        and not post['data'].get('over_18', False)
-                    ]
-                    
-                    if not image_posts:
-                        continue
-                    
-                    post = random.choice(image_posts)
-                    
-                    embed = discord.Embed(
-                        title=post['title'][:256],  # Discord limit
-                        color=discord.Color.random(),
-                        url=f"https://reddit.com{post['permalink']}"
-                    )
-                    embed.set_image(url=post['url'])
-                    embed.set_footer(text=f"👍 {post['ups']} | r/{subreddit}")
-                    
-                    return await interaction.response.send_message(embed=embed)
-                    
-            except Exception as e:
-                print(f"Meme error attempt {attempt + 1}: {e}")
-                continue
+        embed = discord.Embed(
+            title=meme.title,
+            color=discord.Color.random(),
+            url=f"https://reddit.com{meme.permalink}"
+        )
+        embed.set_image(url=meme.url)
+        embed.set_footer(text=f"👍 {meme.ups} | r/{meme.subreddit}")
         
-        await interaction.response.send_message("❌ Couldn't fetch a meme right now. Try again!", ephemeral=True)
+        await send(embed=embed)
     
     @app_commands.command(name='dadjoke', description='Get a random dad joke')
     async def dad_joke(self, interaction: discord.Interaction):
         """Get a random dad joke"""
-        async with self.session.get('https://icanhazdadjoke.com/',
-                                   headers={'Accept': 'application/json'}) as resp:
-            if resp.status == 200:
-                data = await resp.json()
-                embed = discord.Embed(
-                    title="😄 Dad Joke",
-                    description=data['joke'],
-                    color=discord.Color.blue()
-                )
-                await interaction.response.send_message(embed=embed)
-            else:
-                await interaction.response.send_message("❌ Couldn't fetch a joke right now!", ephemeral=True)
+        joke = await self.pools['dadjoke'].get()
+        if joke is None:
+            return await interaction.response.send_message("❌ Couldn't fetch a joke right now!", ephemeral=True)
+        
+        embed = discord.Embed(
+            title="😄 Dad Joke",
+            description=joke,
+            color=discord.Color.blue()
+        )
+        await interaction.response.send_message(embed=embed)
     
     @app_commands.command(name='fact', description='Get a random fact')
     async def random_fact(self, interaction: discord.Interaction):
         """Get a random fact"""
-        async with self.session.get('https://uselessfacts.jsph.pl/random.json?language=en') as resp:
-            if resp.status == 200:
-                data = await resp.json()
-                embed = discord.Embed(
-                    title="🧠 Random Fact",
-                    description=data['text'],
-                    color=discord.Color.green()
-                )
-                await interaction.response.send_message(embed=embed)
-            else:
-                await interaction.response.send_message("❌ Couldn't fetch a fact right now!", ephemeral=True)
+        fact = await self.pools['fact'].get()
+        if fact is None:
+            return await interaction.response.send_message("❌ Couldn't fetch a fact right now!", ephemeral=True)
+        
+        embed = discord.Embed(
+            title="🧠 Random Fact",
+            description=fact,
+            color=discord.Color.green()
+        )
+        await interaction.response.send_message(embed=embed)
     
     @app_commands.command(name='roast', description='Roast someone (or yourself)')
     @app_commands.describe(member='The member to roast (optional)')
@@ -105,35 +152,8 @@ class Fun(commands.Cog):
         """Roast someone (or yourself)"""
         target = member or interaction.user
         
-        try:
-            async with self.session.get('https://evilinsult.com/generate_insult.php?lang=en&type=json') as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    roast_text = data['insult']
-                else:
-                    # Fallback to hardcoded roasts
-                    roasts = [
-                        f"{target.mention}, I'd explain it to you but I left my crayons at home.",
-                        f"{target.mention}, you're like a cloud. When you disappear, it's a beautiful day.",
-                        f"{target.mention}, if brains were dynamite, you wouldn't have enough to blow your nose.",
-                        f"{target.mention}, you bring everyone so much joy... when you leave the room.",
-                        f"{target.mention}, I'd agree with you but then we'd both be wrong.",
-                        f"{target.mention}, you're proof that evolution can go in reverse.",
-                        f"{target.mention}, somewhere out there is a tree tirelessly producing oxygen for you. Go apologize to it.",
-                    ]
-                    roast_text = random.choice(roasts)
-        except:
-            # Fallback if API fails
-            roasts = [
-                f"{target.mention}, I'd explain it to you but I left my crayons at home.",
-                f"{target.mention}, you're like a cloud. When you disappear, it's a beautiful day.",
-                f"{target.mention}, if brains were dynamite, you wouldn't have enough to blow your nose.",
-                f"{target.mention}, you bring everyone so much joy... when you leave the room.",
-                f"{target.mention}, I'd agree with you but then we'd both be wrong.",
-                f"{target.mention}, you're proof that evolution can go in reverse.",
-                f"{target.mention}, somewhere out there is a tree tirelessly producing oxygen for you. Go apologize to it.",
-            ]
-            roast_text = random.choice(roasts)
+        # Fall back to hardcoded roasts if the API is down
+        roast_text = await self.pools['roast'].get() or random.choice(FALLBACK_ROASTS)
         
         embed = discord.Embed(
             title="🔥 Roasted!",
@@ -179,26 +199,17 @@ class Fun(commands.Cog):
     @app_commands.command(name='quote', description='Get an inspirational quote')
     async def quote(self, interaction: discord.Interaction):
         """Get an inspirational quote"""
-        try:
-            async with self.session.get('https://zenquotes.io/api/random') as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    if data and len(data) > 0:
-                        quote_text = data[0]['q']
-                        author = data[0]['a']
-                        
-                        embed = discord.Embed(
-                            title="✍️...",
-                            description=f'\n\n"{quote_text}"\n\n— {author}',
-                            color=discord.Color.blue()
-                        )
-                        await interaction.response.send_message(embed=embed)
-                    else:
-                        await interaction.response.send_message("❌ Couldn't fetch a quote right now!", ephemeral=True)
-                else:
-                    await interaction.response.send_message("❌ Couldn't fetch a quote right now!", ephemeral=True)
-        except:
-            await interaction.response.send_message("❌ Couldn't fetch a quote right now!", ephemeral=True)
+        quote = await self.pools['quote'].get()
+        if quote is None:
+            return await interaction.response.send_message("❌ Couldn't fetch a quote right now!", ephemeral=True)
+        
+        quote_text, author = quote
+        embed = discord.Embed(
+            title="✍️...",
+            description=f'\n\n"{quote_text}"\n\n— {author}',
+            color=discord.Color.blue()
+        )
+        await interaction.response.send_message(embed=embed)
     
     @app_commands.command(name='ship', description='Ship two members together')
     @app_commands.describe(member1='First member', member2='Second member (optional)')
@@ -327,74 +338,43 @@ class Fun(commands.Cog):
     @app_commands.command(name='joke', description='Get a random joke')
     async def joke(self, interaction: discord.Interaction):
         """Get a random joke from JokeAPI"""
-        try:
-            # Use JokeAPI for clean jokes
-            url = "https://v2.jokeapi.dev/joke/Any?blacklistFlags=nsfw,religious,political,racist,sexist,explicit&type=single"
-            async with self.session.get(url) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-
-                    if data.get('error'):
-                        return await interaction.response.send_message(
-                            "❌ Couldn't fetch a joke right now!",
-                            ephemeral=True
-                        )
-
-                    embed = discord.Embed(
-                        title="😂 Random Joke",
-                        description=data['joke'],
-                        color=discord.Color.orange()
-                    )
+        joke = await self.pools['joke'].get()
+        if joke is None:
+            return await interaction.response.send_message(
+                "❌ Couldn't fetch a joke right now!",
+                ephemeral=True
+            )
 
-                    if data.get('category'):
-                        embed.set_footer(text=f"Category: {data['category']}")
+        joke_text, category = joke
+        embed = discord.Embed(
+            title="😂 Random Joke",
+            description=joke_text,
+            color=discord.Color.orange()
+        )
 
-                    await interaction.response.send_message(embed=embed)
-                else:
-                    await interaction.response.send_message(
-                        "❌ Couldn't fetch a joke right now!",
-                        ephemeral=True
-                    )
+        if category:
+            embed.set_footer(text=f"Category: {category}")
 
-        except Exception as e:
-            print(f"Joke error: {e}")
-            await interaction.response.send_message(
-                "❌ Error fetching joke. Try again later.",
-                ephemeral=True
-            )
+        await interaction.response.send_message(embed=embed)
 
     @app_commands.command(name='nope', description='Get a creative excuse to say no')
     async def nope(self, interaction: discord.Interaction):
         """Get a random excuse to say no using no-as-a-service"""
-        try:
-            async with self.session.get(
-                'https://naas.isalman.dev/no',
-                headers={'User-agent': 'Cereal Bot 1.0'}
-            ) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    reason = data.get('reason', 'I just can\'t right now.')
-
-                    embed = discord.Embed(
-                        title="❌ Nope!",
-                        description=reason,
-                        color=discord.Color.red()
-                    )
-                    embed.set_footer(text="Powered by no-as-a-service")
-
-                    await interaction.response.send_message(embed=embed)
-                else:
-                    await interaction.response.send_message(
-                        "❌ Couldn't get an excuse right now!",
-                        ephemeral=True
-                    )
-
-        except Exception as e:
-            print(f"Nope error: {e}")
-            await interaction.response.send_message(
-                "❌ Error getting excuse. Try again later.",
+        reason = await self.pools['nope'].get()
+        if reason is None:
+            return await interaction.response.send_message(
+                "❌ Couldn't get an excuse right now!",
                 ephemeral=True
             )
 
+        embed = discord.Embed(
+            title="❌ Nope!",
+            description=reason,
+            color=discord.Color.red()
+        )
+        embed.set_footer(text="Powered by no-as-a-service")
+
+        await interaction.response.send_message(embed=embed)
+
 async def setup(bot):
     await bot.add_cog(Fun(bot))
\ No newline at end of file
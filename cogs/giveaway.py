@@ -0,0 +1,337 @@
+"""
+Giveaway Cog for Cereal Bot
+Provides /giveaway start, end, reroll and list.
+Giveaways end on time via an in-memory deadline scheduler seeded from the
+database at startup — nothing polls the giveaways table.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from core.constants import Emojis
+from core.logger import get_logger
+from db import giveaway_repo
+from services.scheduler import DeadlineScheduler, parse_duration
+
+logger = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+MAX_GIVEAWAY_DURATION = timedelta(days=30)
+MAX_WINNERS: int = 20
+FINISH_RETRY_BASE_SECONDS: float = 30.0  # Doubled per failed attempt to end a giveaway
+FINISH_RETRY_MAX_SECONDS: float = 900.0
+
+
+def _timestamp(dt: datetime) -> int:
+    """Unix timestamp of a naive UTC datetime, for Discord <t:...> markup"""
+    return int(dt.replace(tzinfo=timezone.utc).timestamp())
+
+
+class GiveawayEntryButton(discord.ui.DynamicItem[discord.ui.Button], template=r'giveaway:enter:(?P<id>[0-9]+)'):
+    """Persistent 'Enter' button; the giveaway ID lives in the custom_id so it survives restarts"""
+
+    def __init__(self, giveaway_id: int):
+        self.giveaway_id = giveaway_id
+        super().__init__(
+            discord.ui.Button(
+                label="Enter",
+                style=discord.ButtonStyle.success,
+                emoji=Emojis.PARTY,
+                custom_id=f"giveaway:enter:{giveaway_id}",
+            )
+        )
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match['id']))
+
+    async def callback(self, interaction: discord.Interaction):
+        """Enter the giveaway; entering twice changes nothing"""
+        if await giveaway_repo.add_participant(self.giveaway_id, interaction.user.id):
+            return await interaction.response.send_message(f"{Emojis.PARTY} You're in! Good luck!", ephemeral=True)
+
+        if await giveaway_repo.get_value('active', id=self.giveaway_id):
+            return await interaction.response.send_message(
+                "You've already entered! Press **Leave** if you want to withdraw.", ephemeral=True
+            )
+
+        await interaction.response.send_message("❌ This giveaway has already ended!", ephemeral=True)
+
+
+class GiveawayLeaveButton(discord.ui.DynamicItem[discord.ui.Button], template=r'giveaway:leave:(?P<id>[0-9]+)'):
+    """Persistent 'Leave' button, the explicit way out of a giveaway"""
+
+    def __init__(self, giveaway_id: int):
+        self.giveaway_id = giveaway_id
+        super().__init__(
+            discord.ui.Button(
+                label="Leave",
+                style=discord.ButtonStyle.secondary,
+                custom_id=f"giveaway:leave:{giveaway_id}",
+            )
+        )
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match['id']))
+
+    async def callback(self, interaction: discord.Interaction):
+        """Withdraw from the giveaway"""
+        if await giveaway_repo.remove_participant(self.giveaway_id, interaction.user.id):
+            return await interaction.response.send_message("You've left the giveaway.", ephemeral=True)
+
+        if await giveaway_repo.get_value('active', id=self.giveaway_id):
+            return await interaction.response.send_message("❌ You haven't entered this giveaway!", ephemeral=True)
+
+        await interaction.response.send_message("❌ This giveaway has already ended!", ephemeral=True)
+
+
+class Giveaways(commands.Cog):
+    """Giveaways with button entry and on-time draws."""
+
+    giveaway = app_commands.Group(
+        name="giveaway",
+        description="Run giveaways in this server",
+        guild_only=True,
+        default_permissions=discord.Permissions(manage_guild=True),
+    )
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.scheduler = DeadlineScheduler("giveaways", self._end_due)
+        self._failed_attempts: Dict[int, int] = {}
+        self._ending: Set[int] = set()  # Giveaways with a _finish in flight
+        self._announced: Set[int] = set()  # Announced, but not yet marked ended
+
+    async def cog_load(self):
+        """Register the giveaway buttons and schedule every running giveaway"""
+        self.bot.add_dynamic_items(GiveawayEntryButton, GiveawayLeaveButton)
+
+        # Giveaways that ended while we were offline are due immediately
+        deadlines = await giveaway_repo.get_active_deadlines()
+        for giveaway_id, end_time in deadlines:
+            self.scheduler.schedule(giveaway_id, end_time)
+        self.scheduler.start()
+
+        logger.info(f"Scheduled {len(deadlines)} active giveaway(s)")
+
+    async def cog_unload(self):
+        """Stop the scheduler and unregister the giveaway buttons"""
+        await self.scheduler.stop()
+        self.bot.remove_dynamic_items(GiveawayEntryButton, GiveawayLeaveButton)
+
+    # ------------------------------------------------------------------
+    # Ending
+    # ------------------------------------------------------------------
+
+    async def _end_due(self, giveaway_ids: List[int]):
+        """Scheduler callback: end every giveaway whose deadline has passed"""
+        await self.bot.wait_until_ready()
+        await asyncio.gather(*(self._finish(giveaway_id) for giveaway_id in giveaway_ids))
+
+    async def _finish(self, giveaway_id: int) -> bool:
+        """
+        End a giveaway, draw winners and announce them
+
+        The giveaway is only marked ended once the announcement went out, so
+        any failure leaves it active: it is rescheduled with exponential
+        backoff here, and a restart picks it up again from the active seed.
+
+        Returns:
+            True if this call ended the giveaway, False if it was already over or failed
+        """
+        # An early /giveaway end and the scheduler must not both draw
+        if giveaway_id in self._ending:
+            return False
+        self._ending.add(giveaway_id)
+        try:
+            # A retry after the announcement only needs to record the end
+            if giveaway_id not in self._announced:
+                giveaway = await giveaway_repo.get_by_id(giveaway_id)
+                if giveaway is None or not giveaway.active:
+                    self._failed_attempts.pop(giveaway_id, None)
+                    return False
+
+                winners = await giveaway_repo.pick_winners(giveaway_id, giveaway.winner_count)
+                entrants = await giveaway_repo.get_participant_count(giveaway_id)
+                await self._announce(giveaway, winners, entrants)
+                self._announced.add(giveaway_id)
+
+            await giveaway_repo.update({'id': giveaway_id, 'active': True}, active=False)
+            self._announced.discard(giveaway_id)
+            self._failed_attempts.pop(giveaway_id, None)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to end giveaway {giveaway_id}: {e}", exc_info=True)
+            self._retry_finish(giveaway_id)
+            return False
+        finally:
+            self._ending.discard(giveaway_id)
+
+    def _retry_finish(self, giveaway_id: int):
+        """Schedule another attempt at ending a giveaway, backing off per failure"""
+        attempts = self._failed_attempts.get(giveaway_id, 0) + 1
+        self._failed_attempts[giveaway_id] = attempts
+        delay = min(FINISH_RETRY_MAX_SECONDS, FINISH_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+        self.scheduler.schedule(giveaway_id, datetime.utcnow() + timedelta(seconds=delay))
+        logger.warning(f"Giveaway {giveaway_id}: retrying in {delay:.0f}s (attempt {attempts + 1})")
+
+    async def _announce(self, giveaway, winners: List[int], entrants: int):
+        """Update the giveaway message and ping the winners"""
+        channel = self.bot.get_channel(giveaway.channel_id)
+        if channel is None:
+            logger.warning(f"Giveaway {giveaway.id}: channel {giveaway.channel_id} is gone")
+            return
+
+        message = channel.get_partial_message(giveaway.message_id)
+        mentions = ", ".join(f"<@{user_id}>" for user_id in winners)
+
+        embed = self._embed(giveaway, ended=True)
+        embed.add_field(name="Winners", value=mentions or "No valid entries", inline=False)
+        embed.add_field(name="Entries", value=str(entrants))
+
+        try:
+            await message.edit(embed=embed, view=None)
+        except discord.HTTPException as e:
+            logger.warning(f"Giveaway {giveaway.id}: could not edit message: {e}")
+
+        if winners:
+            content = f"{Emojis.PARTY} Congratulations {mentions}! You won **{giveaway.prize}**!"
+        else:
+            content = f"The giveaway for **{giveaway.prize}** ended with no entries."
+        await channel.send(content, reference=message.to_reference(fail_if_not_exists=False))
+
+    def _embed(self, giveaway, ended: bool = False) -> discord.Embed:
+        embed = discord.Embed(
+            title=f"{Emojis.PARTY} {giveaway.title}",
+            description=giveaway.description or "",
+            color=discord.Color.dark_grey() if ended else discord.Color.gold(),
+        )
+        embed.add_field(name="Prize", value=giveaway.prize, inline=False)
+        when = f"<t:{_timestamp(giveaway.end_time)}:{'f' if ended else 'R'}>"
+        embed.add_field(name="Ended" if ended else "Ends", value=when)
+        embed.add_field(name="Hosted by", value=f"<@{giveaway.created_by}>")
+        embed.set_footer(text=f"Giveaway #{giveaway.id} • {giveaway.winner_count} winner(s)")
+        return embed
+
+    # ------------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------------
+
+    @giveaway.command(name="start", description="Start a giveaway in this channel")
+    @app_commands.describe(
+        prize="What the winners get",
+        duration="How long it runs, e.g. 30m, 2h, 1d",
+        winners="Number of winners",
+        description="Optional details shown on the giveaway",
+    )
+    async def start(
+        self,
+        interaction: discord.Interaction,
+        prize: str,
+        duration: str,
+        winners: app_commands.Range[int, 1, MAX_WINNERS] = 1,
+        description: Optional[str] = None,
+    ):
+        """Post a giveaway with an entry button and schedule its end."""
+        length = parse_duration(duration)
+        if length is None or length > MAX_GIVEAWAY_DURATION:
+            return await interaction.response.send_message(
+                "❌ Invalid duration! Use e.g. 30m, 2h or 1d (max 30 days)", ephemeral=True
+            )
+
+        # The database work and the channel post can outlast the 3s interaction window
+        await interaction.response.defer(ephemeral=True)
+
+        giveaway = await giveaway_repo.create(
+            guild_id=interaction.guild_id,
+            channel_id=interaction.channel_id,
+            message_id=0,  # Set once the message exists; the button needs the ID first
+            title=f"Giveaway: {prize}"[:200],
+            description=description,
+            prize=prize[:200],
+            winner_count=winners,
+            end_time=datetime.utcnow() + length,
+            created_by=interaction.user.id,
+        )
+
+        view = discord.ui.View(timeout=None)
+        view.add_item(GiveawayEntryButton(giveaway.id))
+        view.add_item(GiveawayLeaveButton(giveaway.id))
+        try:
+            message = await interaction.channel.send(embed=self._embed(giveaway), view=view)
+        except discord.HTTPException:
+            await giveaway_repo.delete(id=giveaway.id)
+            return await interaction.followup.send("❌ I couldn't post the giveaway in this channel!")
+
+        await giveaway_repo.update({'id': giveaway.id}, message_id=message.id)
+        self.scheduler.schedule(giveaway.id, giveaway.end_time)
+
+        await interaction.followup.send(f"{Emojis.SUCCESS} Giveaway #{giveaway.id} started!")
+        logger.info(f"Giveaway {giveaway.id} started by {interaction.user} in guild {interaction.guild_id}")
+
+    @giveaway.command(name="end", description="End a giveaway now and draw winners")
+    @app_commands.describe(giveaway_id="The giveaway number shown in its footer")
+    async def end(self, interaction: discord.Interaction, giveaway_id: int):
+        """End a running giveaway early."""
+        if await giveaway_repo.get_value('guild_id', id=giveaway_id) != interaction.guild_id:
+            return await interaction.response.send_message("❌ Giveaway not found!", ephemeral=True)
+
+        await interaction.response.defer(ephemeral=True)
+        self.scheduler.cancel(giveaway_id)
+        if await self._finish(giveaway_id):
+            await interaction.followup.send(f"{Emojis.SUCCESS} Giveaway #{giveaway_id} ended.")
+        else:
+            await interaction.followup.send("❌ That giveaway has already ended!")
+
+    @giveaway.command(name="reroll", description="Draw new winners for an ended giveaway")
+    @app_commands.describe(giveaway_id="The giveaway number shown in its footer", winners="Number of winners to draw")
+    async def reroll(
+        self,
+        interaction: discord.Interaction,
+        giveaway_id: int,
+        winners: app_commands.Range[int, 1, MAX_WINNERS] = 1,
+    ):
+        """Pick replacement winners from an ended giveaway's entrants."""
+        giveaway = await giveaway_repo.get_row('guild_id', 'active', 'prize', id=giveaway_id)
+        if giveaway is None or giveaway['guild_id'] != interaction.guild_id:
+            return await interaction.response.send_message("❌ Giveaway not found!", ephemeral=True)
+        if giveaway['active']:
+            return await interaction.response.send_message("❌ That giveaway is still running!", ephemeral=True)
+
+        drawn = await giveaway_repo.pick_winners(giveaway_id, winners)
+        if not drawn:
+            return await interaction.response.send_message("❌ That giveaway had no entries!", ephemeral=True)
+
+        mentions = ", ".join(f"<@{user_id}>" for user_id in drawn)
+        await interaction.response.send_message(
+            f"{Emojis.PARTY} New winner(s) for **{giveaway['prize']}**: {mentions}!"
+        )
+
+    @giveaway.command(name="list", description="Show running giveaways in this server")
+    async def list_giveaways(self, interaction: discord.Interaction):
+        """List active giveaways for this guild."""
+        giveaways = await giveaway_repo.get_active_giveaways(interaction.guild_id)
+        if not giveaways:
+            return await interaction.response.send_message("There are no running giveaways.", ephemeral=True)
+
+        embed = discord.Embed(title=f"{Emojis.PARTY} Running Giveaways", color=discord.Color.gold())
+        for giveaway in sorted(giveaways, key=lambda g: g.end_time)[:25]:
+            embed.add_field(
+                name=f"#{giveaway.id} — {giveaway.prize}",
+                value=f"Ends <t:{_timestamp(giveaway.end_time)}:R> in <#{giveaway.channel_id}>",
+                inline=False,
+            )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Giveaways(bot))
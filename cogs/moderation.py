@@ -4,9 +4,70 @@ from discord.ext import commands
 from datetime import timedelta
 
 # Database imports
-from db import warning_repo, user_repo, guild_repo
+from db import db, warning_repo, user_repo, guild_repo
 import asyncio
 
+WARNINGS_PER_PAGE = 5
+
+
+def warnings_embed(guild: discord.Guild, target_user, warnings, total: int, shown: int) -> discord.Embed:
+    """Embed for one page of warnings, newest first; shown is how many came before this page"""
+    embed = discord.Embed(
+        title=f"⚠️ Warnings for {target_user.name}",
+        color=discord.Color.orange()
+    )
+
+    for i, warning in enumerate(warnings):
+        moderator = guild.get_member(warning.moderator_id)
+        moderator_name = moderator.name if moderator else f"User {warning.moderator_id}"
+
+        embed.add_field(
+            name=f"Warning #{total - shown - i}",
+            value=f"**Reason:** {warning.reason}\n"
+                  f"**Moderator:** {moderator_name}\n"
+                  f"**Date:** {warning.created_at.strftime('%Y-%m-%d %H:%M')}",
+            inline=False
+        )
+
+    embed.set_footer(text=f"Total warnings: {total}")
+    return embed
+
+
+class WarningsPageView(discord.ui.View):
+    """'Next page' button walking a member's warnings by keyset cursor"""
+
+    def __init__(self, user, target_user, total: int, cursor: str):
+        super().__init__(timeout=120.0)
+        self.user = user
+        self.target_user = target_user
+        self.total = total
+        self.cursor = cursor
+        self.shown = WARNINGS_PER_PAGE
+
+    @discord.ui.button(label="Next page", style=discord.ButtonStyle.secondary, emoji="➡️")
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user != self.user:
+            return await interaction.response.send_message("These aren't your results!", ephemeral=True)
+
+        try:
+            page = await warning_repo.get_warning_page(
+                interaction.guild.id,
+                self.target_user.id,
+                cursor=self.cursor,
+                per_page=WARNINGS_PER_PAGE
+            )
+        except ValueError:
+            self.stop()
+            return await interaction.response.edit_message(view=None)
+
+        embed = warnings_embed(interaction.guild, self.target_user, page['items'], self.total, self.shown)
+        self.shown += len(page['items'])
+        self.cursor = page['next_cursor']
+        if self.cursor is None:
+            self.stop()
+        await interaction.response.edit_message(embed=embed, view=self if self.cursor else None)
+
+
 class Moderation(commands.Cog):
     """Moderation commands for server management"""
     
@@ -178,19 +239,20 @@ class Moderation(commands.Cog):
             return await interaction.response.send_message("❌ I cannot warn myself!", ephemeral=True)
 
         try:
-            # Add warning to database
-            warning = await warning_repo.add_warning(
-                guild_id=interaction.guild.id,
-                user_id=member.id,
-                moderator_id=interaction.user.id,
-                reason=reason or "No reason provided"
-            )
+            # Add warning and read the new count in a single transaction
+            async with db.unit_of_work():
+                warning = await warning_repo.add_warning(
+                    guild_id=interaction.guild.id,
+                    user_id=member.id,
+                    moderator_id=interaction.user.id,
+                    reason=reason or "No reason provided"
+                )
 
-            # Get warning count
-            warning_count = await warning_repo.get_warning_count(
-                interaction.guild.id,
-                member.id
-            )
+                # Get warning count
+                warning_count = await warning_repo.get_warning_count(
+                    interaction.guild.id,
+                    member.id
+                )
 
             # Create embed
             embed = discord.Embed(
@@ -244,41 +306,32 @@ class Moderation(commands.Cog):
         target_user = member or interaction.user
 
         try:
-            # Get warnings from database
-            warnings = await warning_repo.get_guild_warnings(
+            # Get the total and the newest warnings (index range scan, no full history load)
+            total_warnings = await warning_repo.get_warning_count(
                 interaction.guild.id,
                 target_user.id
             )
 
-            if not warnings:
+            if not total_warnings:
                 await interaction.response.send_message(
                     f"{target_user.mention} has no warnings in this server.",
                     ephemeral=True
                 )
                 return
 
-            # Create embed
-            embed = discord.Embed(
-                title=f"⚠️ Warnings for {target_user.name}",
-                color=discord.Color.orange()
+            page = await warning_repo.get_warning_page(
+                interaction.guild.id,
+                target_user.id,
+                per_page=WARNINGS_PER_PAGE
             )
 
-            # Show last 5 warnings
-            for i, warning in enumerate(warnings[-5:], 1):
-                moderator = interaction.guild.get_member(warning.moderator_id)
-                moderator_name = moderator.name if moderator else f"User {warning.moderator_id}"
-
-                embed.add_field(
-                    name=f"Warning #{len(warnings) - len(warnings) + i}",
-                    value=f"**Reason:** {warning.reason}\n"
-                          f"**Moderator:** {moderator_name}\n"
-                          f"**Date:** {warning.created_at.strftime('%Y-%m-%d %H:%M')}",
-                    inline=False
-                )
-
-            embed.set_footer(text=f"Total warnings: {len(warnings)}")
-
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            # Newest first; older pages follow the keyset cursor behind the button
+            embed = warnings_embed(interaction.guild, target_user, page['items'], total_warnings, 0)
+            if page['next_cursor']:
+                view = WarningsPageView(interaction.user, target_user, total_warnings, page['next_cursor'])
+                await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+            else:
+                await interaction.response.send_message(embed=embed, ephemeral=True)
 
         except Exception as e:
             await interaction.response.send_message(
@@ -1,17 +1,29 @@
 
 import discord
 from discord import app_commands
-from discord.ext import commands, tasks
+from discord.ext import commands
 import asyncio
-from datetime import datetime, timedelta
-import pytz
-import difflib
-import os
 import aiohttp
+from datetime import datetime, timedelta, timezone
 from simpleeval import simple_eval, SimpleEval
 
 # Database imports
-from db import user_repo, guild_repo
+from db import user_repo, guild_repo, reminder_repo, timer_repo
+from services.scheduler import DeadlineScheduler, parse_duration
+from services.afk import afk_store
+from services.weather import weather_service, CityNotFound, WeatherError
+from services.timezones import TimezoneIndex, iana_timezones, render, times_in
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+MAX_REMINDERS_PER_USER = 25
+DELIVERY_RETRY_BASE_SECONDS = 30  # Doubled per failed attempt to deliver a reminder or timer
+DELIVERY_RETRY_MAX_SECONDS = 900
+MAX_WORLD_CLOCK_ZONES = 10
+
+# Shown by /worldclock when no locations are given (after the server's own timezone)
+DEFAULT_WORLD_CLOCK = ['America/Los_Angeles', 'America/New_York', 'Europe/London', 'Asia/Kolkata', 'Asia/Tokyo', 'Australia/Sydney']
 
 # Comprehensive timezone mappings
 TIMEZONE_MAP = {
@@ -223,63 +235,141 @@ class Utility(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.reminders = []  # Will store: (user_id, channel_id, time, message)
-        self.afk_users = {}  # Store AFK users: {user_id: reason}
-        self.session = None  # aiohttp session for API calls
-        self.check_reminders.start()
+        # Keys are (kind, row id) so other persisted deadlines can share the scheduler
+        self.scheduler = DeadlineScheduler('utility', self._on_due)
+        self._failed_attempts = {}
     
     async def cog_load(self):
-        """Create aiohttp session when cog loads"""
-        self.session = aiohttp.ClientSession()
+        """Build the timezone index and schedule stored reminders and timers when cog loads"""
+        # Build the timezone search index once, off the per-keystroke path
+        self.tz_index = TimezoneIndex(TIMEZONE_MAP, DISPLAY_MAP, iana_timezones())
+        
+        afk_count = await afk_store.load()
+        logger.info(f"Loaded {afk_count} AFK status(es)")
+        
+        # Anything that came due while we were offline fires immediately
+        reminders = await reminder_repo.get_pending_deadlines()
+        for reminder_id, remind_at in reminders:
+            self.scheduler.schedule(('reminder', reminder_id), remind_at)
+        timers = await timer_repo.get_pending_deadlines()
+        for timer_id, ends_at in timers:
+            self.scheduler.schedule(('timer', timer_id), ends_at)
+        self.scheduler.start()
+        logger.info(f"Scheduled {len(reminders)} pending reminder(s) and {len(timers)} timer(s)")
     
     async def cog_unload(self):
-        """Close aiohttp session when cog unloads"""
-        self.check_reminders.cancel()
-        if self.session:
-            await self.session.close()
-            self.session = None
-    
-    @tasks.loop(seconds=30)
-    async def check_reminders(self):
-        """Check for reminders that need to be sent"""
-        current_time = datetime.now()
-        reminders_to_remove = []
-        
-        for reminder in self.reminders:
-            user_id, channel_id, remind_time, message = reminder
-            
-            if current_time >= remind_time:
-                try:
-                    channel = self.bot.get_channel(channel_id)
-                    user = self.bot.get_user(user_id)
-                    
-                    if channel and user:
-                        embed = discord.Embed(
-                            title="⏰ Reminder!",
-                            description=message,
-                            color=discord.Color.blue(),
-                            timestamp=datetime.now()
-                        )
-                        embed.set_footer(text=f"Reminder for {user.name}")
-                        
-                        await channel.send(f"{user.mention}", embed=embed)
-                    
-                    reminders_to_remove.append(reminder)
-                except Exception as e:
-                    print(f"Error sending reminder: {e}")
-                    reminders_to_remove.append(reminder)
-        
-        # Remove sent reminders
-        for reminder in reminders_to_remove:
-            self.reminders.remove(reminder)
-    
-    @check_reminders.before_loop
-    async def before_check_reminders(self):
+        """Stop the scheduler when cog unloads"""
+        await self.scheduler.stop()
+    
+    async def _on_due(self, keys):
+        """Scheduler callback: deliver everything that just came due"""
         await self.bot.wait_until_ready()
+        reminder_ids = [row_id for kind, row_id in keys if kind == 'reminder']
+        timer_ids = [row_id for kind, row_id in keys if kind == 'timer']
+        await asyncio.gather(
+            self._deliver_reminders(reminder_ids),
+            self._finish_timers(timer_ids)
+        )
+    
+    async def _deliver_reminders(self, reminder_ids):
+        """Send a batch of due reminders concurrently, then delete the delivered ones in one statement"""
+        if not reminder_ids:
+            return
+        reminders = await reminder_repo.get_many(reminder_ids)
+        results = await asyncio.gather(*(self._send_reminder(r) for r in reminders), return_exceptions=True)
+        await self._settle('reminder', reminder_repo, reminders, results)
+    
+    async def _settle(self, kind, repo, rows, results):
+        """Delete delivered rows; keep rows that failed transiently and retry them with backoff"""
+        finished = []
+        for row, result in zip(rows, results):
+            key = (kind, row.id)
+            if isinstance(result, Exception) and self._is_transient(result):
+                self._retry_delivery(key, result)
+                continue
+            if isinstance(result, Exception):
+                # Permanent failures are dropped, so a gone user can't make a row retry forever
+                logger.warning(f"Dropping undeliverable {kind} {row.id}: {result}")
+            self._failed_attempts.pop(key, None)
+            finished.append(row.id)
+        await repo.delete_many(finished)
+    
+    @staticmethod
+    def _is_transient(error):
+        """Discord outages and network trouble are worth retrying; 403/404 and the like are not"""
+        return isinstance(error, (discord.DiscordServerError, aiohttp.ClientError, asyncio.TimeoutError, OSError))
+    
+    def _retry_delivery(self, key, error):
+        """Schedule another delivery attempt, backing off per failure"""
+        attempts = self._failed_attempts.get(key, 0) + 1
+        self._failed_attempts[key] = attempts
+        delay = min(DELIVERY_RETRY_MAX_SECONDS, DELIVERY_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+        self.scheduler.schedule(key, datetime.utcnow() + timedelta(seconds=delay))
+        logger.warning(f"Delivering {key[0]} {key[1]} failed ({error}); retrying in {delay}s")
+    
+    async def _destination(self, channel_id, user_id):
+        """
+        Where to deliver: the original channel, fetched if it isn't cached (DMs
+        usually aren't), or the user's DMs if the channel is gone or off-limits
+        """
+        channel = self.bot.get_channel(channel_id)
+        if channel is not None:
+            return channel
+        try:
+            return await self.bot.fetch_channel(channel_id)
+        except (discord.NotFound, discord.Forbidden):
+            return self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+    
+    async def _send(self, channel, user_id, content, **kwargs):
+        """Send to a reminder or timer's destination, falling back to the user's DMs"""
+        try:
+            await channel.send(content, **kwargs)
+        except discord.Forbidden:
+            if isinstance(channel, discord.abc.User):
+                raise
+            user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+            await user.send(content, **kwargs)
+    
+    async def _send_reminder(self, reminder):
+        embed = discord.Embed(
+            title="⏰ Reminder!",
+            description=reminder.message,
+            color=discord.Color.blue(),
+            timestamp=datetime.now(timezone.utc)
+        )
+        embed.add_field(name="Set", value=discord.utils.format_dt(reminder.created_at.replace(tzinfo=timezone.utc), style='R'))
+        
+        channel = await self._destination(reminder.channel_id, reminder.user_id)
+        await self._send(channel, reminder.user_id, f"<@{reminder.user_id}>", embed=embed)
+    
+    async def _finish_timers(self, timer_ids):
+        """Complete a batch of due timers concurrently, then delete the finished ones in one statement"""
+        if not timer_ids:
+            return
+        timers = await timer_repo.get_many(timer_ids)
+        results = await asyncio.gather(*(self._finish_timer(t) for t in timers), return_exceptions=True)
+        await self._settle('timer', timer_repo, timers, results)
+    
+    async def _finish_timer(self, timer):
+        channel = await self._destination(timer.channel_id, timer.user_id)
+        
+        if timer.message_id and not isinstance(channel, discord.abc.User):
+            embed = discord.Embed(
+                title="⏰ Timer Complete!",
+                description=f"Your **{timer.label}** timer is up!",
+                color=discord.Color.green()
+            )
+            try:
+                # Partial message: edit by ID without fetching it first
+                await channel.get_partial_message(timer.message_id).edit(embed=embed)
+            except discord.HTTPException:
+                pass  # Message deleted; still ping below
+        
+        await self._send(channel, timer.user_id, f"<@{timer.user_id}> ⏰ Time's up!")
     
     @app_commands.command(name='remind', description='Set a reminder')
     @app_commands.describe(
-        time='Time format: 10s, 5m, 2h, 1d',
+        time='Time format: 10s, 5m, 2h, 1d or 1h30m',
         message='What to remind you about'
     )
     async def remind(self, interaction: discord.Interaction, time: str, message: str):
@@ -288,65 +378,67 @@ class Utility(commands.Cog):
         Format: /remind time:10s message:Check the oven
         Time format: 10s, 5m, 2h, 1d (seconds, minutes, hours, days)
         """
-        # Parse time
-        time_units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
-        
-        if time[-1] not in time_units:
+        duration = parse_duration(time)
+        if duration is None:
             return await interaction.response.send_message("❌ Invalid time format! Use: 10s, 5m, 2h, or 1d", ephemeral=True)
         
-        try:
-            amount = int(time[:-1])
-            unit = time[-1]
-            seconds = amount * time_units[unit]
-            
-            if seconds < 10:
-                return await interaction.response.send_message("❌ Reminder must be at least 10 seconds!", ephemeral=True)
-            if seconds > 2592000:  # 30 days
-                return await interaction.response.send_message("❌ Reminder cannot be longer than 30 days!", ephemeral=True)
-            
-            remind_time = datetime.now() + timedelta(seconds=seconds)
-            
-            # Add reminder to list
-            self.reminders.append((interaction.user.id, interaction.channel.id, remind_time, message))
-            
-            embed = discord.Embed(
-                title="✅ Reminder Set!",
-                description=f"I'll remind you about: **{message}**",
-                color=discord.Color.green()
-            )
-            embed.add_field(
-                name="When",
-                value=discord.utils.format_dt(remind_time, style='R')
+        seconds = duration.total_seconds()
+        if seconds < 10:
+            return await interaction.response.send_message("❌ Reminder must be at least 10 seconds!", ephemeral=True)
+        if seconds > 2592000:  # 30 days
+            return await interaction.response.send_message("❌ Reminder cannot be longer than 30 days!", ephemeral=True)
+        
+        if await reminder_repo.get_user_reminder_count(interaction.user.id) >= MAX_REMINDERS_PER_USER:
+            return await interaction.response.send_message(
+                f"❌ You can have at most {MAX_REMINDERS_PER_USER} active reminders!", ephemeral=True
             )
-            
-            await interaction.response.send_message(embed=embed)
-            
-        except ValueError:
-            await interaction.response.send_message("❌ Invalid time format! Use: 10s, 5m, 2h, or 1d", ephemeral=True)
+        
+        reminder = await reminder_repo.add_reminder(
+            user_id=interaction.user.id,
+            channel_id=interaction.channel_id,
+            guild_id=interaction.guild_id,
+            message=message,
+            remind_at=datetime.utcnow() + duration
+        )
+        self.scheduler.schedule(('reminder', reminder.id), reminder.remind_at)
+        
+        embed = discord.Embed(
+            title="✅ Reminder Set!",
+            description=f"I'll remind you about: **{message}**",
+            color=discord.Color.green()
+        )
+        embed.add_field(
+            name="When",
+            value=discord.utils.format_dt(reminder.remind_at.replace(tzinfo=timezone.utc), style='R')
+        )
+        
+        await interaction.response.send_message(embed=embed)
     
     @app_commands.command(name='reminders', description='List your active reminders')
     async def list_reminders(self, interaction: discord.Interaction):
         """List your active reminders"""
-        user_reminders = [r for r in self.reminders if r[0] == interaction.user.id]
+        total = await reminder_repo.get_user_reminder_count(interaction.user.id)
         
-        if not user_reminders:
+        if not total:
             return await interaction.response.send_message("You have no active reminders!", ephemeral=True)
         
+        user_reminders = await reminder_repo.get_user_reminders(interaction.user.id, limit=10)
+        
         embed = discord.Embed(
-            title=f"⏰ Your Reminders ({len(user_reminders)})",
+            title=f"⏰ Your Reminders ({total})",
             color=discord.Color.blue()
         )
         
-        for i, (_, _, remind_time, message) in enumerate(user_reminders[:10], 1):
-            time_str = discord.utils.format_dt(remind_time, style='R')
+        for i, reminder in enumerate(user_reminders, 1):
+            time_str = discord.utils.format_dt(reminder.remind_at.replace(tzinfo=timezone.utc), style='R')
             embed.add_field(
                 name=f"{i}. {time_str}",
-                value=message[:100],
+                value=reminder.message[:100],
                 inline=False
             )
         
-        if len(user_reminders) > 10:
-            embed.set_footer(text=f"Showing 10 of {len(user_reminders)} reminders")
+        if total > 10:
+            embed.set_footer(text=f"Showing 10 of {total} reminders")
         
         await interaction.response.send_message(embed=embed)
     
@@ -385,9 +477,11 @@ class Utility(commands.Cog):
     
     @app_commands.command(name='afk', description='Set your AFK status')
     @app_commands.describe(reason='Reason for being AFK')
+    @app_commands.guild_only()
     async def afk(self, interaction: discord.Interaction, reason: str = "AFK"):
         """Set your AFK status"""
-        self.afk_users[interaction.user.id] = reason
+        reason = reason[:200]
+        await afk_store.set(interaction.guild_id, interaction.user.id, reason)
         
         embed = discord.Embed(
             title="💤 AFK",
@@ -399,26 +493,33 @@ class Utility(commands.Cog):
     @commands.Cog.listener()
     async def on_message(self, message):
         """Check for AFK users"""
-        if message.author.bot:
+        if message.author.bot or message.guild is None:
             return
         
+        guild_id = message.guild.id
+        
         # Check if user returned from AFK
-        if message.author.id in self.afk_users:
-            reason = self.afk_users.pop(message.author.id)
+        returned = await afk_store.clear(guild_id, message.author.id)
+        if returned is not None:
             await message.channel.send(
-                f"Welcome back {message.author.mention}! You were AFK: {reason}",
+                f"Welcome back {message.author.mention}! You were AFK: {returned.reason}",
                 delete_after=5
             )
         
-        # Check if AFK user was mentioned
-        for user_id in self.afk_users:
-            user = self.bot.get_user(user_id)
-            if user and user.mentioned_in(message):
-                reason = self.afk_users[user_id]
-                await message.channel.send(
-                    f"💤 {user.display_name} is currently AFK: {reason}",
-                    delete_after=10
-                )
+        # Check if AFK users were mentioned; only the mentioned IDs are looked up
+        mentioned = afk_store.mentioned(guild_id, message.raw_mentions)
+        if mentioned:
+            lines = []
+            for user_id, entry in mentioned:
+                member = message.guild.get_member(user_id)
+                name = member.display_name if member else f"<@{user_id}>"
+                since = discord.utils.format_dt(entry.since.replace(tzinfo=timezone.utc), style='R')
+                lines.append(f"💤 {name} is currently AFK: {entry.reason} ({since})")
+            await message.channel.send(
+                "\n".join(lines),
+                delete_after=10,
+                allowed_mentions=discord.AllowedMentions.none()
+            )
     
     @app_commands.command(name='ping', description='Check bot latency')
     async def ping(self, interaction: discord.Interaction):
@@ -459,55 +560,42 @@ class Utility(commands.Cog):
         Format: /timer time:30s
         Time format: 10s, 5m, 2h (seconds, minutes, hours)
         """
-        # Parse time
-        time_units = {'s': 1, 'm': 60, 'h': 3600}
-        
-        if not time or time[-1] not in time_units:
+        duration = parse_duration(time)
+        if duration is None:
             return await interaction.response.send_message("❌ Invalid time format! Use: 10s, 5m, or 2h\nExample: `/timer time:30s`", ephemeral=True)
         
-        try:
-            amount = int(time[:-1])
-            unit = time[-1]
-            seconds = amount * time_units[unit]
-            
-            if seconds < 1:
-                return await interaction.response.send_message("❌ Timer must be at least 1 second!", ephemeral=True)
-            if seconds > 86400:  # 24 hours
-                return await interaction.response.send_message("❌ Timer cannot exceed 24 hours!", ephemeral=True)
-            
-            # Format display time
-            if seconds < 60:
-                display_time = f"{seconds} second{'s' if seconds != 1 else ''}"
-            elif seconds < 3600:
-                display_time = f"{seconds // 60} minute{'s' if seconds // 60 != 1 else ''}"
-            else:
-                display_time = f"{seconds // 3600} hour{'s' if seconds // 3600 != 1 else ''}"
-            
-            embed = discord.Embed(
-                title="⏱️ Timer Started",
-                description=f"Timer set for **{display_time}**",
-                color=discord.Color.blue()
-            )
-            embed.set_footer(text=f"Started by {interaction.user.name}")
-            
-            await interaction.response.send_message(embed=embed)
-            msg = await interaction.original_response()
-            
-            await asyncio.sleep(seconds)
-            
-            embed = discord.Embed(
-                title="⏰ Timer Complete!",
-                description=f"Your **{display_time}** timer is up!",
-                color=discord.Color.green()
-            )
-            
-            await msg.edit(embed=embed)
-            await interaction.followup.send(f"{interaction.user.mention} ⏰ Time's up!")
-            
-        except ValueError:
-            await interaction.response.send_message("❌ Invalid time format! Use: 10s, 5m, or 2h\nExample: `/timer time:30s`", ephemeral=True)
-        except Exception as e:
-            await interaction.followup.send(f"❌ Error: {e}")
+        seconds = int(duration.total_seconds())
+        if seconds > 86400:  # 24 hours
+            return await interaction.response.send_message("❌ Timer cannot exceed 24 hours!", ephemeral=True)
+        
+        # Format display time
+        if seconds < 60:
+            display_time = f"{seconds} second{'s' if seconds != 1 else ''}"
+        elif seconds < 3600:
+            display_time = f"{seconds // 60} minute{'s' if seconds // 60 != 1 else ''}"
+        else:
+            display_time = f"{seconds // 3600} hour{'s' if seconds // 3600 != 1 else ''}"
+        
+        ends_at = datetime.utcnow() + duration
+        embed = discord.Embed(
+            title="⏱️ Timer Started",
+            description=f"Timer set for **{display_time}**\nEnds {discord.utils.format_dt(ends_at.replace(tzinfo=timezone.utc), style='R')}",
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text=f"Started by {interaction.user.name}")
+        
+        await interaction.response.send_message(embed=embed)
+        msg = await interaction.original_response()
+        
+        # Persist and hand off to the scheduler; nothing waits on this interaction
+        timer = await timer_repo.add_timer(
+            user_id=interaction.user.id,
+            channel_id=interaction.channel_id,
+            message_id=msg.id,
+            label=display_time,
+            ends_at=ends_at
+        )
+        self.scheduler.schedule(('timer', timer.id), timer.ends_at)
     
     @app_commands.command(name='calculate', description='Calculate a mathematical expression')
     @app_commands.describe(expression='The mathematical expression to calculate')
@@ -583,14 +671,11 @@ class Utility(commands.Cog):
     
     async def timezone_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
         """Autocomplete for timezone locations"""
-        if not current:
-            # Return first 25 locations when no input
-            keys = list(TIMEZONE_MAP.keys())[:25]
-            return [app_commands.Choice(name=DISPLAY_MAP.get(key, key.title()), value=key) for key in keys]
-        else:
-            # Find close matches
-            matches = difflib.get_close_matches(current.lower(), TIMEZONE_MAP.keys(), n=25, cutoff=0.3)
-            return [app_commands.Choice(name=DISPLAY_MAP.get(match, match.title()), value=match) for match in matches]
+        # Prefix lookups with a trigram fallback, from the index built at cog load
+        return [
+            app_commands.Choice(name=match.display[:100], value=match.value[:100])
+            for match in self.tz_index.search(current)
+        ]
     
     @app_commands.command(name='timezone', description='Check the current time in any timezone')
     @app_commands.describe(location='City, country, or timezone (e.g., Tokyo, EST, UTC)')
@@ -598,28 +683,12 @@ class Utility(commands.Cog):
     async def timezone(self, interaction: discord.Interaction, location: str):
         """Check the current time in any timezone"""
         
-        # Normalize input
-        location_lower = location.lower().strip()
-        
-        # Try to find timezone
-        timezone_str = None
-        
-        # Check if it's in our map
-        if location_lower in TIMEZONE_MAP:
-            timezone_str = TIMEZONE_MAP[location_lower]
-        else:
-            # Try to find it directly in pytz
-            for tz in pytz.all_timezones:
-                if location_lower in tz.lower():
-                    timezone_str = tz
-                    break
+        # Exact alias or IANA name, else the best prefix / word-start match
+        timezone_str = self.tz_index.resolve(location)
         
         if not timezone_str:
             # Suggest similar timezones
-            suggestions = []
-            for key in TIMEZONE_MAP.keys():
-                if location_lower in key or key in location_lower:
-                    suggestions.append(key.title())
+            suggestions = self.tz_index.suggest(location)
             
             error_msg = f"❌ Timezone '{location}' not found!"
             if suggestions:
@@ -630,20 +699,10 @@ class Utility(commands.Cog):
             return await interaction.response.send_message(error_msg, ephemeral=True)
         
         try:
-            # Get timezone object
-            tz = pytz.timezone(timezone_str)
-            
-            # Get current time in that timezone
-            current_time = datetime.now(tz)
-            
-            # Format time
-            time_12h = current_time.strftime("%I:%M:%S %p")
-            time_24h = current_time.strftime("%H:%M:%S")
-            date_str = current_time.strftime("%A, %B %d, %Y")
-            
-            # Get UTC offset
-            utc_offset = current_time.strftime("%z")
-            utc_offset_formatted = f"UTC{utc_offset[:3]}:{utc_offset[3:]}"
+            # Memoised zoneinfo lookup; the date and offset are formatted once a minute per zone
+            current = render(timezone_str)
+            if current is None:
+                return await interaction.response.send_message(f"❌ Timezone '{timezone_str}' is not available!", ephemeral=True)
             
             # Create embed
             embed = discord.Embed(
@@ -652,10 +711,10 @@ class Utility(commands.Cog):
                 timestamp=datetime.utcnow()
             )
             
-            embed.add_field(name="📅 Date", value=date_str, inline=False)
-            embed.add_field(name="🕐 12-Hour", value=time_12h, inline=True)
-            embed.add_field(name="🕐 24-Hour", value=time_24h, inline=True)
-            embed.add_field(name="🌐 Timezone", value=f"{timezone_str}\n({utc_offset_formatted})", inline=False)
+            embed.add_field(name="📅 Date", value=current.date, inline=False)
+            embed.add_field(name="🕐 12-Hour", value=current.time_12h, inline=True)
+            embed.add_field(name="🕐 24-Hour", value=current.time_24h, inline=True)
+            embed.add_field(name="🌐 Timezone", value=f"{timezone_str}\n({current.utc_offset})", inline=False)
             
             embed.set_footer(text=f"Requested by {interaction.user.name}")
             
@@ -664,70 +723,85 @@ class Utility(commands.Cog):
         except Exception as e:
             await interaction.response.send_message(f"❌ Error getting timezone: {e}", ephemeral=True)
 
+    @app_commands.command(name='worldclock', description='Show the current time in several places at once')
+    @app_commands.describe(locations='Up to 10 comma-separated places (e.g., Tokyo, London, EST)')
+    async def worldclock(self, interaction: discord.Interaction, locations: str = None):
+        """Show the current time in several timezones"""
+        if locations:
+            wanted = [part.strip() for part in locations.split(',') if part.strip()]
+            if len(wanted) > MAX_WORLD_CLOCK_ZONES:
+                return await interaction.response.send_message(
+                    f"❌ You can show at most {MAX_WORLD_CLOCK_ZONES} locations at once!", ephemeral=True
+                )
+            resolved = [(place, self.tz_index.resolve(place)) for place in wanted]
+            unknown = [place for place, timezone_str in resolved if timezone_str is None]
+            if unknown:
+                return await interaction.response.send_message(
+                    f"❌ Timezone(s) not found: {', '.join(unknown)}", ephemeral=True
+                )
+            zones = [(place.title(), timezone_str) for place, timezone_str in resolved]
+        else:
+            zones = [(timezone_str.split('/')[-1].replace('_', ' '), timezone_str) for timezone_str in DEFAULT_WORLD_CLOCK]
+            if interaction.guild_id:
+                settings = await guild_repo.get_guild_settings(interaction.guild_id)
+                guild_tz = settings.get('timezone') if settings else None
+                if guild_tz and guild_tz not in DEFAULT_WORLD_CLOCK:
+                    zones.insert(0, ("This server", guild_tz))
+        
+        # Every zone is rendered at the same instant
+        embed = discord.Embed(title="🌍 World Clock", color=discord.Color.blue(), timestamp=datetime.utcnow())
+        for (label, _), (timezone_str, current) in zip(zones, times_in(tz for _, tz in zones)):
+            if current is None:
+                continue
+            embed.add_field(
+                name=label,
+                value=f"**{current.time_12h}**\n{current.local:%a, %b %d} • {current.abbreviation} ({current.utc_offset})",
+                inline=True
+            )
+        embed.set_footer(text=f"Requested by {interaction.user.name}")
+        
+        await interaction.response.send_message(embed=embed)
+
     @app_commands.command(name='weather', description='Get weather information for a city')
     @app_commands.describe(city='City name to get weather for')
     async def weather(self, interaction: discord.Interaction, city: str):
         """Get weather information for a city using OpenWeatherMap API"""
-        # You'll need to set WEATHER_API_KEY in your environment variables
-        api_key = os.getenv('WEATHER_API_KEY')
-        if not api_key:
+        if not weather_service.is_configured:
             return await interaction.response.send_message(
                 "❌ Weather API key not configured. Please contact the bot owner.",
                 ephemeral=True
             )
 
         try:
-            # Get coordinates first
-            geo_url = f"http://api.openweathermap.org/geo/1.0/direct?q={city}&limit=1&appid={api_key}"
-            async with self.session.get(geo_url) as resp:
-                if resp.status != 200:
-                    return await interaction.response.send_message(
-                        f"❌ Couldn't find weather for '{city}'. Try a different city name.",
-                        ephemeral=True
-                    )
-
-                geo_data = await resp.json()
-                if not geo_data:
-                    return await interaction.response.send_message(
-                        f"❌ City '{city}' not found. Try a different city name.",
-                        ephemeral=True
-                    )
-
-                lat, lon = geo_data[0]['lat'], geo_data[0]['lon']
-                city_name = geo_data[0]['name']
-                country = geo_data[0].get('country', '')
-
-            # Get weather data
-            weather_url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={api_key}&units=metric"
-            async with self.session.get(weather_url) as resp:
-                if resp.status != 200:
-                    return await interaction.response.send_message(
-                        "❌ Error fetching weather data. Try again later.",
-                        ephemeral=True
-                    )
-
-                weather_data = await resp.json()
-
-            # Extract weather info
-            temp = weather_data['main']['temp']
-            feels_like = weather_data['main']['feels_like']
-            humidity = weather_data['main']['humidity']
-            pressure = weather_data['main']['pressure']
-            wind_speed = weather_data['wind']['speed']
-            weather_desc = weather_data['weather'][0]['description'].title()
-            weather_icon = weather_data['weather'][0]['icon']
+            # Cached geocode + cached conditions; concurrent requests for a city share one fetch
+            report = await weather_service.get_weather(city)
+        except CityNotFound:
+            return await interaction.response.send_message(
+                f"❌ City '{city}' not found. Try a different city name.",
+                ephemeral=True
+            )
+        except WeatherError:
+            # Already logged once by the service, however many callers shared the fetch
+            return await interaction.response.send_message(
+                "❌ Error fetching weather data. Try again later.",
+                ephemeral=True
+            )
+
+        try:
+            temp = report.temp
+            feels_like = report.feels_like
 
             # Convert to Fahrenheit
             temp_f = (temp * 9/5) + 32
             feels_like_f = (feels_like * 9/5) + 32
 
             embed = discord.Embed(
-                title=f"🌤️ Weather in {city_name}, {country}",
+                title=f"🌤️ Weather in {report.city}, {report.country}",
                 color=discord.Color.blue(),
                 timestamp=interaction.created_at
             )
 
-            embed.set_thumbnail(url=f"https://openweathermap.org/img/wn/{weather_icon}@2x.png")
+            embed.set_thumbnail(url=f"https://openweathermap.org/img/wn/{report.icon}@2x.png")
 
             embed.add_field(
                 name="🌡️ Temperature",
@@ -741,23 +815,23 @@ class Utility(commands.Cog):
             )
             embed.add_field(
                 name="💧 Humidity",
-                value=f"{humidity}%",
+                value=f"{report.humidity}%",
                 inline=True
             )
 
             embed.add_field(
                 name="🌬️ Wind Speed",
-                value=f"{wind_speed} m/s",
+                value=f"{report.wind_speed} m/s",
                 inline=True
             )
             embed.add_field(
                 name="📊 Pressure",
-                value=f"{pressure} hPa",
+                value=f"{report.pressure} hPa",
                 inline=True
             )
             embed.add_field(
                 name="☁️ Conditions",
-                value=weather_desc,
+                value=report.description,
                 inline=True
             )
 
@@ -766,7 +840,7 @@ class Utility(commands.Cog):
             await interaction.response.send_message(embed=embed)
 
         except Exception as e:
-            print(f"Weather error: {e}")
+            logger.error(f"Weather error: {e}")
             await interaction.response.send_message(
                 "❌ Error fetching weather data. Try again later.",
                 ephemeral=True
@@ -1,6 +1,6 @@
 """
 Core module for Cereal Bot
-Provides configuration, constants, and logging functionality
+Provides configuration, constants, logging and caching functionality
 """
 
 from .config import config, load_config, Config
@@ -12,6 +12,10 @@ from .constants import (
 from .logger import (
     get_logger, setup_logging, log_command, log_error, log_db_operation
 )
+from .cache import (
+    TTLCache, CacheBackend, MemoryCache, RedisCache, MISSING,
+    get_cache, close_caches, cache_stats
+)
 
 __all__ = [
     # Config
@@ -40,5 +44,15 @@ __all__ = [
     'setup_logging',
     'log_command',
     'log_error',
-    'log_db_operation'
+    'log_db_operation',
+
+    # Caching
+    'TTLCache',
+    'CacheBackend',
+    'MemoryCache',
+    'RedisCache',
+    'MISSING',
+    'get_cache',
+    'close_caches',
+    'cache_stats'
 ]
\ No newline at end of file
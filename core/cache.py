@@ -0,0 +1,409 @@
+"""
+Caching for Cereal Bot
+Bounded in-process LRU caches with per-entry time-to-live and hit/miss counters,
+plus shared cache backends (in-memory or Redis) for multi-process deployments
+"""
+
+import asyncio
+import json
+import time
+import uuid
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from .config import config
+from .logger import get_logger
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Optional: only needed for CACHE_BACKEND=redis
+    aioredis = None
+
+logger = get_logger(__name__)
+
+# Sentinel returned on a miss, so that None can be cached as a value
+MISSING = object()
+
+# Every cache created, for metrics reporting
+_registry: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a time-to-live"""
+
+    def __init__(self, name: str, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Initialize cache
+
+        Args:
+            name: Cache name used in metrics
+            maxsize: Maximum number of entries (defaults to config.CACHE_MAX_ENTRIES)
+            ttl: Seconds before an entry expires (defaults to config.CACHE_TTL_SECONDS)
+        """
+        self.name = name
+        self.maxsize = maxsize if maxsize is not None else config.CACHE_MAX_ENTRIES
+        self.ttl = ttl if ttl is not None else config.CACHE_TTL_SECONDS
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        _registry.add(self)
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """
+        Get a cached value
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss or expired entry
+
+        Returns:
+            Cached value or default
+        """
+        entry = self._data.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting the least recently used entry when full
+
+        Args:
+            key: Cache key
+            value: Value to store (may be None)
+            ttl: Optional per-entry TTL override in seconds
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove an entry; returns True if it was present"""
+        return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache effectiveness metrics
+
+        Returns:
+            Dictionary of size, limits, hits, misses, hit rate and evictions
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+        }
+
+
+class CacheBackend(ABC):
+    """
+    Async cache interface shared by repositories, services and cogs
+
+    Keys are scoped to the backend's namespace. A miss returns MISSING so that
+    None can be cached (e.g. "guild not found").
+    """
+
+    name: str
+
+    @abstractmethod
+    async def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        ...
+
+    @abstractmethod
+    async def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: Hashable) -> None:
+        ...
+
+    @abstractmethod
+    async def clear(self) -> None:
+        ...
+
+    async def close(self) -> None:
+        """Release any connections held by the backend"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        ...
+
+
+class MemoryCache(CacheBackend):
+    """Per-process backend wrapping a TTLCache"""
+
+    def __init__(self, name: str, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        self.name = name
+        self.local = TTLCache(name, maxsize=maxsize, ttl=ttl)
+        _registry.discard(self.local)
+        _registry.add(self)
+
+    async def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        return self.local.get(key, default)
+
+    async def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self.local.set(key, value, ttl)
+
+    async def delete(self, key: Hashable) -> None:
+        self.local.delete(key)
+
+    async def clear(self) -> None:
+        self.local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {'backend': 'memory', **self.local.stats()}
+
+
+class RedisCache(CacheBackend):
+    """
+    Shared backend on a Redis-protocol server
+
+    Values are stored as JSON with a server-side TTL. Each process keeps a short-lived
+    near cache in front of Redis; writes publish the key on a per-namespace channel so
+    the other processes drop their near copies.
+    """
+
+    def __init__(self, name: str, client, ttl: Optional[float] = None,
+                 near_ttl: Optional[float] = None, maxsize: Optional[int] = None):
+        """
+        Initialize cache
+
+        Args:
+            name: Namespace, used as key prefix and in metrics
+            client: redis.asyncio.Redis client (may be shared between caches)
+            ttl: Seconds before a shared entry expires (defaults to config.CACHE_TTL_SECONDS)
+            near_ttl: Seconds a value is served from process memory (defaults to config.CACHE_NEAR_TTL_SECONDS)
+            maxsize: Maximum near cache entries (defaults to config.CACHE_MAX_ENTRIES)
+        """
+        self.name = name
+        self.client = client
+        self.ttl = ttl if ttl is not None else config.CACHE_TTL_SECONDS
+        self.prefix = f"{config.CACHE_KEY_PREFIX}{name}:"
+        self.channel = f"{config.CACHE_KEY_PREFIX}invalidate:{name}"
+
+        near_ttl = near_ttl if near_ttl is not None else config.CACHE_NEAR_TTL_SECONDS
+        self.near = TTLCache(name, maxsize=maxsize, ttl=min(near_ttl, self.ttl))
+        _registry.discard(self.near)
+        _registry.add(self)
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.invalidations_received = 0
+
+        self._origin = uuid.uuid4().hex  # Ignore our own invalidation messages
+        self._listener: Optional[asyncio.Task] = None
+        self._closing = False
+        # Made with the listener: before 3.10 an Event binds to the loop current at creation
+        self._subscribed: Optional[asyncio.Event] = None
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.prefix}{key}"
+
+    async def _ensure_listener(self) -> None:
+        """Subscribe to invalidations on first use (needs a running loop)"""
+        if self._listener is None or self._listener.done():
+            self._subscribed = asyncio.Event()
+            self._listener = asyncio.create_task(self._listen(), name=f"cache-invalidate:{self.name}")
+        await self._subscribed.wait()
+
+    async def _listen(self) -> None:
+        """Drop near cache entries invalidated by other processes"""
+        pubsub = self.client.pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+            self._subscribed.set()
+            # Poll rather than block so close() can stop us without cancelling mid-read
+            while not self._closing:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None:
+                    continue
+                data = json.loads(message['data'])
+                if data.get('origin') == self._origin:
+                    continue
+                self.invalidations_received += 1
+                if data.get('key') is None:
+                    self.near.clear()
+                else:
+                    self.near.delete(data['key'])
+        except Exception as e:
+            logger.error(f"Cache invalidation listener for '{self.name}' stopped: {e}")
+            self.near.clear()  # We can no longer trust local copies
+        finally:
+            self._subscribed.set()  # Never leave callers waiting
+            await pubsub.aclose()
+
+    async def _publish(self, key: Optional[str]) -> None:
+        if key is None:
+            self.near.clear()
+        else:
+            self.near.delete(key)
+        try:
+            await self.client.publish(self.channel, json.dumps({'origin': self._origin, 'key': key}))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache invalidation publish failed for '{self.name}': {e}")
+
+    async def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        await self._ensure_listener()
+        key = str(key)
+
+        value = self.near.get(key)
+        if value is not MISSING:
+            return value
+
+        try:
+            raw = await self.client.get(self._key(key))
+        except Exception as e:
+            # Treat an unreachable cache as a miss; the caller loads from source
+            self.errors += 1
+            logger.warning(f"Cache read failed for '{self.name}': {e}")
+            return default
+
+        if raw is None:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        value = json.loads(raw)
+        self.near.set(key, value)
+        return value
+
+    async def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        await self._ensure_listener()
+        key = str(key)
+        ttl = self.ttl if ttl is None else ttl
+
+        try:
+            await self.client.set(self._key(key), json.dumps(value), px=max(1, int(ttl * 1000)))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache write failed for '{self.name}': {e}")
+            return
+
+        await self._publish(key)
+        self.near.set(key, value, min(ttl, self.near.ttl))
+
+    async def delete(self, key: Hashable) -> None:
+        await self._ensure_listener()
+        key = str(key)
+        try:
+            await self.client.delete(self._key(key))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache delete failed for '{self.name}': {e}")
+        await self._publish(key)
+
+    async def clear(self) -> None:
+        await self._ensure_listener()
+        try:
+            keys = [key async for key in self.client.scan_iter(match=f"{self.prefix}*", count=500)]
+            if keys:
+                await self.client.delete(*keys)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache clear failed for '{self.name}': {e}")
+        await self._publish(None)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._closing = True
+            await self._listener
+            self._listener = None
+            self._closing = False
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'backend': 'redis',
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'errors': self.errors,
+            'invalidations_received': self.invalidations_received,
+            'near': self.near.stats(),
+        }
+
+
+_redis_client = None
+_backends: Dict[str, CacheBackend] = {}
+
+
+def get_cache(name: str, ttl: Optional[float] = None, maxsize: Optional[int] = None) -> CacheBackend:
+    """
+    Get the shared cache backend for a namespace
+
+    The backend is chosen by config.CACHE_BACKEND ('memory' or 'redis'); repeated
+    calls with the same name return the same instance.
+
+    Args:
+        name: Cache namespace
+        ttl: Entry time-to-live in seconds (defaults to config.CACHE_TTL_SECONDS)
+        maxsize: Maximum in-process entries (defaults to config.CACHE_MAX_ENTRIES)
+
+    Returns:
+        Cache backend
+    """
+    global _redis_client
+
+    if name in _backends:
+        return _backends[name]
+
+    if config.CACHE_BACKEND == 'redis':
+        if aioredis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package (pip install redis)")
+        if _redis_client is None:
+            _redis_client = aioredis.from_url(config.REDIS_URL)
+        backend: CacheBackend = RedisCache(name, _redis_client, ttl=ttl, maxsize=maxsize)
+    elif config.CACHE_BACKEND == 'memory':
+        backend = MemoryCache(name, maxsize=maxsize, ttl=ttl)
+    else:
+        raise ValueError(f"Unknown CACHE_BACKEND: {config.CACHE_BACKEND}")
+
+    _backends[name] = backend
+    return backend
+
+
+async def close_caches() -> None:
+    """Stop invalidation listeners and close the shared Redis connection"""
+    global _redis_client
+
+    for backend in _backends.values():
+        await backend.close()
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Get metrics for every cache, keyed by cache name"""
+    return {cache.name: cache.stats() for cache in list(_registry)}
@@ -21,6 +21,22 @@ class Config:
     # Database Configuration
     DATABASE_URL: str = os.getenv('DATABASE_URL', 'sqlite:///cereal.db')
     DATABASE_TYPE: str = os.getenv('DATABASE_TYPE', 'sqlite')  # sqlite or postgresql
+    DATABASE_ECHO: bool = os.getenv('DATABASE_ECHO', 'false').lower() == 'true'
+
+    # Connection pool settings (PostgreSQL)
+    DB_POOL_SIZE: int = int(os.getenv('DB_POOL_SIZE', '10'))
+    DB_MAX_OVERFLOW: int = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+    DB_POOL_TIMEOUT: float = float(os.getenv('DB_POOL_TIMEOUT', '30'))  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = int(os.getenv('DB_POOL_RECYCLE', '1800'))  # recycle connections after 30 minutes
+    DB_POOL_PRE_PING: bool = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+
+    # SQLite tuning (WAL journal, one writer connection plus a pool of read-only connections)
+    SQLITE_TUNED: bool = os.getenv('SQLITE_TUNED', 'true').lower() == 'true'
+    SQLITE_SYNCHRONOUS: str = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+    SQLITE_CACHE_SIZE: int = int(os.getenv('SQLITE_CACHE_SIZE', '-20000'))  # negative = KiB, i.e. ~20MB
+    SQLITE_MMAP_SIZE: int = int(os.getenv('SQLITE_MMAP_SIZE', '268435456'))  # 256MB
+    SQLITE_READ_POOL_SIZE: int = int(os.getenv('SQLITE_READ_POOL_SIZE', '4'))
 
     # Bot Configuration
     BOT_PREFIX: str = os.getenv('BOT_PREFIX', '!')
@@ -35,8 +51,24 @@ class Config:
 
     # API Keys (add as needed)
     WEATHER_API_KEY: Optional[str] = os.getenv('WEATHER_API_KEY')
+    WEATHER_API_BASE_URL: str = os.getenv('WEATHER_API_BASE_URL', 'https://api.openweathermap.org')
     JOKE_API_KEY: Optional[str] = os.getenv('JOKE_API_KEY')
     GROQ_API_KEY: Optional[str] = os.getenv('GROQ_API_KEY')
+    GROQ_BASE_URL: Optional[str] = os.getenv('GROQ_BASE_URL')  # None = SDK default
+
+    # AI client pool
+    AI_MAX_CONNECTIONS: int = int(os.getenv('AI_MAX_CONNECTIONS', '20'))
+    AI_KEEPALIVE_SECONDS: float = float(os.getenv('AI_KEEPALIVE_SECONDS', '60'))
+    AI_TIMEOUT_SECONDS: float = float(os.getenv('AI_TIMEOUT_SECONDS', '60'))
+
+    # AI prompt budgets, in tokens (the model windows are far larger; these bound cost and TPM use)
+    TOKENIZER_PATH: Optional[str] = os.getenv('TOKENIZER_PATH', 'data/llama3.tiktoken')  # see README; estimated without it
+    AI_CHAT_PROMPT_TOKENS: int = int(os.getenv('AI_CHAT_PROMPT_TOKENS', '2048'))
+    AI_SUMMARY_PROMPT_TOKENS: int = int(os.getenv('AI_SUMMARY_PROMPT_TOKENS', '6000'))
+
+    # AI client-side rate limits (starting budgets; the token limit is replaced by Groq's headers once seen)
+    AI_RATE_LIMIT_RPM: int = int(os.getenv('AI_RATE_LIMIT_RPM', '30'))
+    AI_RATE_LIMIT_TPM: int = int(os.getenv('AI_RATE_LIMIT_TPM', '12000'))
 
     # Feature Flags
     ENABLE_XP_SYSTEM: bool = os.getenv('ENABLE_XP_SYSTEM', 'true').lower() == 'true'
@@ -62,6 +94,20 @@ class Config:
     # Performance Settings
     COMMAND_COOLDOWN_GLOBAL: float = float(os.getenv('COMMAND_COOLDOWN_GLOBAL', '1.0'))
     CACHE_TTL_SECONDS: int = int(os.getenv('CACHE_TTL_SECONDS', '300'))  # 5 minutes
+    CACHE_MAX_ENTRIES: int = int(os.getenv('CACHE_MAX_ENTRIES', '10000'))  # per cache
+    CACHE_BACKEND: str = os.getenv('CACHE_BACKEND', 'memory').lower()  # memory | redis
+    REDIS_URL: str = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_KEY_PREFIX: str = os.getenv('CACHE_KEY_PREFIX', 'cereal:')
+    CACHE_NEAR_TTL_SECONDS: float = float(os.getenv('CACHE_NEAR_TTL_SECONDS', '30'))  # per-process copy of shared entries
+
+    # Outbound HTTP (shared client pool)
+    HTTP_POOL_LIMIT: int = int(os.getenv('HTTP_POOL_LIMIT', '100'))
+    HTTP_POOL_LIMIT_PER_HOST: int = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '10'))
+    HTTP_DNS_CACHE_SECONDS: int = int(os.getenv('HTTP_DNS_CACHE_SECONDS', '300'))
+    HTTP_KEEPALIVE_SECONDS: float = float(os.getenv('HTTP_KEEPALIVE_SECONDS', '30'))
+    HTTP_TIMEOUT_SECONDS: float = float(os.getenv('HTTP_TIMEOUT_SECONDS', '2.5'))  # whole GET incl. retries; under Discord's 3s window
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv('HTTP_CONNECT_TIMEOUT_SECONDS', '1.0'))
+    HTTP_MAX_RETRIES: int = int(os.getenv('HTTP_MAX_RETRIES', '2'))
 
     # Development Settings
     DEBUG_MODE: bool = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
@@ -110,6 +156,10 @@ class Config:
             else:
                 return cls.DATABASE_URL
         else:
+            # Use the asyncpg driver for plain PostgreSQL URLs
+            for prefix in ('postgresql://', 'postgres://'):
+                if cls.DATABASE_URL.startswith(prefix):
+                    return 'postgresql+asyncpg://' + cls.DATABASE_URL[len(prefix):]
             return cls.DATABASE_URL
 
     @classmethod
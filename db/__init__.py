@@ -3,7 +3,7 @@ Database module for Cereal Bot
 """
 
 from .base import db, init_db, close_db, Base, Database
-from .models import User, Guild, GuildMember, Warning, CustomCommand, Giveaway
+from .models import User, Guild, GuildMember, Warning, CustomCommand, Giveaway, GiveawayEntry, Reminder, Timer, AfkStatus
 from .repository import (
     BaseRepository,
     UserRepository,
@@ -12,12 +12,18 @@ from .repository import (
     WarningRepository,
     CustomCommandRepository,
     GiveawayRepository,
+    ReminderRepository,
+    TimerRepository,
+    AfkRepository,
     user_repo,
     guild_repo,
     guild_member_repo,
     warning_repo,
     custom_command_repo,
     giveaway_repo,
+    reminder_repo,
+    timer_repo,
+    afk_repo,
     initialize_repositories
 )
 
@@ -33,6 +39,10 @@ __all__ = [
     'Warning',
     'CustomCommand',
     'Giveaway',
+    'GiveawayEntry',
+    'Reminder',
+    'Timer',
+    'AfkStatus',
     'BaseRepository',
     'UserRepository',
     'GuildRepository',
@@ -40,11 +50,17 @@ __all__ = [
     'WarningRepository',
     'CustomCommandRepository',
     'GiveawayRepository',
+    'ReminderRepository',
+    'TimerRepository',
+    'AfkRepository',
     'user_repo',
     'guild_repo',
     'guild_member_repo',
     'warning_repo',
     'custom_command_repo',
     'giveaway_repo',
+    'reminder_repo',
+    'timer_repo',
+    'afk_repo',
     'initialize_repositories'
 ]
\ No newline at end of file
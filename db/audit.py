@@ -0,0 +1,229 @@
+"""
+Query plan audit for Cereal Bot
+Runs EXPLAIN on the queries issued by the repositories and flags full table scans
+"""
+
+import inspect
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import select, update, delete, func, exists
+from sqlalchemy.sql import Executable
+
+from core import get_logger
+from .base import Database, db
+from .models import User, Guild, GuildMember, Warning, CustomCommand, Giveaway, GiveawayEntry, Reminder, Timer, AfkStatus
+
+logger = get_logger(__name__)
+
+
+# Statements mirroring each repository query (parameter values do not affect the plan).
+# Upserts are audited through the lookup their ON CONFLICT clause makes on the
+# conflict columns. Every public repository method must appear here (variants
+# as "Class.method[variant]") or in AUDIT_EXEMPT; unaudited_queries() checks.
+AUDITED_QUERIES: Dict[str, Callable[[], Executable]] = {
+    'UserRepository.get_by_id': lambda: select(User).filter_by(id=0),
+    'UserRepository.get_active_users': lambda: (
+        select(User).where(User.last_active >= datetime.utcnow()).order_by(User.last_active.desc())
+    ),
+    'UserRepository.get_by_discord_id': lambda: select(User).filter_by(id=0),
+    'UserRepository.create_or_update_from_discord': lambda: select(User).filter_by(id=0),
+    'UserRepository.bulk_create_or_update_from_discord': lambda: select(User).filter_by(id=0),
+    'GuildRepository.get_by_id': lambda: select(Guild).filter_by(id=0),
+    'GuildRepository.get_by_discord_id': lambda: select(Guild).filter_by(id=0),
+    'GuildRepository.create_or_update_from_discord': lambda: select(Guild).filter_by(id=0),
+    'GuildRepository.update_member_count': lambda: update(Guild).filter_by(id=0).values(member_count=0),
+    'GuildRepository.get_guild_settings': lambda: select(
+        Guild.prefix, Guild.timezone, Guild.welcome_enabled,
+        Guild.welcome_channel_id, Guild.welcome_message, Guild.log_channel_id,
+    ).filter_by(id=0),
+    'GuildMemberRepository.get_member': lambda: select(GuildMember).filter_by(guild_id=0, user_id=0),
+    'GuildMemberRepository.create_or_update_member': lambda: (
+        select(GuildMember).filter_by(guild_id=0, user_id=0)
+    ),
+    'GuildMemberRepository.bulk_create_or_update_from_discord': lambda: (
+        select(GuildMember).filter_by(guild_id=0, user_id=0)
+    ),
+    'WarningRepository.get_guild_warnings': lambda: select(Warning).filter_by(guild_id=0, user_id=0),
+    'WarningRepository.get_guild_warnings[guild]': lambda: select(Warning).filter_by(guild_id=0),
+    'WarningRepository.get_warning_count': lambda: (
+        select(func.count()).select_from(Warning).filter_by(guild_id=0, user_id=0)
+    ),
+    'WarningRepository.get_warning_page': lambda: (
+        select(Warning).filter_by(guild_id=0, user_id=0).where(Warning.id < 0)
+        .order_by(Warning.id.desc()).limit(6)
+    ),
+    'WarningRepository.delete[member]': lambda: delete(Warning).filter_by(guild_id=0, user_id=0),
+    'CustomCommandRepository.get_guild_commands': lambda: select(CustomCommand).filter_by(guild_id=0),
+    'CustomCommandRepository.get_command': lambda: select(CustomCommand).filter_by(guild_id=0, name=''),
+    'CustomCommandRepository.increment_usage': lambda: (
+        update(CustomCommand).filter_by(id=0).values(usage_count=CustomCommand.usage_count + 1)
+    ),
+    'GiveawayRepository.get_active_giveaways': lambda: select(Giveaway).filter_by(active=True),
+    'GiveawayRepository.get_active_giveaways[guild]': lambda: (
+        select(Giveaway).filter_by(active=True, guild_id=0)
+    ),
+    'GiveawayRepository.get_active_deadlines': lambda: (
+        select(Giveaway.id, Giveaway.end_time).where(Giveaway.active == True)
+    ),
+    'GiveawayRepository.get_expired_giveaways': lambda: (
+        select(Giveaway).where(Giveaway.active == True, Giveaway.end_time <= datetime.utcnow())
+    ),
+    'GiveawayRepository.add_participant': lambda: (
+        select(exists().where(Giveaway.id == 0, Giveaway.active == True))
+    ),
+    'GiveawayRepository.add_participant[conflict]': lambda: (
+        select(GiveawayEntry.id).filter_by(giveaway_id=0, user_id=0)
+    ),
+    'GiveawayRepository.remove_participant': lambda: delete(GiveawayEntry).where(
+        GiveawayEntry.giveaway_id == 0,
+        GiveawayEntry.user_id == 0,
+        exists().where(Giveaway.id == 0, Giveaway.active == True),
+    ),
+    'GiveawayRepository.is_participant': lambda: (
+        select(GiveawayEntry.id).filter_by(giveaway_id=0, user_id=0).exists().select()
+    ),
+    'GiveawayRepository.get_participant_count': lambda: (
+        select(func.count()).select_from(GiveawayEntry).filter_by(giveaway_id=0)
+    ),
+    'GiveawayRepository.pick_winners': lambda: (
+        select(GiveawayEntry.user_id).filter_by(giveaway_id=0).order_by(func.random()).limit(1)
+    ),
+    'GiveawayRepository.end_giveaway': lambda: update(Giveaway).filter_by(id=0).values(active=False),
+    'GiveawayRepository.end_giveaway[reload]': lambda: select(Giveaway).filter_by(id=0),
+    'ReminderRepository.get_user_reminders': lambda: (
+        select(Reminder).filter_by(user_id=0).order_by(Reminder.remind_at).limit(10)
+    ),
+    'ReminderRepository.get_user_reminder_count': lambda: (
+        select(func.count()).select_from(Reminder).filter_by(user_id=0)
+    ),
+    'ReminderRepository.get_pending_deadlines': lambda: (
+        select(Reminder.id, Reminder.remind_at).order_by(Reminder.remind_at)
+    ),
+    'ReminderRepository.get_many': lambda: select(Reminder).where(Reminder.id.in_([0, 1])),
+    'ReminderRepository.delete_many': lambda: delete(Reminder).where(Reminder.id.in_([0, 1])),
+    'TimerRepository.get_pending_deadlines': lambda: select(Timer.id, Timer.ends_at).order_by(Timer.ends_at),
+    'TimerRepository.get_many': lambda: select(Timer).where(Timer.id.in_([0, 1])),
+    'TimerRepository.delete_many': lambda: delete(Timer).where(Timer.id.in_([0, 1])),
+    'AfkRepository.set_afk': lambda: select(AfkStatus).filter_by(guild_id=0, user_id=0),
+    'AfkRepository.clear_afk': lambda: delete(AfkStatus).filter_by(guild_id=0, user_id=0),
+}
+
+# Repository methods deliberately left out of the audit, with the reason
+AUDIT_EXEMPT: Dict[str, str] = {
+    'WarningRepository.add_warning': "plain INSERT, no lookup",
+    'ReminderRepository.add_reminder': "plain INSERT, no lookup",
+    'TimerRepository.add_timer': "plain INSERT, no lookup",
+    'GiveawayRepository.migrate_legacy_participants': "one-off startup migration, reads every legacy row",
+    'AfkRepository.get_all_statuses': "loads every AFK row at startup by design",
+}
+
+def repository_query_methods() -> List[str]:
+    """Names ("Class.method") of the public query methods each repository defines"""
+    from . import repository
+
+    names = []
+    for cls in vars(repository).values():
+        if (
+            isinstance(cls, type)
+            and issubclass(cls, repository.BaseRepository)
+            and cls is not repository.BaseRepository
+        ):
+            for name, member in vars(cls).items():
+                if not name.startswith('_') and inspect.iscoroutinefunction(member):
+                    names.append(f"{cls.__name__}.{name}")
+    return sorted(names)
+
+
+def unaudited_queries() -> List[str]:
+    """Repository query methods neither in AUDITED_QUERIES nor in AUDIT_EXEMPT"""
+    covered = {name.split('[')[0] for name in AUDITED_QUERIES} | set(AUDIT_EXEMPT)
+    return [name for name in repository_query_methods() if name not in covered]
+
+
+# SQLite: "SCAN warnings" is a table scan, "SCAN warnings USING INDEX ..." is not
+_SQLITE_FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+_POSTGRES_FULL_SCAN = re.compile(r'Seq Scan on (\w+)')
+
+
+def find_full_scans(plan: List[str], dialect: str) -> List[str]:
+    """
+    Find tables that a query plan reads with a full table scan
+
+    Args:
+        plan: Lines of EXPLAIN output
+        dialect: Database dialect name ('sqlite' or 'postgresql')
+
+    Returns:
+        Names of fully scanned tables
+    """
+    pattern = _SQLITE_FULL_SCAN if dialect == 'sqlite' else _POSTGRES_FULL_SCAN
+    tables = []
+    for line in plan:
+        match = pattern.search(line.strip())
+        if match:
+            tables.append(match.group(1))
+    return tables
+
+
+async def explain(database: Database, stmt: Executable) -> List[str]:
+    """
+    Get the query plan for a statement
+
+    Args:
+        database: Database to run EXPLAIN against
+        stmt: SQLAlchemy statement
+
+    Returns:
+        Lines of EXPLAIN output
+    """
+    async with database.read_session() as session:
+        conn = await session.connection()
+        dialect = conn.dialect
+
+        if dialect.name == 'postgresql':
+            # Small tables are cheaper to seq-scan; disable that so only missing indexes show up
+            await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            prefix = "EXPLAIN "
+        else:
+            prefix = "EXPLAIN QUERY PLAN "
+
+        # Expand IN (...) lists so the statement is plain SQL
+        compiled = stmt.compile(dialect=dialect, compile_kwargs={'render_postcompile': True})
+        if compiled.positiontup is not None:
+            params: Any = tuple(None for _ in compiled.positiontup)
+        else:
+            params = {name: None for name in compiled.params}
+
+        result = await conn.exec_driver_sql(prefix + str(compiled), params)
+        # SQLite rows are (id, parent, notused, detail); PostgreSQL rows are a single text column
+        return [str(row[-1]) for row in result.fetchall()]
+
+
+async def audit_query_plans(database: Optional[Database] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    EXPLAIN every audited repository query and flag full table scans
+
+    Args:
+        database: Database to audit (defaults to the global instance)
+
+    Returns:
+        Mapping of query name to {'plan': [...], 'full_scans': [...]}
+    """
+    database = database or db
+    await database.initialize()
+
+    for name in unaudited_queries():
+        logger.warning(f"{name} is not covered by the query plan audit")
+
+    report: Dict[str, Dict[str, Any]] = {}
+    for name, build in AUDITED_QUERIES.items():
+        plan = await explain(database, build())
+        full_scans = find_full_scans(plan, database.dialect)
+        report[name] = {'plan': plan, 'full_scans': full_scans}
+
+        if full_scans:
+            logger.warning(f"Full table scan in {name}: {', '.join(full_scans)}")
+
+    return report
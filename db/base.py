@@ -1,16 +1,25 @@
 """
 Database base module for Cereal Bot
-Provides async SQLite database functionality using SQLAlchemy + aiosqlite
+Provides async database functionality using SQLAlchemy (aiosqlite or asyncpg)
 """
 
 import asyncio
+import json
 import os
-from typing import Optional, Any, Dict, List
+from contextvars import ContextVar
+from typing import Optional, Any, Awaitable, Callable, Dict, List
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
-from sqlalchemy import select, update, delete, func
+from sqlalchemy import select, update, delete, func, event, text, and_, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.dialects import postgresql, sqlite
 from contextlib import asynccontextmanager
 
+from core.config import config
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
 
 class Base(DeclarativeBase):
     """Base class for all database models"""
@@ -18,34 +27,167 @@ class Base(DeclarativeBase):
 
 
 class Database:
-    """Async SQLite database manager for the bot"""
+    """Async database manager for the bot (SQLite for development, PostgreSQL in production)"""
+
+    # Rows per multi-row INSERT; keeps bound parameters well under SQLite's limit
+    UPSERT_BATCH_SIZE: int = 500
 
-    def __init__(self, db_path: str = "cereal.db"):
+    def __init__(self, database_url: Optional[str] = None):
         """
         Initialize database connection
 
         Args:
-            db_path: Path to SQLite database file (relative to project root)
+            database_url: SQLAlchemy async URL (defaults to config.get_database_url())
         """
-        # Ensure db directory exists
-        os.makedirs(os.path.dirname(db_path) if os.path.dirname(db_path) else ".", exist_ok=True)
-
-        # Create async engine
-        self.engine = create_async_engine(
-            f"sqlite+aiosqlite:///{db_path}",
-            echo=False,  # Set to True for SQL query logging
-            connect_args={"check_same_thread": False}
-        )
-
-        # Create async session factory
+        self.url = make_url(database_url or config.get_database_url())
+        self.dialect = self.url.get_backend_name()
+        self.sqlite_tuned = False
+
+        if self.dialect == 'sqlite':
+            # Ensure db directory exists
+            db_path = self.url.database or ''
+            in_memory = not db_path or db_path == ':memory:'
+            if not in_memory:
+                os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+            # WAL tuning needs a real file shared by several connections
+            self.sqlite_tuned = config.SQLITE_TUNED and not in_memory
+
+            if self.sqlite_tuned:
+                # Exactly one writer connection; SQLite only ever allows one writer anyway
+                self.engine = create_async_engine(
+                    self.url,
+                    echo=config.DATABASE_ECHO,
+                    connect_args={"check_same_thread": False},
+                    pool_size=1,
+                    max_overflow=0,
+                    pool_timeout=config.DB_POOL_TIMEOUT,
+                )
+                # Separate read-only pool: WAL readers never block the writer
+                self.read_engine = create_async_engine(
+                    self.url,
+                    echo=config.DATABASE_ECHO,
+                    connect_args={"check_same_thread": False},
+                    pool_size=config.SQLITE_READ_POOL_SIZE,
+                    max_overflow=0,
+                    pool_timeout=config.DB_POOL_TIMEOUT,
+                )
+                event.listen(self.engine.sync_engine, 'connect', self._apply_sqlite_pragmas)
+                event.listen(self.read_engine.sync_engine, 'connect', self._apply_sqlite_read_pragmas)
+            else:
+                self.engine = create_async_engine(
+                    self.url,
+                    echo=config.DATABASE_ECHO,
+                    connect_args={"check_same_thread": False}
+                )
+                self.read_engine = self.engine
+        else:
+            # Pooled engine for server databases (PostgreSQL via asyncpg)
+            self.engine = create_async_engine(
+                self.url,
+                echo=config.DATABASE_ECHO,
+                pool_size=config.DB_POOL_SIZE,
+                max_overflow=config.DB_MAX_OVERFLOW,
+                pool_timeout=config.DB_POOL_TIMEOUT,
+                pool_recycle=config.DB_POOL_RECYCLE,
+                pool_pre_ping=config.DB_POOL_PRE_PING,
+            )
+            self.read_engine = self.engine
+
+        # Track peak pool occupancy so the pool can be sized from real load
+        self._peak_checked_out: Dict[int, int] = {}
+        for engine in {self.engine, self.read_engine}:
+            if hasattr(engine.pool, 'checkedout'):
+                event.listen(engine.sync_engine, 'checkout', self._checkout_hook(engine.pool))
+
+        # Create async session factories
         self.async_session = async_sessionmaker(
             self.engine,
             class_=AsyncSession,
             expire_on_commit=False
         )
+        self.read_session_factory = async_sessionmaker(
+            self.read_engine,
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+
+        # Serialises write transactions so they queue here instead of failing with "database is locked".
+        # Created on first use: before 3.10 an asyncio.Lock binds to the loop current at construction,
+        # and the global db is built at import time, outside the bot's loop.
+        self._write_lock: Optional[asyncio.Lock] = None
+
+        # Session shared by repository calls inside unit_of_work(), plus the task that owns it
+        self._unit_of_work: ContextVar[Optional[tuple]] = ContextVar(f'unit_of_work_{id(self)}', default=None)
 
         self._initialized = False
 
+    @staticmethod
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        """Apply performance pragmas to every new SQLite connection"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(config.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA cache_size={int(config.SQLITE_CACHE_SIZE)}")
+        cursor.execute(f"PRAGMA mmap_size={int(config.SQLITE_MMAP_SIZE)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    @classmethod
+    def _apply_sqlite_read_pragmas(cls, dbapi_connection, connection_record) -> None:
+        """Apply pragmas to reader connections and make them read-only"""
+        cls._apply_sqlite_pragmas(dbapi_connection, connection_record)
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    def _checkout_hook(self, pool):
+        """Build a pool checkout hook that records the occupancy high-water mark"""
+        def on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+            key = id(pool)
+            self._peak_checked_out[key] = max(self._peak_checked_out.get(key, 0), pool.checkedout())
+        return on_checkout
+
+    def _pool_metrics(self, engine) -> Dict[str, Any]:
+        """Occupancy metrics for a single engine's pool"""
+        pool = engine.pool
+        metrics: Dict[str, Any] = {
+            'pool_class': type(pool).__name__,
+            'peak_checked_out': self._peak_checked_out.get(id(pool), 0),
+        }
+
+        # Only queue-style pools expose occupancy counters
+        if hasattr(pool, 'checkedout'):
+            size = pool.size()
+            max_overflow = getattr(pool, '_max_overflow', 0)
+            checked_out = pool.checkedout()
+            capacity = size + max(max_overflow, 0)
+            metrics.update({
+                'size': size,
+                'max_overflow': max_overflow,
+                'checked_out': checked_out,
+                'checked_in': pool.checkedin(),
+                'overflow': max(pool.overflow(), 0),
+                'utilization': round(checked_out / capacity, 3) if capacity else 0.0,
+            })
+
+        return metrics
+
+    def pool_status(self) -> Dict[str, Any]:
+        """
+        Get connection pool occupancy metrics
+
+        Returns:
+            Dictionary with pool size, checked out/in connections, overflow and peak usage
+        """
+        status: Dict[str, Any] = {'dialect': self.dialect, **self._pool_metrics(self.engine)}
+        if self.read_engine is not self.engine:
+            status['read_pool'] = self._pool_metrics(self.read_engine)
+        if self.sqlite_tuned:
+            status['write_lock_held'] = self._write_lock is not None and self._write_lock.locked()
+        return status
+
     async def initialize(self) -> None:
         """Initialize database and create all tables"""
         if self._initialized:
@@ -55,6 +197,7 @@ class Database:
             # Create all tables
             async with self.engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
+                await conn.run_sync(self._ensure_indexes)
 
             self._initialized = True
             print("✓ Database initialized successfully")
@@ -63,16 +206,156 @@ class Database:
             print(f"✗ Database initialization failed: {e}")
             raise
 
+    @classmethod
+    def _ensure_indexes(cls, sync_conn) -> None:
+        """
+        Create indexes declared on models that are missing from existing tables
+
+        A unique index is never forced over existing data. If duplicate rows
+        block it, startup stops with a report of them: upserts rely on the index
+        for ON CONFLICT and would fail on every call without it. Merging them is
+        left to an explicit migration (db.migration.dedupe_members).
+        """
+        inspector = inspect(sync_conn)
+        for table in Base.metadata.sorted_tables:
+            existing = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in existing:
+                    continue
+                if not index.unique:
+                    try:
+                        index.create(sync_conn)
+                    except Exception as e:
+                        logger.warning(f"Could not create index {index.name}: {e}")
+                    continue
+
+                duplicates = cls._count_duplicates(sync_conn, index)
+                if duplicates:
+                    raise RuntimeError(
+                        f"{duplicates} group(s) of duplicate {table.name} rows block unique index {index.name}; "
+                        f"review and merge them with `python -m db.migration.dedupe_members`"
+                    )
+                index.create(sync_conn)
+
+    @staticmethod
+    def _count_duplicates(sync_conn, index) -> int:
+        """Number of distinct keys stored more than once under a unique index's columns"""
+        columns = list(index.columns)
+        groups = (
+            select(*columns)
+            .where(and_(*(column.is_not(None) for column in columns)))  # NULLs never collide in a unique index
+            .group_by(*columns)
+            .having(func.count() > 1)
+            .subquery()
+        )
+        return sync_conn.execute(select(func.count()).select_from(groups)).scalar()
+
     async def close(self) -> None:
         """Close database connections"""
         if hasattr(self, 'engine'):
             await self.engine.dispose()
+            if self.read_engine is not self.engine:
+                await self.read_engine.dispose()
+            self._write_lock = None
             print("✓ Database connections closed")
 
+    def _current_unit_of_work(self) -> Optional[AsyncSession]:
+        """Session of the unit of work active in the current task, if any"""
+        current = self._unit_of_work.get()
+        if current is None:
+            return None
+
+        # Child tasks inherit context variables; never share a session across tasks
+        session, owner, _ = current
+        return session if owner is asyncio.current_task() else None
+
+    async def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """
+        Run callback once the current unit of work commits
+
+        Outside a unit of work (or from another task) there is nothing to wait
+        for and the callback runs straight away. If the transaction rolls back,
+        queued callbacks are discarded.
+        """
+        current = self._unit_of_work.get()
+        if current is not None and current[1] is asyncio.current_task():
+            current[2].append(callback)
+            return
+        await callback()
+
+    @asynccontextmanager
+    async def unit_of_work(self):
+        """
+        Share one session and transaction between every database call in this block
+
+        Repository calls made inside the block (in the same task) join this session
+        instead of opening their own, and everything commits once on exit.
+        Nested blocks join the outer unit of work.
+
+        Usage:
+            async with db.unit_of_work():
+                await warning_repo.add_warning(...)
+                count = await warning_repo.get_warning_count(...)
+        """
+        current = self._current_unit_of_work()
+        if current is not None:
+            yield current
+            return
+
+        async with self._writer(publish=True) as session:
+            yield session
+
     @asynccontextmanager
     async def session(self):
-        """Async context manager for database sessions"""
+        """
+        Async context manager for read-write database sessions
+
+        With tuned SQLite the writer lock is held for the whole session. A
+        nested db.session() (or read_session()) in the same task joins the
+        outer session instead of waiting on a lock its own task holds; the
+        outer session commits for both.
+        """
+        current = self._current_unit_of_work()
+        if current is not None:
+            # Commit is left to the enclosing unit of work
+            yield current
+            return
+
+        async with self._writer(publish=self.sqlite_tuned) as session:
+            yield session
+
+    @asynccontextmanager
+    async def _writer(self, publish: bool):
+        """
+        Open a write session, under the writer lock with tuned SQLite
+
+        A published session is joined by nested calls in the same task and
+        collects after_commit() callbacks, which run once it has committed
+        and the writer lock is released.
+        """
+        after_commit: List[Callable[[], Awaitable[None]]] = []
+
+        if not self.sqlite_tuned:
+            async with self._session(after_commit if publish else None) as session:
+                yield session
+        else:
+            if self._write_lock is None:
+                self._write_lock = asyncio.Lock()
+            # SQLite: one write transaction at a time, queued in arrival order
+            async with self._write_lock:
+                async with self._session(after_commit if publish else None) as session:
+                    yield session
+
+        for callback in after_commit:
+            await callback()
+
+    @asynccontextmanager
+    async def _session(self, after_commit: Optional[List[Callable[[], Awaitable[None]]]] = None):
+        """Open a write session that commits on success and rolls back on error"""
         async with self.async_session() as session:
+            token = None
+            if after_commit is not None:
+                token = self._unit_of_work.set((session, asyncio.current_task(), after_commit))
             try:
                 yield session
                 await session.commit()
@@ -80,8 +363,22 @@ class Database:
                 await session.rollback()
                 raise
             finally:
+                if token is not None:
+                    self._unit_of_work.reset(token)
                 await session.close()
 
+    @asynccontextmanager
+    async def read_session(self):
+        """Async context manager for read-only database sessions"""
+        current = self._current_unit_of_work()
+        if current is not None:
+            # Read through the unit of work so uncommitted writes are visible
+            yield current
+            return
+
+        async with self.read_session_factory() as session:
+            yield session
+
     # Generic CRUD operations
 
     async def get(self, model: type[Base], **filters) -> Optional[Base]:
@@ -95,7 +392,7 @@ class Database:
         Returns:
             Model instance or None if not found
         """
-        async with self.session() as session:
+        async with self.read_session() as session:
             stmt = select(model).filter_by(**filters)
             result = await session.execute(stmt)
             return result.scalar_one_or_none()
@@ -111,7 +408,7 @@ class Database:
         Returns:
             List of model instances
         """
-        async with self.session() as session:
+        async with self.read_session() as session:
             stmt = select(model).filter_by(**filters)
             result = await session.execute(stmt)
             return list(result.scalars().all())
@@ -134,6 +431,65 @@ class Database:
             await session.refresh(instance)  # Load any defaults
             return instance
 
+    def insert(self, model: type[Base]):
+        """
+        Build a dialect-specific INSERT supporting ON CONFLICT clauses
+
+        Args:
+            model: SQLAlchemy model class
+
+        Returns:
+            PostgreSQL or SQLite Insert construct
+        """
+        if self.dialect == 'postgresql':
+            return postgresql.insert(model)
+        return sqlite.insert(model)
+
+    async def upsert(
+        self,
+        model: type[Base],
+        rows: List[Dict[str, Any]],
+        conflict_columns: List[str],
+        update_columns: Optional[List[str]] = None
+    ) -> List[Base]:
+        """
+        Insert rows or update them on conflict, in one statement per batch
+
+        Args:
+            model: SQLAlchemy model class
+            rows: Column data for each row (all rows must share the same keys)
+            conflict_columns: Columns of the primary key or unique index to match on
+            update_columns: Columns to overwrite on conflict (defaults to all non-conflict keys)
+
+        Returns:
+            List of inserted or updated model instances
+        """
+        if not rows:
+            return []
+
+        if update_columns is None:
+            update_columns = [key for key in rows[0] if key not in conflict_columns]
+
+        instances: List[Base] = []
+        async with self.session() as session:
+            for start in range(0, len(rows), self.UPSERT_BATCH_SIZE):
+                stmt = self.insert(model).values(rows[start:start + self.UPSERT_BATCH_SIZE])
+                if update_columns:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=conflict_columns,
+                        set_={column: stmt.excluded[column] for column in update_columns}
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+
+                result = await session.scalars(
+                    stmt.returning(model),
+                    execution_options={"populate_existing": True}
+                )
+                instances.extend(result.all())
+
+        return instances
+
     async def update(self, model: type[Base], filters: Dict[str, Any], **data) -> int:
         """
         Update records matching filters
@@ -178,11 +534,41 @@ class Database:
         Returns:
             Number of matching records
         """
-        async with self.session() as session:
+        async with self.read_session() as session:
             stmt = select(func.count()).select_from(model).filter_by(**filters)
             result = await session.execute(stmt)
             return result.scalar()
 
+    async def estimate_count(self, model: type[Base], cap: int = 1000, **filters) -> int:
+        """
+        Cheaply estimate the number of records matching filters
+
+        PostgreSQL returns the planner's row estimate without touching the table.
+        Other databases count at most `cap` rows, so the result is exact below the cap.
+
+        Args:
+            model: SQLAlchemy model class
+            cap: Upper bound on rows counted when no planner estimate is available
+            **filters: Column filters
+
+        Returns:
+            Estimated number of matching records
+        """
+        async with self.read_session() as session:
+            if self.dialect == 'postgresql':
+                stmt = select(model).filter_by(**filters)
+                # Inline the filter values; the estimate depends on them
+                sql = str(stmt.compile(dialect=self.engine.dialect, compile_kwargs={"literal_binds": True}))
+                result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+                plan = result.scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return int(plan[0]['Plan']['Plan Rows'])
+
+            capped = select(model).filter_by(**filters).limit(cap).subquery()
+            result = await session.execute(select(func.count()).select_from(capped))
+            return result.scalar()
+
     async def exists(self, model: type[Base], **filters) -> bool:
         """
         Check if any records match filters
@@ -194,8 +580,86 @@ class Database:
         Returns:
             True if any records exist, False otherwise
         """
-        count = await self.count(model, **filters)
-        return count > 0
+        async with self.read_session() as session:
+            # SELECT EXISTS stops at the first matching row
+            stmt = select(select(model).filter_by(**filters).exists())
+            result = await session.execute(stmt)
+            return bool(result.scalar())
+
+    # Query shapes: fetch only the rows and columns callers actually need
+
+    async def first(self, model: type[Base], order_by: Optional[str] = None, **filters) -> Optional[Base]:
+        """
+        Get the first record matching filters (LIMIT 1)
+
+        Args:
+            model: SQLAlchemy model class
+            order_by: Optional column name to order by (prefix with '-' for descending)
+            **filters: Column filters
+
+        Returns:
+            Model instance or None if not found
+        """
+        stmt = select(model).filter_by(**filters)
+        if order_by:
+            column = getattr(model, order_by.lstrip('-'))
+            stmt = stmt.order_by(column.desc() if order_by.startswith('-') else column.asc())
+
+        async with self.read_session() as session:
+            result = await session.execute(stmt.limit(1))
+            return result.scalars().first()
+
+    async def scalar(self, model: type[Base], column: str, **filters) -> Any:
+        """
+        Get a single column value from the first matching record
+
+        Args:
+            model: SQLAlchemy model class
+            column: Column name to fetch
+            **filters: Column filters
+
+        Returns:
+            Column value, or None if no record matches
+        """
+        async with self.read_session() as session:
+            stmt = select(getattr(model, column)).filter_by(**filters).limit(1)
+            result = await session.execute(stmt)
+            return result.scalar()
+
+    async def scalars(self, model: type[Base], column: str, **filters) -> List[Any]:
+        """
+        Get one column's values from every matching record
+
+        Args:
+            model: SQLAlchemy model class
+            column: Column name to fetch
+            **filters: Column filters
+
+        Returns:
+            List of column values
+        """
+        async with self.read_session() as session:
+            stmt = select(getattr(model, column)).filter_by(**filters)
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
+
+    async def row(self, model: type[Base], *columns: str, **filters) -> Optional[Dict[str, Any]]:
+        """
+        Get selected columns of the first matching record without building an ORM object
+
+        Args:
+            model: SQLAlchemy model class
+            *columns: Column names to fetch
+            **filters: Column filters
+
+        Returns:
+            Dictionary of column name to value, or None if no record matches
+        """
+        async with self.read_session() as session:
+            stmt = select(*(getattr(model, column) for column in columns)).filter_by(**filters).limit(1)
+            result = await session.execute(stmt)
+            row = result.mappings().first()
+            return dict(row) if row is not None else None
 
 
 # Global database instance
@@ -0,0 +1,132 @@
+"""
+Guild member de-duplication migration
+Merges duplicate (guild_id, user_id) rows left by older versions so the unique
+index behind member upserts can be created. Run explicitly; never at startup.
+
+    python -m db.migration.dedupe_members           # report only
+    python -m db.migration.dedupe_members --apply   # merge, then create the index
+"""
+
+import asyncio
+import json
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, func, tuple_
+
+from core import get_logger
+from db.base import Base, Database, db
+from db.models import GuildMember
+
+logger = get_logger(__name__)
+
+
+def _merge_roles(rows: List[GuildMember]) -> str:
+    """Union of every row's role IDs, newest row's order first"""
+    merged: List[Any] = []
+    for row in rows:
+        try:
+            roles = json.loads(row.roles or '[]')
+        except (TypeError, ValueError):
+            logger.warning(f"guild_members row {row.id}: unreadable roles {row.roles!r}, skipped")
+            continue
+        merged.extend(role for role in roles if role not in merged)
+    return json.dumps(merged)
+
+
+async def find_duplicate_members(database: Optional[Database] = None) -> Dict[Tuple[int, int], List[int]]:
+    """
+    Find members stored more than once
+
+    Returns:
+        (guild_id, user_id) -> row ids, oldest first
+    """
+    database = database or db
+    duplicated = (
+        select(GuildMember.guild_id, GuildMember.user_id)
+        .group_by(GuildMember.guild_id, GuildMember.user_id)
+        .having(func.count() > 1)
+    )
+    async with database.read_session() as session:
+        result = await session.execute(
+            select(GuildMember.guild_id, GuildMember.user_id, GuildMember.id)
+            .where(tuple_(GuildMember.guild_id, GuildMember.user_id).in_(duplicated))
+            .order_by(GuildMember.id)
+        )
+        groups: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for guild_id, user_id, row_id in result.all():
+            groups[(guild_id, user_id)].append(row_id)
+    return dict(groups)
+
+
+async def merge_duplicate_members(database: Optional[Database] = None, apply: bool = False) -> Dict[str, Any]:
+    """
+    Report duplicate members and, with apply=True, merge each group into one row
+
+    The newest row (highest id) is kept. It takes the earliest joined_at,
+    the union of all role IDs, and the newest non-empty nickname. The other
+    rows are deleted. Members have no counters to sum.
+
+    Args:
+        database: Database to clean (defaults to the global instance)
+        apply: Merge the groups; otherwise only report them
+
+    Returns:
+        {'groups': n, 'kept': [row ids], 'removed': [row ids], 'applied': bool}
+    """
+    database = database or db
+    groups = await find_duplicate_members(database)
+    report: Dict[str, Any] = {'groups': len(groups), 'kept': [], 'removed': [], 'applied': apply}
+
+    for (guild_id, user_id), ids in groups.items():
+        logger.warning(f"Member {user_id} in guild {guild_id} is stored {len(ids)} times (rows {ids})")
+    if not groups or not apply:
+        return report
+
+    async with database.unit_of_work() as session:
+        for ids in groups.values():
+            result = await session.execute(
+                select(GuildMember).where(GuildMember.id.in_(ids)).order_by(GuildMember.id.desc())
+            )
+            rows = list(result.scalars().all())
+            keep, extra = rows[0], rows[1:]
+
+            keep.roles = _merge_roles(rows)
+            keep.nickname = next((row.nickname for row in rows if row.nickname), None)
+            joined = [row.joined_at for row in rows if row.joined_at is not None]
+            keep.joined_at = min(joined) if joined else keep.joined_at
+
+            for row in extra:
+                logger.warning(
+                    f"Merged guild_members row {row.id} into {keep.id} "
+                    f"(guild {row.guild_id}, user {row.user_id}, nickname {row.nickname!r}, roles {row.roles})"
+                )
+                await session.delete(row)
+
+            report['kept'].append(keep.id)
+            report['removed'].extend(row.id for row in extra)
+
+    logger.info(f"Merged {report['groups']} duplicate member group(s), removed {len(report['removed'])} row(s)")
+    return report
+
+
+async def run_migration(apply: bool = False) -> Dict[str, Any]:
+    """Report (or merge) duplicates in the configured database, then create the index if it's clean"""
+    try:
+        async with db.engine.begin() as conn:
+            # Tables only; create_all skips tables that exist, so it never adds the blocked index
+            await conn.run_sync(Base.metadata.create_all)
+        report = await merge_duplicate_members(db, apply=apply)
+        if report['groups'] and not apply:
+            logger.info("Re-run with --apply to merge these rows")
+        else:
+            await db.initialize()
+        return report
+    finally:
+        await db.close()
+
+
+if __name__ == "__main__":
+    results = asyncio.run(run_migration(apply='--apply' in sys.argv[1:]))
+    exit(0 if results['applied'] or not results['groups'] else 1)
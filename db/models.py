@@ -4,7 +4,7 @@ Database models for Cereal Bot
 
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import BigInteger, String, DateTime, Boolean, Integer, Text, ForeignKey
+from sqlalchemy import BigInteger, String, DateTime, Boolean, Integer, Text, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -13,6 +13,9 @@ from .base import Base
 class User(Base):
     """User data model"""
     __tablename__ = 'users'
+    __table_args__ = (
+        Index('ix_users_last_active', 'last_active'),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)  # Discord user ID
     username: Mapped[str] = mapped_column(String(32), nullable=False)
@@ -60,6 +63,10 @@ class Guild(Base):
 class GuildMember(Base):
     """Guild member data model (many-to-many relationship)"""
     __tablename__ = 'guild_members'
+    __table_args__ = (
+        # One row per member per guild; also the conflict target for upserts
+        Index('ix_guild_members_guild_user', 'guild_id', 'user_id', unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     guild_id: Mapped[int] = mapped_column(BigInteger, ForeignKey('guilds.id'), nullable=False)
@@ -81,6 +88,10 @@ class GuildMember(Base):
 class Warning(Base):
     """Warning/moderation data model"""
     __tablename__ = 'warnings'
+    __table_args__ = (
+        # Per-member history and counts; trailing id serves ORDER BY id
+        Index('ix_warnings_guild_user', 'guild_id', 'user_id', 'id'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     guild_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -96,6 +107,9 @@ class Warning(Base):
 class CustomCommand(Base):
     """Custom command data model"""
     __tablename__ = 'custom_commands'
+    __table_args__ = (
+        Index('ix_custom_commands_guild_name', 'guild_id', 'name'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     guild_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -112,6 +126,15 @@ class CustomCommand(Base):
 class Giveaway(Base):
     """Giveaway data model"""
     __tablename__ = 'giveaways'
+    __table_args__ = (
+        # Partial index: only running giveaways are ever scanned by end time
+        Index(
+            'ix_giveaways_active_end_time', 'end_time',
+            sqlite_where=text('active = 1'),
+            postgresql_where=text('active'),
+        ),
+        Index('ix_giveaways_guild_id', 'guild_id'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     guild_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -125,7 +148,95 @@ class Giveaway(Base):
     created_by: Mapped[int] = mapped_column(BigInteger, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     active: Mapped[bool] = mapped_column(Boolean, default=True)
-    participants: Mapped[str] = mapped_column(Text, default='[]')  # JSON array of user IDs
+    # Legacy JSON array of user IDs; moved into giveaway_entries at startup
+    participants: Mapped[str] = mapped_column(Text, default='[]')
+
+    # Relationships
+    entries: Mapped[list["GiveawayEntry"]] = relationship(
+        back_populates="giveaway", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    def __repr__(self):
+        return f"<Giveaway(id={self.id}, title='{self.title}', active={self.active})>"
+
+
+class GiveawayEntry(Base):
+    """Giveaway entry data model (one row per participant)"""
+    __tablename__ = 'giveaway_entries'
+    __table_args__ = (
+        # One entry per user per giveaway; also the conflict target for insert-or-ignore
+        Index('ix_giveaway_entries_giveaway_user', 'giveaway_id', 'user_id', unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    giveaway_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey('giveaways.id', ondelete='CASCADE'), nullable=False
+    )
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    entered_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    giveaway: Mapped["Giveaway"] = relationship(back_populates="entries")
+
+    def __repr__(self):
+        return f"<GiveawayEntry(giveaway_id={self.giveaway_id}, user_id={self.user_id})>"
+
+
+class Reminder(Base):
+    """Reminder data model (rows are deleted once delivered)"""
+    __tablename__ = 'reminders'
+    __table_args__ = (
+        # /reminders lists a user's reminders soonest first
+        Index('ix_reminders_user_remind_at', 'user_id', 'remind_at'),
+        # Startup seeding reads (id, remind_at) from this index alone
+        Index('ix_reminders_remind_at', 'remind_at'),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    guild_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    channel_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    remind_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Reminder(id={self.id}, user_id={self.user_id}, remind_at={self.remind_at})>"
+
+
+class Timer(Base):
+    """Countdown timer data model (rows are deleted once the timer fires)"""
+    __tablename__ = 'timers'
+    __table_args__ = (
+        # Startup seeding reads (id, ends_at) from this index alone
+        Index('ix_timers_ends_at', 'ends_at'),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    channel_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    message_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)  # "Timer Started" message to edit
+    label: Mapped[str] = mapped_column(String(50), nullable=False)  # e.g. "5 minutes"
+    ends_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Timer(id={self.id}, user_id={self.user_id}, ends_at={self.ends_at})>"
+
+
+class AfkStatus(Base):
+    """AFK status data model (one row per AFK member per guild)"""
+    __tablename__ = 'afk_statuses'
+    __table_args__ = (
+        # Also the conflict target for upserts
+        Index('ix_afk_statuses_guild_user', 'guild_id', 'user_id', unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    guild_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    reason: Mapped[str] = mapped_column(String(200), nullable=False)
+    since: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
     def __repr__(self):
-        return f"<Giveaway(id={self.id}, title='{self.title}', active={self.active})>"
\ No newline at end of file
+        return f"<AfkStatus(guild_id={self.guild_id}, user_id={self.user_id})>"
\ No newline at end of file
@@ -3,24 +3,88 @@ Repository pattern implementation for Cereal Bot
 Provides high-level data access methods for database entities
 """
 
-from typing import List, Optional, Dict, Any, Type, TypeVar, Generic
-from sqlalchemy import select, update, delete, func, and_, or_
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Type, TypeVar, Generic, Iterable, Callable, Awaitable, Hashable
+from sqlalchemy import select, update, delete, func, and_, or_, tuple_, literal, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .base import db
-from .models import User, Guild, GuildMember, Warning, CustomCommand, Giveaway
-from core import get_logger
+from .models import User, Guild, GuildMember, Warning, CustomCommand, Giveaway, GiveawayEntry, Reminder, Timer, AfkStatus
+from core import get_logger, CacheBackend, MISSING, get_cache
 
 logger = get_logger(__name__)
 
 T = TypeVar('T')
 
 
+def encode_cursor(values: List[Any]) -> str:
+    """Encode keyset values as an opaque, URL-safe pagination cursor"""
+    payload = [{'dt': value.isoformat()} if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def _decode_cursor_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value['dt'])
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    raise TypeError(f"unexpected cursor value {value!r}")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Decode a pagination cursor produced by encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed, whatever the reason
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(payload, list):
+            raise TypeError("cursor payload is not a list")
+        return [_decode_cursor_value(value) for value in payload]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
 class BaseRepository(Generic[T]):
     """Base repository class with common CRUD operations"""
 
-    def __init__(self, model: Type[T]):
+    def __init__(self, model: Type[T], cache: Optional[CacheBackend] = None):
         self.model = model
+        self.cache = cache  # Optional read-through cache keyed by entity id
+
+    async def _read_through(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a cached value, loading and caching it on a miss"""
+        if self.cache is None:
+            return await loader()
+
+        value = await self.cache.get(key)
+        if value is MISSING:
+            value = await loader()
+            await self.cache.set(key, value)
+        return value
+
+    async def _invalidate(self, filters: Dict[str, Any]) -> None:
+        """
+        Drop cache entries affected by a write matching filters
+
+        Inside a unit of work this waits for the commit; dropping entries
+        earlier would let a concurrent reader re-cache the old row.
+        """
+        if self.cache is None:
+            return
+
+        async def drop() -> None:
+            if 'id' in filters:
+                await self.cache.delete(filters['id'])
+            else:
+                # Can't tell which entities matched; drop everything
+                await self.cache.clear()
+
+        await db.after_commit(drop)
 
     async def get_by_id(self, id: int) -> Optional[T]:
         """Get entity by ID"""
@@ -30,17 +94,50 @@ class BaseRepository(Generic[T]):
         """Get all entities matching filters"""
         return await db.get_all(self.model, **filters)
 
+    async def get_many(self, ids: Iterable[int]) -> List[T]:
+        """Get entities by ID in one query"""
+        ids = list(ids)
+        if not ids:
+            return []
+        async with db.read_session() as session:
+            result = await session.execute(select(self.model).where(self.model.id.in_(ids)))
+            return list(result.scalars().all())
+
+    async def delete_many(self, ids: Iterable[int]) -> int:
+        """Delete entities by ID in one statement"""
+        ids = list(ids)
+        if not ids:
+            return 0
+        async with db.session() as session:
+            result = await session.execute(delete(self.model).where(self.model.id.in_(ids)))
+        for id in ids:
+            await self._invalidate({'id': id})
+        return result.rowcount
+
     async def create(self, **data) -> T:
         """Create new entity"""
-        return await db.create(self.model, **data)
+        instance = await db.create(self.model, **data)
+        await self._invalidate({'id': instance.id})  # Drop any cached "not found"
+        return instance
 
     async def update(self, filters: Dict[str, Any], **data) -> int:
         """Update entities matching filters"""
-        return await db.update(self.model, filters, **data)
+        updated = await db.update(self.model, filters, **data)
+        await self._invalidate(filters)
+        return updated
 
     async def delete(self, **filters) -> int:
         """Delete entities matching filters"""
-        return await db.delete(self.model, **filters)
+        deleted = await db.delete(self.model, **filters)
+        await self._invalidate(filters)
+        return deleted
+
+    async def upsert(self, rows: List[Dict[str, Any]], conflict_columns: List[str]) -> List[T]:
+        """Insert or update entities in a single statement per batch"""
+        instances = await db.upsert(self.model, rows, conflict_columns)
+        for instance in instances:
+            await self._invalidate({'id': instance.id})
+        return instances
 
     async def exists(self, **filters) -> bool:
         """Check if any entities match filters"""
@@ -50,21 +147,39 @@ class BaseRepository(Generic[T]):
         """Count entities matching filters"""
         return await db.count(self.model, **filters)
 
-    async def get_first(self, **filters) -> Optional[T]:
+    async def get_first(self, order_by: Optional[str] = None, **filters) -> Optional[T]:
         """Get first entity matching filters"""
-        results = await self.get_all(**filters)
-        return results[0] if results else None
+        return await db.first(self.model, order_by=order_by, **filters)
+
+    async def get_value(self, column: str, **filters) -> Any:
+        """Get one column of the first entity matching filters"""
+        return await db.scalar(self.model, column, **filters)
+
+    async def get_values(self, column: str, **filters) -> List[Any]:
+        """Get one column of every entity matching filters"""
+        return await db.scalars(self.model, column, **filters)
 
-    async def get_paginated(self, page: int = 1, per_page: int = 10, **filters) -> Dict[str, Any]:
-        """Get paginated results"""
+    async def get_row(self, *columns: str, **filters) -> Optional[Dict[str, Any]]:
+        """Get selected columns of the first entity matching filters"""
+        return await db.row(self.model, *columns, **filters)
+
+    async def get_paginated(self, page: int = 1, per_page: int = 10, count: str = 'exact', **filters) -> Dict[str, Any]:
+        """
+        Get paginated results (OFFSET/LIMIT)
+
+        count: 'exact' runs COUNT(*), 'estimated' uses db.estimate_count, 'none' skips counting.
+        Prefer get_page_after for deep pages on large tables.
+        """
         offset = (page - 1) * per_page
 
-        async with db.session() as session:
-            # Get total count
-            count_query = select(func.count()).select_from(self.model).filter_by(**filters)
-            total_result = await session.execute(count_query)
-            total = total_result.scalar()
+        if count == 'estimated':
+            total = await db.estimate_count(self.model, **filters)
+        elif count == 'exact':
+            total = await self.count(**filters)
+        else:
+            total = None
 
+        async with db.read_session() as session:
             # Get paginated results
             query = select(self.model).filter_by(**filters).offset(offset).limit(per_page)
             result = await session.execute(query)
@@ -73,9 +188,67 @@ class BaseRepository(Generic[T]):
         return {
             'items': items,
             'total': total,
+            'total_is_estimate': count == 'estimated',
             'page': page,
             'per_page': per_page,
-            'pages': (total + per_page - 1) // per_page
+            'pages': (total + per_page - 1) // per_page if total is not None else None
+        }
+
+    async def get_page_after(
+        self,
+        cursor: Optional[str] = None,
+        per_page: int = 10,
+        order_by: str = 'id',
+        descending: bool = False,
+        **filters
+    ) -> Dict[str, Any]:
+        """
+        Get a page of results using keyset (cursor) pagination
+
+        Each page is an index range scan from the previous page's last row, so deep
+        pages cost the same as the first. order_by should be an indexed column;
+        ties are broken by id.
+
+        Args:
+            cursor: Opaque cursor from a previous page (None for the first page)
+            per_page: Page size
+            order_by: Column to order by
+            descending: Newest/highest first when True
+            **filters: Column filters
+
+        Returns:
+            Dictionary with 'items' and 'next_cursor' (None on the last page)
+        """
+        order_column = getattr(self.model, order_by)
+        id_column = self.model.id
+        keys = [order_column] if order_by == 'id' else [order_column, id_column]
+
+        query = select(self.model).filter_by(**filters)
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(keys):
+                raise ValueError("Invalid pagination cursor")
+            position = tuple_(*keys) if len(keys) > 1 else keys[0]
+            bound = tuple_(*values) if len(keys) > 1 else values[0]
+            query = query.where(position < bound if descending else position > bound)
+
+        query = query.order_by(*(key.desc() if descending else key.asc() for key in keys))
+        query = query.limit(per_page + 1)  # One extra row tells us whether there is a next page
+
+        async with db.read_session() as session:
+            result = await session.execute(query)
+            items = list(result.scalars().all())
+
+        next_cursor = None
+        if len(items) > per_page:
+            items = items[:per_page]
+            last = items[-1]
+            next_cursor = encode_cursor([getattr(last, key.key) for key in keys])
+
+        return {
+            'items': items,
+            'next_cursor': next_cursor,
+            'per_page': per_page
         }
 
 
@@ -89,9 +262,10 @@ class UserRepository(BaseRepository[User]):
         """Get user by Discord ID"""
         return await self.get_by_id(discord_id)
 
-    async def create_or_update_from_discord(self, discord_user) -> User:
-        """Create or update user from Discord user object"""
-        user_data = {
+    @staticmethod
+    def _user_data(discord_user) -> Dict[str, Any]:
+        """Map a Discord user object to User column data"""
+        return {
             'id': discord_user.id,
             'username': discord_user.name,
             'discriminator': getattr(discord_user, 'discriminator', None),
@@ -99,21 +273,23 @@ class UserRepository(BaseRepository[User]):
             'bot': discord_user.bot
         }
 
-        existing = await self.get_by_discord_id(discord_user.id)
-        if existing:
-            # Update existing user
-            await self.update({'id': discord_user.id}, **user_data)
-            return await self.get_by_discord_id(discord_user.id)
-        else:
-            # Create new user
-            return await self.create(**user_data)
+    async def create_or_update_from_discord(self, discord_user) -> User:
+        """Create or update user from Discord user object"""
+        users = await self.upsert([self._user_data(discord_user)], conflict_columns=['id'])
+        return users[0]
+
+    async def bulk_create_or_update_from_discord(self, discord_users: Iterable) -> List[User]:
+        """Create or update many users from Discord user objects"""
+        # Deduplicate: PostgreSQL rejects touching the same row twice in one statement
+        rows = {user.id: self._user_data(user) for user in discord_users}
+        return await self.upsert(list(rows.values()), conflict_columns=['id'])
 
     async def get_active_users(self, days: int = 7) -> List[User]:
         """Get users active within the last N days"""
-        from datetime import datetime, timedelta
+        from datetime import timedelta
 
         cutoff = datetime.utcnow() - timedelta(days=days)
-        async with db.session() as session:
+        async with db.read_session() as session:
             stmt = select(User).where(User.last_active >= cutoff).order_by(User.last_active.desc())
             result = await session.execute(stmt)
             return list(result.scalars().all())
@@ -123,7 +299,8 @@ class GuildRepository(BaseRepository[Guild]):
     """Repository for Guild entities"""
 
     def __init__(self):
-        super().__init__(Guild)
+        # Settings are read on hot paths (prefix, timezone, log channel)
+        super().__init__(Guild, cache=get_cache('guild_settings'))
 
     async def get_by_discord_id(self, discord_id: int) -> Optional[Guild]:
         """Get guild by Discord ID"""
@@ -138,12 +315,8 @@ class GuildRepository(BaseRepository[Guild]):
             'member_count': discord_guild.member_count
         }
 
-        existing = await self.get_by_discord_id(discord_guild.id)
-        if existing:
-            await self.update({'id': discord_guild.id}, **guild_data)
-            return await self.get_by_discord_id(discord_guild.id)
-        else:
-            return await self.create(**guild_data)
+        guilds = await self.upsert([guild_data], conflict_columns=['id'])
+        return guilds[0]
 
     async def update_member_count(self, guild_id: int, count: int) -> bool:
         """Update member count for guild"""
@@ -151,19 +324,18 @@ class GuildRepository(BaseRepository[Guild]):
         return updated > 0
 
     async def get_guild_settings(self, guild_id: int) -> Optional[Dict[str, Any]]:
-        """Get guild settings as dictionary"""
-        guild = await self.get_by_discord_id(guild_id)
-        if not guild:
-            return None
-
-        return {
-            'prefix': guild.prefix,
-            'timezone': guild.timezone,
-            'welcome_enabled': guild.welcome_enabled,
-            'welcome_channel_id': guild.welcome_channel_id,
-            'welcome_message': guild.welcome_message,
-            'log_channel_id': guild.log_channel_id
-        }
+        """Get guild settings as dictionary (cached)"""
+        settings = await self._read_through(guild_id, lambda: self.get_row(
+            'prefix',
+            'timezone',
+            'welcome_enabled',
+            'welcome_channel_id',
+            'welcome_message',
+            'log_channel_id',
+            id=guild_id
+        ))
+        # Copy so callers can't mutate the cached entry
+        return dict(settings) if settings is not None else None
 
 
 class GuildMemberRepository(BaseRepository[GuildMember]):
@@ -174,7 +346,7 @@ class GuildMemberRepository(BaseRepository[GuildMember]):
 
     async def get_member(self, guild_id: int, user_id: int) -> Optional[GuildMember]:
         """Get guild member by guild and user ID"""
-        return await db.get(GuildMember, guild_id=guild_id, user_id=user_id)
+        return await self.get_first(guild_id=guild_id, user_id=user_id)
 
     async def create_or_update_member(self, guild_id: int, user_id: int, **data) -> GuildMember:
         """Create or update guild member"""
@@ -184,12 +356,32 @@ class GuildMemberRepository(BaseRepository[GuildMember]):
             **data
         }
 
-        existing = await self.get_member(guild_id, user_id)
-        if existing:
-            await self.update({'guild_id': guild_id, 'user_id': user_id}, **member_data)
-            return await self.get_member(guild_id, user_id)
-        else:
-            return await self.create(**member_data)
+        members = await self.upsert([member_data], conflict_columns=['guild_id', 'user_id'])
+        if members:
+            return members[0]
+        # Nothing to update on conflict: DO NOTHING returns no row for an existing member
+        return await self.get_member(guild_id, user_id)
+
+    @staticmethod
+    def _member_data(guild_id: int, discord_member) -> Dict[str, Any]:
+        """Map a Discord member object to GuildMember column data"""
+        joined_at = discord_member.joined_at or datetime.utcnow()
+        return {
+            'guild_id': guild_id,
+            'user_id': discord_member.id,
+            'nickname': discord_member.nick,
+            'roles': json.dumps([role.id for role in discord_member.roles[1:]]),  # Exclude @everyone
+            'joined_at': joined_at.replace(tzinfo=None),  # Stored as naive UTC
+        }
+
+    async def bulk_create_or_update_from_discord(self, guild_id: int, discord_members: Iterable) -> List[GuildMember]:
+        """Sync a guild's member list (users first, then memberships)"""
+        discord_members = list(discord_members)
+        rows = {member.id: self._member_data(guild_id, member) for member in discord_members}
+
+        async with db.unit_of_work():
+            await user_repo.bulk_create_or_update_from_discord(discord_members)
+            return await self.upsert(list(rows.values()), conflict_columns=['guild_id', 'user_id'])
 
 
 class WarningRepository(BaseRepository[Warning]):
@@ -217,6 +409,14 @@ class WarningRepository(BaseRepository[Warning]):
         """Get warning count for a user in a guild"""
         return await self.count(guild_id=guild_id, user_id=user_id)
 
+    async def get_warning_page(
+        self, guild_id: int, user_id: int, cursor: Optional[str] = None, per_page: int = 5
+    ) -> Dict[str, Any]:
+        """Get a page of a user's warnings, newest first"""
+        return await self.get_page_after(
+            cursor=cursor, per_page=per_page, descending=True, guild_id=guild_id, user_id=user_id
+        )
+
 
 class CustomCommandRepository(BaseRepository[CustomCommand]):
     """Repository for CustomCommand entities"""
@@ -230,7 +430,7 @@ class CustomCommandRepository(BaseRepository[CustomCommand]):
 
     async def get_command(self, guild_id: int, name: str) -> Optional[CustomCommand]:
         """Get a specific custom command"""
-        return await db.get(CustomCommand, guild_id=guild_id, name=name)
+        return await self.get_first(guild_id=guild_id, name=name)
 
     async def increment_usage(self, command_id: int) -> bool:
         """Increment usage count for a command"""
@@ -255,11 +455,16 @@ class GiveawayRepository(BaseRepository[Giveaway]):
             filters['guild_id'] = guild_id
         return await self.get_all(**filters)
 
+    async def get_active_deadlines(self) -> List[tuple]:
+        """Get (id, end_time) for every active giveaway, for seeding the end scheduler"""
+        async with db.read_session() as session:
+            stmt = select(Giveaway.id, Giveaway.end_time).where(Giveaway.active == True)
+            result = await session.execute(stmt)
+            return [tuple(row) for row in result.all()]
+
     async def get_expired_giveaways(self) -> List[Giveaway]:
         """Get expired giveaways that need processing"""
-        from datetime import datetime
-
-        async with db.session() as session:
+        async with db.read_session() as session:
             stmt = select(Giveaway).where(
                 and_(Giveaway.active == True, Giveaway.end_time <= datetime.utcnow())
             )
@@ -267,24 +472,100 @@ class GiveawayRepository(BaseRepository[Giveaway]):
             return list(result.scalars().all())
 
     async def add_participant(self, giveaway_id: int, user_id: int) -> bool:
-        """Add a participant to a giveaway"""
-        giveaway = await self.get_by_id(giveaway_id)
-        if not giveaway or not giveaway.active:
-            return False
-
-        participants = giveaway.participants or '[]'
-        import json
-        try:
-            participant_list = json.loads(participants)
-        except:
-            participant_list = []
-
-        if user_id not in participant_list:
-            participant_list.append(user_id)
-            participants = json.dumps(participant_list)
-            await self.update({'id': giveaway_id}, participants=participants)
-            return True
-        return False
+        """
+        Enter a user into an active giveaway
+
+        Insert-or-ignore in a single statement, so concurrent entries never
+        overwrite each other and duplicates are rejected by the unique index.
+
+        Returns:
+            True if the user was entered, False if already entered or the giveaway is not active
+        """
+        is_active = exists().where(Giveaway.id == giveaway_id, Giveaway.active == True)
+        stmt = db.insert(GiveawayEntry).from_select(
+            ['giveaway_id', 'user_id', 'entered_at'],
+            select(literal(giveaway_id), literal(user_id), literal(datetime.utcnow())).where(is_active)
+        ).on_conflict_do_nothing(index_elements=['giveaway_id', 'user_id'])
+
+        async with db.session() as session:
+            result = await session.execute(stmt)
+            return result.rowcount > 0
+
+    async def remove_participant(self, giveaway_id: int, user_id: int) -> bool:
+        """Withdraw a user from a giveaway that is still running"""
+        is_active = exists().where(Giveaway.id == giveaway_id, Giveaway.active == True)
+        stmt = delete(GiveawayEntry).where(
+            GiveawayEntry.giveaway_id == giveaway_id,
+            GiveawayEntry.user_id == user_id,
+            is_active
+        )
+
+        async with db.session() as session:
+            result = await session.execute(stmt)
+            return result.rowcount > 0
+
+    async def is_participant(self, giveaway_id: int, user_id: int) -> bool:
+        """Check if a user has entered a giveaway"""
+        return await db.exists(GiveawayEntry, giveaway_id=giveaway_id, user_id=user_id)
+
+    async def get_participant_count(self, giveaway_id: int) -> int:
+        """Get the number of entrants in a giveaway"""
+        return await db.count(GiveawayEntry, giveaway_id=giveaway_id)
+
+    async def pick_winners(self, giveaway_id: int, count: int) -> List[int]:
+        """
+        Draw random winners from a giveaway's entrants
+
+        The sample is taken in SQL, so only the winners' IDs leave the database.
+
+        Args:
+            giveaway_id: Giveaway ID
+            count: Maximum number of winners
+
+        Returns:
+            List of winning user IDs (fewer than count if there are not enough entrants)
+        """
+        async with db.read_session() as session:
+            stmt = (
+                select(GiveawayEntry.user_id)
+                .where(GiveawayEntry.giveaway_id == giveaway_id)
+                .order_by(func.random())
+                .limit(count)
+            )
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
+
+    async def migrate_legacy_participants(self) -> int:
+        """
+        Move participants stored in the legacy JSON column into giveaway_entries
+
+        Returns:
+            Number of giveaways migrated
+        """
+        async with db.read_session() as session:
+            stmt = select(Giveaway.id, Giveaway.participants).where(
+                Giveaway.participants.is_not(None),
+                Giveaway.participants.not_in(['', '[]'])
+            )
+            legacy = (await session.execute(stmt)).all()
+
+        if not legacy:
+            return 0
+
+        async with db.unit_of_work():
+            for giveaway_id, participants in legacy:
+                try:
+                    user_ids = set(json.loads(participants))
+                except (ValueError, TypeError):
+                    logger.warning(f"Discarding unreadable participants for giveaway {giveaway_id}")
+                    user_ids = set()
+
+                rows = [{'giveaway_id': giveaway_id, 'user_id': int(user_id)} for user_id in user_ids]
+                await db.upsert(GiveawayEntry, rows, conflict_columns=['giveaway_id', 'user_id'], update_columns=[])
+                await self.update({'id': giveaway_id}, participants='[]')
+
+        logger.info(f"Migrated participants of {len(legacy)} giveaway(s) to giveaway_entries")
+        return len(legacy)
 
     async def end_giveaway(self, giveaway_id: int) -> Optional[Giveaway]:
         """End a giveaway and mark as inactive"""
@@ -292,6 +573,109 @@ class GiveawayRepository(BaseRepository[Giveaway]):
         return await self.get_by_id(giveaway_id)
 
 
+class ReminderRepository(BaseRepository[Reminder]):
+    """Repository for Reminder entities"""
+
+    def __init__(self):
+        super().__init__(Reminder)
+
+    async def add_reminder(
+        self,
+        user_id: int,
+        channel_id: int,
+        message: str,
+        remind_at: datetime,
+        guild_id: Optional[int] = None
+    ) -> Reminder:
+        """Add a reminder (remind_at is naive UTC)"""
+        return await self.create(
+            user_id=user_id,
+            guild_id=guild_id,
+            channel_id=channel_id,
+            message=message,
+            remind_at=remind_at
+        )
+
+    async def get_user_reminders(self, user_id: int, limit: int = 10) -> List[Reminder]:
+        """Get a user's pending reminders, soonest first"""
+        async with db.read_session() as session:
+            stmt = (
+                select(Reminder)
+                .where(Reminder.user_id == user_id)
+                .order_by(Reminder.remind_at)
+                .limit(limit)
+            )
+            result = await session.execute(stmt)
+            return list(result.scalars().all())
+
+    async def get_user_reminder_count(self, user_id: int) -> int:
+        """Get the number of pending reminders for a user"""
+        return await self.count(user_id=user_id)
+
+    async def get_pending_deadlines(self) -> List[tuple]:
+        """Get (id, remind_at) for every pending reminder, for seeding the scheduler"""
+        async with db.read_session() as session:
+            stmt = select(Reminder.id, Reminder.remind_at).order_by(Reminder.remind_at)
+            result = await session.execute(stmt)
+            return [tuple(row) for row in result.all()]
+
+
+class TimerRepository(BaseRepository[Timer]):
+    """Repository for Timer entities"""
+
+    def __init__(self):
+        super().__init__(Timer)
+
+    async def add_timer(
+        self,
+        user_id: int,
+        channel_id: int,
+        label: str,
+        ends_at: datetime,
+        message_id: Optional[int] = None
+    ) -> Timer:
+        """Add a timer (ends_at is naive UTC)"""
+        return await self.create(
+            user_id=user_id,
+            channel_id=channel_id,
+            message_id=message_id,
+            label=label,
+            ends_at=ends_at
+        )
+
+    async def get_pending_deadlines(self) -> List[tuple]:
+        """Get (id, ends_at) for every running timer, for seeding the scheduler"""
+        async with db.read_session() as session:
+            stmt = select(Timer.id, Timer.ends_at).order_by(Timer.ends_at)
+            result = await session.execute(stmt)
+            return [tuple(row) for row in result.all()]
+
+
+class AfkRepository(BaseRepository[AfkStatus]):
+    """Repository for AfkStatus entities"""
+
+    def __init__(self):
+        super().__init__(AfkStatus)
+
+    async def set_afk(self, guild_id: int, user_id: int, reason: str, since: datetime) -> None:
+        """Mark a member AFK, replacing any existing status"""
+        await self.upsert(
+            [{'guild_id': guild_id, 'user_id': user_id, 'reason': reason, 'since': since}],
+            conflict_columns=['guild_id', 'user_id']
+        )
+
+    async def clear_afk(self, guild_id: int, user_id: int) -> bool:
+        """Clear a member's AFK status"""
+        return await self.delete(guild_id=guild_id, user_id=user_id) > 0
+
+    async def get_all_statuses(self) -> List[tuple]:
+        """Get (guild_id, user_id, reason, since) for every AFK member, for loading at startup"""
+        async with db.read_session() as session:
+            stmt = select(AfkStatus.guild_id, AfkStatus.user_id, AfkStatus.reason, AfkStatus.since)
+            result = await session.execute(stmt)
+            return [tuple(row) for row in result.all()]
+
+
 # Global repository instances
 user_repo = UserRepository()
 guild_repo = GuildRepository()
@@ -299,10 +683,14 @@ guild_member_repo = GuildMemberRepository()
 warning_repo = WarningRepository()
 custom_command_repo = CustomCommandRepository()
 giveaway_repo = GiveawayRepository()
+reminder_repo = ReminderRepository()
+timer_repo = TimerRepository()
+afk_repo = AfkRepository()
 
 
 async def initialize_repositories():
     """Initialize all repositories (called during bot startup)"""
+    await giveaway_repo.migrate_legacy_participants()
     logger.info("Repositories initialized")
 
 
@@ -315,11 +703,17 @@ __all__ = [
     'WarningRepository',
     'CustomCommandRepository',
     'GiveawayRepository',
+    'ReminderRepository',
+    'TimerRepository',
+    'AfkRepository',
     'user_repo',
     'guild_repo',
     'guild_member_repo',
     'warning_repo',
     'custom_command_repo',
     'giveaway_repo',
+    'reminder_repo',
+    'timer_repo',
+    'afk_repo',
     'initialize_repositories'
 ]
\ No newline at end of file
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Query plan audit script for Cereal Bot
+Runs EXPLAIN on every repository query against the configured database
+and exits non-zero if any of them needs a full table scan, or if a
+repository query is missing from the audit
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Allow running as `python scripts/audit_indexes.py` from the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db import db, close_db  # noqa: E402
+from db.audit import audit_query_plans, unaudited_queries  # noqa: E402
+
+
+async def run_audit(verbose: bool = False) -> bool:
+    """Run the audit and print a report"""
+    try:
+        report = await audit_query_plans(db)
+    finally:
+        await close_db()
+
+    flagged = 0
+    for name, result in report.items():
+        if result['full_scans']:
+            flagged += 1
+            print(f"❌ {name}: full scan of {', '.join(result['full_scans'])}")
+        else:
+            print(f"✅ {name}")
+
+        if verbose or result['full_scans']:
+            for line in result['plan']:
+                print(f"     {line}")
+
+    missing = unaudited_queries()
+    for name in missing:
+        print(f"⚠️ {name}: not audited (add it to AUDITED_QUERIES or AUDIT_EXEMPT in db/audit.py)")
+
+    print(f"\n{len(report)} queries audited, {flagged} with full table scans ({db.dialect})")
+    if missing:
+        print(f"{len(missing)} repository queries not covered by the audit")
+    return flagged == 0 and not missing
+
+
+if __name__ == "__main__":
+    verbose = len(sys.argv) > 1 and sys.argv[1] in ("-v", "--verbose")
+    success = asyncio.run(run_audit(verbose))
+    sys.exit(0 if success else 1)
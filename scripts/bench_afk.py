@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+AFK lookup benchmark for Cereal Bot
+Replays a synthetic message firehose against the old scan-every-AFK-user check
+and the (guild_id, user_id) store, and prints throughput for both
+
+Usage: python scripts/bench_afk.py [afk_users] [messages]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Allow running as `python scripts/bench_afk.py` from the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.afk import AfkStore  # noqa: E402
+
+GUILDS = 1000
+USERS_PER_GUILD = 500
+
+
+class User:
+    """Stand-in for discord.User with the same mentioned_in check"""
+
+    __slots__ = ('id', 'display_name')
+
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.display_name = f"user{user_id}"
+
+    def mentioned_in(self, message) -> bool:
+        if message.mention_everyone:
+            return True
+        return any(user.id == self.id for user in message.mentions)
+
+
+class Message:
+    """Stand-in for the discord.Message fields the AFK check reads"""
+
+    __slots__ = ('guild_id', 'author', 'mentions', 'raw_mentions', 'mention_everyone')
+
+    def __init__(self, guild_id: int, author: User, mentions):
+        self.guild_id = guild_id
+        self.author = author
+        self.mentions = mentions
+        self.raw_mentions = [user.id for user in mentions]
+        self.mention_everyone = False
+
+
+def member_id(guild_id: int, local_id: int) -> int:
+    """Distinct user IDs per guild, so the legacy dict holds one entry per AFK member"""
+    return guild_id * USERS_PER_GUILD + local_id
+
+
+def make_firehose(count: int, users, rng: random.Random):
+    """Synthetic messages from guild members, mostly with 0-2 mentions"""
+    def user(guild_id: int) -> User:
+        user_id = member_id(guild_id, rng.randrange(USERS_PER_GUILD))
+        return users.setdefault(user_id, User(user_id))
+
+    messages = []
+    for _ in range(count):
+        guild_id = rng.randrange(GUILDS)
+        mentions = [user(guild_id) for _ in range(rng.choice((0, 0, 0, 1, 1, 2)))]
+        author = user(guild_id)
+        messages.append(Message(guild_id, author, mentions))
+    return messages
+
+
+def bench_legacy(afk_users, users, messages) -> float:
+    """The old on_message check: every message walks every AFK user"""
+    get_user = users.get  # Stands in for bot.get_user
+    start = time.perf_counter()
+    hits = 0
+    for message in messages:
+        # Returning members are looked up but not popped, matching store.get below
+        hits += message.author.id in afk_users
+        for user_id in afk_users:
+            user = get_user(user_id)
+            if user and user.mentioned_in(message):
+                hits += 1
+    return time.perf_counter() - start
+
+
+def bench_store(store: AfkStore, messages) -> float:
+    start = time.perf_counter()
+    hits = 0
+    for message in messages:
+        hits += store.get(message.guild_id, message.author.id) is not None
+        hits += len(store.mentioned(message.guild_id, message.raw_mentions))
+    return time.perf_counter() - start
+
+
+async def fill(store: AfkStore, afk_users: int, rng: random.Random):
+    """Mark random members AFK through the store's public API, returning the old {user_id: reason}"""
+    legacy = {}
+    for _ in range(afk_users):
+        guild_id = rng.randrange(GUILDS)
+        user_id = member_id(guild_id, rng.randrange(USERS_PER_GUILD))
+        entry = await store.set(guild_id, user_id, "AFK")
+        legacy[user_id] = entry.reason
+    return legacy
+
+
+def main(afk_users: int = 10_000, message_count: int = 2_000):
+    rng = random.Random(42)
+    store = AfkStore(repository=None)
+    legacy = asyncio.run(fill(store, afk_users, rng))
+    assert len(legacy) == len(store)  # IDs are unique per member, so nothing collapses
+
+    users = {user_id: User(user_id) for user_id in legacy}  # The bot's user cache
+    messages = make_firehose(message_count, users, rng)
+    print(f"{len(store)} AFK members across {GUILDS} guilds, {message_count} messages\n")
+
+    for name, elapsed in (
+        ("legacy scan", bench_legacy(legacy, users, messages)),
+        ("(guild, user) store", bench_store(store, messages)),
+    ):
+        print(f"{name:<22} {elapsed * 1000:9.1f} ms  {message_count / elapsed:14,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+AI concurrency load test for Cereal Bot
+Fires bursts of concurrent /ask-style calls at a local mock completions server,
+through the old sync-SDK-in-a-thread path and the async AIService, and prints
+wall time and peak upstream concurrency for both, then compares time to first
+content for a buffered vs a streamed answer. No network or API key needed.
+
+Usage: python scripts/bench_ai.py [concurrency] [latency_ms]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from groq import Groq
+
+# Allow running as `python scripts/bench_ai.py` from the project root
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'tests'))
+
+from mock_groq import MockGroq  # noqa: E402
+from services.ai_service import AIService, CHAT_SYSTEM_PROMPT  # noqa: E402
+from services.rate_limiter import RateLimiter  # noqa: E402
+
+
+async def run_threaded(mock: MockGroq, concurrency: int) -> float:
+    """The previous implementation: sync Groq client wrapped in asyncio.to_thread"""
+    client = Groq(api_key='bench', base_url=mock.url, max_retries=0)
+
+    async def ask(i: int):
+        return await asyncio.to_thread(
+            client.chat.completions.create,
+            model=AIService.CHAT_MODEL,
+            messages=[{'role': 'system', 'content': CHAT_SYSTEM_PROMPT}, {'role': 'user', 'content': f"q{i}"}],
+            max_tokens=AIService.CHAT_MAX_TOKENS,
+        )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(ask(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    client.close()
+    return elapsed
+
+
+async def run_async(mock: MockGroq, concurrency: int) -> float:
+    """AIService on the async client with a keep-alive pool"""
+    service = AIService()
+    service.initialize(api_key='bench', base_url=mock.url)
+    service.limiter = RateLimiter(100_000, 100_000_000)  # measure the client, not the API quota
+
+    start = time.perf_counter()
+    await asyncio.gather(*(service.ask(f"q{i}") for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await service.close()
+    return elapsed
+
+
+async def first_content(latency_ms: int, token_ms: int = 50) -> None:
+    """Time until the user sees text: whole reply (ask) vs first delta (ask_stream)"""
+    question = "why is cereal considered a soup by some people on the internet"
+    generation = token_ms / 1000 * (len(question.split()) + 1)
+
+    # A buffered reply only leaves the server once every token is generated
+    results = {}
+    for name, mock in (
+        ("ask (buffered)", MockGroq(delay=latency_ms / 1000 + generation)),
+        ("ask_stream", MockGroq(delay=latency_ms / 1000, chunk_delay=token_ms / 1000)),
+    ):
+        await mock.start()
+        service = AIService()
+        service.initialize(api_key='bench', base_url=mock.url)
+        try:
+            start = time.perf_counter()
+            if name == "ask_stream":
+                first = None
+                async for _ in service.ask_stream(question):
+                    first = first or time.perf_counter() - start
+            else:
+                await service.ask(question)
+                first = time.perf_counter() - start
+            results[name] = (first, time.perf_counter() - start)
+        finally:
+            await service.close()
+            await mock.close()
+
+    print()
+    for name, (first, complete) in results.items():
+        print(f"{name:<24} first content after {first * 1000:6.0f} ms  complete after {complete * 1000:6.0f} ms")
+
+
+async def main(concurrency: int = 64, latency_ms: int = 250):
+    print(f"{concurrency} concurrent requests, {latency_ms} ms mock latency\n")
+    for name, runner in (("to_thread + sync Groq", run_threaded), ("AsyncGroq (AIService)", run_async)):
+        mock = await MockGroq(delay=latency_ms / 1000).start()
+        try:
+            elapsed = await runner(mock, concurrency)
+        finally:
+            await mock.close()
+        print(f"{name:<24} {elapsed * 1000:8.0f} ms total  {concurrency / elapsed:7.1f} req/s  peak in flight {mock.max_in_flight}")
+
+    await first_content(latency_ms)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*[int(arg) for arg in sys.argv[1:3]]))
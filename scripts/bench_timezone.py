@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Timezone benchmark for Cereal Bot
+Compares the old difflib.get_close_matches scan with the precomputed TimezoneIndex
+on a set of partial inputs, as typed keystroke by keystroke, and the per-minute
+cached zoneinfo rendering with fresh zone lookups and strftime on every call
+
+Usage: python scripts/bench_timezone.py [rounds]
+"""
+
+import difflib
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python 3.8
+    from backports.zoneinfo import ZoneInfo
+
+# Allow running as `python scripts/bench_timezone.py` from the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cogs.utility import TIMEZONE_MAP, DISPLAY_MAP  # noqa: E402
+from services.timezones import TimezoneIndex, iana_timezones, render, times_in  # noqa: E402
+
+TYPED = ["tokyo", "new york", "los angeles", "kolkta", "america/chicago", "est", "syd", "londn", "europe/b"]
+
+
+def keystrokes():
+    """Every prefix of every sample input, as autocomplete would see them"""
+    return [word[:end] for word in TYPED for end in range(1, len(word) + 1)]
+
+
+def bench(name: str, search, queries, rounds: int):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            search(query)
+    elapsed = time.perf_counter() - start
+    per_query = elapsed / (rounds * len(queries)) * 1_000_000
+    print(f"{name:<28} {per_query:10.1f} µs/query")
+
+
+def render_uncached(name: str):
+    """What /timezone did before: resolve the zone and format every field from scratch"""
+    now = datetime.now(ZoneInfo.no_cache(name))
+    offset = now.strftime("%z")
+    return (now.strftime("%A, %B %d, %Y"), now.strftime("%I:%M:%S %p"), now.strftime("%H:%M:%S"), f"UTC{offset[:3]}:{offset[3:]}")
+
+
+def main(rounds: int = 20):
+    start = time.perf_counter()
+    index = TimezoneIndex(TIMEZONE_MAP, DISPLAY_MAP, iana_timezones())
+    print(f"Index: {len(index)} entries built in {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    queries = keystrokes()
+    bench("difflib (old autocomplete)", lambda q: difflib.get_close_matches(q, TIMEZONE_MAP.keys(), n=25, cutoff=0.3), queries, rounds)
+    bench("TimezoneIndex.search", index.search, queries, rounds * 50)
+    bench("TimezoneIndex.resolve", index.resolve, queries, rounds * 50)
+
+    zones = sorted(set(TIMEZONE_MAP.values()))
+    print()
+    bench("uncached zone + strftime", render_uncached, zones, rounds * 5)
+    bench("timezones.render", render, zones, rounds * 50)
+    bench("timezones.times_in (x10)", lambda _: times_in(zones[:10]), [None], rounds * 50)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -4,8 +4,45 @@ Provides external API integration layers
 """
 
 from .ai_service import AIService, ai_service
+from .http_client import HttpClient, http_client
+from .scheduler import DeadlineScheduler, parse_duration
+from .afk import AfkStore, afk_store
+from .content_pool import ContentPool, pool_stats
+from .memes import MemeBuffer, Meme, meme_buffer
+from .weather import WeatherService, WeatherReport, WeatherError, CityNotFound, weather_service
+from .timezones import TimezoneIndex, TimezoneMatch, ZoneTime, get_zone, render, times_in
+from .tokenizer import Tokenizer, load_tokenizer
+from .rate_limiter import RateLimiter, TokenBucket, PRIORITY_INTERACTIVE, PRIORITY_BULK
 
 __all__ = [
     'AIService',
     'ai_service',
+    'HttpClient',
+    'http_client',
+    'DeadlineScheduler',
+    'parse_duration',
+    'AfkStore',
+    'afk_store',
+    'TimezoneIndex',
+    'TimezoneMatch',
+    'ZoneTime',
+    'get_zone',
+    'render',
+    'times_in',
+    'WeatherService',
+    'WeatherReport',
+    'WeatherError',
+    'CityNotFound',
+    'weather_service',
+    'MemeBuffer',
+    'Meme',
+    'meme_buffer',
+    'ContentPool',
+    'pool_stats',
+    'Tokenizer',
+    'load_tokenizer',
+    'RateLimiter',
+    'TokenBucket',
+    'PRIORITY_INTERACTIVE',
+    'PRIORITY_BULK',
 ]
\ No newline at end of file
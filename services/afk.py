@@ -0,0 +1,99 @@
+"""
+AFK store for Cereal Bot
+Keeps AFK statuses in memory keyed by (guild_id, user_id) and persists them,
+so the per-message check costs O(mentions in the message), not O(AFK users).
+"""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from core.logger import get_logger
+from db import afk_repo
+from db.repository import AfkRepository
+
+logger = get_logger(__name__)
+
+
+class AfkEntry(NamedTuple):
+    reason: str
+    since: datetime  # Naive UTC
+
+
+class AfkStore:
+    """
+    In-memory AFK index with write-through persistence.
+
+    Reads never touch the database; the table is only read once at startup.
+    Pass repository=None for a memory-only store (benchmarks, tests).
+    """
+
+    def __init__(self, repository: Optional[AfkRepository] = afk_repo):
+        self.repository = repository
+        self._entries: Dict[Tuple[int, int], AfkEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def load(self) -> int:
+        """
+        Load persisted statuses into memory
+
+        Returns:
+            Number of AFK members loaded
+        """
+        if self.repository is None:
+            return 0
+        rows = await self.repository.get_all_statuses()
+        self._entries = {(guild_id, user_id): AfkEntry(reason, since) for guild_id, user_id, reason, since in rows}
+        return len(self._entries)
+
+    def get(self, guild_id: int, user_id: int) -> Optional[AfkEntry]:
+        """Get a member's AFK status"""
+        return self._entries.get((guild_id, user_id))
+
+    async def set(self, guild_id: int, user_id: int, reason: str) -> AfkEntry:
+        """Mark a member AFK"""
+        entry = AfkEntry(reason, datetime.utcnow())
+        self._entries[(guild_id, user_id)] = entry
+        if self.repository is not None:
+            await self.repository.set_afk(guild_id, user_id, reason, entry.since)
+        return entry
+
+    async def clear(self, guild_id: int, user_id: int) -> Optional[AfkEntry]:
+        """
+        Clear a member's AFK status
+
+        Only members who were AFK cost a database write, so this is cheap to
+        call for every message author.
+
+        Returns:
+            The cleared status, or None if the member was not AFK
+        """
+        entry = self._entries.pop((guild_id, user_id), None)
+        if entry is not None and self.repository is not None:
+            await self.repository.clear_afk(guild_id, user_id)
+        return entry
+
+    def mentioned(self, guild_id: int, user_ids: Iterable[int]) -> List[Tuple[int, AfkEntry]]:
+        """
+        Find AFK members among mentioned user IDs
+
+        Args:
+            guild_id: Guild the message was sent in
+            user_ids: Mentioned user IDs (e.g. message.raw_mentions)
+
+        Returns:
+            (user_id, status) for each AFK member mentioned, in mention order
+        """
+        found = []
+        seen = set()
+        for user_id in user_ids:
+            entry = self._entries.get((guild_id, user_id))
+            if entry is not None and user_id not in seen:
+                seen.add(user_id)
+                found.append((user_id, entry))
+        return found
+
+
+# Global AFK store
+afk_store = AfkStore()
@@ -6,13 +6,15 @@ NEVER call the AI API directly from command handlers — use this service instea
 
 import asyncio
 import time
-from typing import List, Dict, Optional
+from typing import Any, AsyncIterator, List, Dict, Optional, Tuple
 
-import groq
-from groq import Groq, APIStatusError, RateLimitError
+import httpx
+from groq import AsyncGroq, APIStatusError, RateLimitError
 
 from core.config import config
 from core.logger import get_logger
+from services.rate_limiter import PRIORITY_BULK, PRIORITY_INTERACTIVE, RateLimiter
+from services.tokenizer import Tokenizer, load_tokenizer
 
 logger = get_logger(__name__)
 
@@ -39,8 +41,12 @@ class AIService:
     Thin async wrapper around the Groq chat-completions API.
 
     Features:
-    * Exponential-backoff retry on HTTP 429 (rate-limit) and transient 5xx errors
-    * Per-request token budgeting
+    * Client-side RPM/TPM token buckets synced from response headers, with
+      /ask served before /summarize and guilds taking turns (services/rate_limiter.py)
+    * Exponential-backoff retry on HTTP 429 (rate-limit) and transient 5xx errors,
+      with a 429 pausing every queued request, not just its own
+    * Concurrent map-reduce summarisation of long inputs
+    * Token-exact prompt budgeting per model (see services/tokenizer.py)
     * Clean error messages suitable for Discord
     """
 
@@ -61,28 +67,78 @@ class AIService:
     CHAT_TEMPERATURE: float = 0.7
     SUMMARY_TEMPERATURE: float = 0.3   # lower = more factual
 
+    # Prompt budgets (tokens); each is further capped by the model's window
+    CONTEXT_WINDOW_TOKENS: Dict[str, int] = {
+        "llama-3.3-70b-versatile": 131072,
+        "llama-3.1-8b-instant": 131072,
+    }
+    DEFAULT_CONTEXT_WINDOW_TOKENS: int = 8192
+    CHAT_PROMPT_TOKENS: int = config.AI_CHAT_PROMPT_TOKENS
+    SUMMARY_PROMPT_TOKENS: int = config.AI_SUMMARY_PROMPT_TOKENS  # per chunk / merge prompt
+
+    # Summarisation fan-out
+    SUMMARY_CONCURRENCY: int = 4       # summary calls in flight at once, across all commands
+
     def __init__(self):
-        self._client: Optional[Groq] = None
+        self._client: Optional[AsyncGroq] = None
         self._initialized: bool = False
+        self._summary_slots: Optional[asyncio.Semaphore] = None
+        self.limiter = RateLimiter(config.AI_RATE_LIMIT_RPM, config.AI_RATE_LIMIT_TPM)
+        self.tokenizer: Tokenizer = Tokenizer()  # estimating until initialize() loads a vocabulary
 
     # ------------------------------------------------------------------
     # Lifecycle
     # ------------------------------------------------------------------
 
-    def initialize(self) -> None:
+    def initialize(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        tokenizer_path: Optional[str] = None,
+    ) -> None:
         """
-        Initialise the Groq client from the GROQ_API_KEY env var.
+        Initialise the async Groq client from the GROQ_API_KEY env var.
         Called once during bot startup.
+
+        Requests share one keep-alive connection pool and run on the event
+        loop, so concurrent AI calls never queue for executor threads.
+
+        Args:
+            api_key:  Overrides GROQ_API_KEY (tests, load tests).
+            base_url: Overrides GROQ_BASE_URL, e.g. a local mock server.
+            tokenizer_path: Overrides TOKENIZER_PATH.
         """
-        api_key = config.GROQ_API_KEY
+        api_key = api_key or config.GROQ_API_KEY
         if not api_key:
             logger.warning("GROQ_API_KEY not set — AI commands will be unavailable")
             return
 
-        self._client = Groq(api_key=api_key)
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config.AI_MAX_CONNECTIONS,
+                max_keepalive_connections=config.AI_MAX_CONNECTIONS,
+                keepalive_expiry=config.AI_KEEPALIVE_SECONDS,
+            ),
+            timeout=httpx.Timeout(config.AI_TIMEOUT_SECONDS, connect=5.0),
+        )
+        self._client = AsyncGroq(
+            api_key=api_key,
+            base_url=base_url or config.GROQ_BASE_URL,
+            http_client=http_client,
+            max_retries=0,  # _call owns retries and back-off
+        )
+        self._summary_slots = asyncio.Semaphore(self.SUMMARY_CONCURRENCY)
+        self.tokenizer = load_tokenizer(tokenizer_path)
         self._initialized = True
         logger.info("✓ AI service initialised (Groq)")
 
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+        self._initialized = False
+
     @property
     def is_ready(self) -> bool:
         """Whether the service is configured and ready to accept requests."""
@@ -96,6 +152,7 @@ class AIService:
         self,
         user_message: str,
         context_messages: Optional[List[Dict[str, str]]] = None,
+        guild_id: Optional[int] = None,
     ) -> str:
         """
         Generate a smart chat response.
@@ -104,6 +161,7 @@ class AIService:
             user_message:   The user's question / prompt.
             context_messages: Optional list of recent messages for conversational
                               context, each dict with 'role' and 'content' keys.
+            guild_id:       Guild asking, for fair queueing (None for DMs).
 
         Returns:
             The assistant's reply text, or a user-friendly error string.
@@ -111,26 +169,125 @@ class AIService:
         if not self.is_ready:
             return "⚠️ AI features are currently unavailable (API key not configured)."
 
-        messages: List[Dict[str, str]] = [{"role": "system", "content": CHAT_SYSTEM_PROMPT}]
-
-        # Append conversation context (kept short to save tokens)
-        if context_messages:
-            messages.extend(context_messages[-10:])  # cap at last 10 messages
-
-        messages.append({"role": "user", "content": user_message})
-
         return await self._call(
-            messages=messages,
+            messages=self._chat_messages(user_message, context_messages),
             model=self.CHAT_MODEL,
             max_tokens=self.CHAT_MAX_TOKENS,
             temperature=self.CHAT_TEMPERATURE,
             feature="ask",
+            priority=PRIORITY_INTERACTIVE,
+            guild_id=guild_id,
+        )
+
+    async def ask_stream(
+        self,
+        user_message: str,
+        context_messages: Optional[List[Dict[str, str]]] = None,
+        guild_id: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Generate a chat response as it is produced, token by token.
+
+        Rate limits and 5xx errors are retried only until the first delta
+        arrives; after that a failure ends the stream with a short notice
+        rather than repeating text the user has already seen.
+
+        Args:
+            user_message:   The user's question / prompt.
+            context_messages: Optional recent messages, as for ask().
+            guild_id:       Guild asking, for fair queueing (None for DMs).
+
+        Yields:
+            Text deltas in order. Errors are yielded as a single
+            user-friendly string, so the caller can always display the output.
+        """
+        if not self.is_ready:
+            yield "⚠️ AI features are currently unavailable (API key not configured)."
+            return
+
+        messages = self._chat_messages(user_message, context_messages)
+        prompt_tokens = self.tokenizer.count_messages(messages)
+        estimate = prompt_tokens + self.CHAT_MAX_TOKENS
+        last_exception: Optional[Exception] = None
+
+        for attempt in range(1, self.MAX_RETRIES + 1):
+            await self.limiter.acquire(estimate, PRIORITY_INTERACTIVE, guild_id)
+            started = time.perf_counter()
+            streamed = ""
+            prompt_used = 0  # Refunded in full unless the request got through
+            try:
+                raw = await self._client.chat.completions.with_raw_response.create(
+                    model=self.CHAT_MODEL,
+                    messages=messages,
+                    max_tokens=self.CHAT_MAX_TOKENS,
+                    temperature=self.CHAT_TEMPERATURE,
+                    stream=True,
+                )
+                # Accepted: the prompt is processed even if no delta ever arrives
+                prompt_used = prompt_tokens
+                self.limiter.update(raw.headers)
+                async for chunk in await raw.parse():
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    if not streamed:
+                        logger.info(
+                            f"AI stream started (feature=ask, attempt={attempt}, "
+                            f"first_token_ms={(time.perf_counter() - started) * 1000:.0f})"
+                        )
+                    streamed += delta
+                    yield delta
+
+                if not streamed:
+                    logger.warning("AI returned empty content (feature=ask)")
+                    yield "⚠️ AI returned an empty response. Please try again."
+                return
+
+            except Exception as exc:
+                last_exception = exc
+                self._update_limits(exc)
+                if streamed:
+                    logger.warning(f"AI stream interrupted (feature=ask): {exc}")
+                    yield "\n\n⚠️ *Response interrupted.*"
+                    return
+
+                status = getattr(exc, "status_code", None)
+                if isinstance(exc, RateLimitError) or status == 429:
+                    delay = self._start_cooldown(exc, attempt)
+                    logger.warning(
+                        f"Rate limited (feature=ask, attempt={attempt}/{self.MAX_RETRIES}, "
+                        f"retry_in={delay:.1f}s)"
+                    )
+                elif isinstance(exc, APIStatusError) and 500 <= exc.status_code < 600:
+                    delay = min(self.BASE_DELAY * (2 ** (attempt - 1)), self.MAX_DELAY)
+                    logger.warning(
+                        f"Server error {status} (feature=ask, attempt={attempt}, "
+                        f"retry_in={delay:.1f}s)"
+                    )
+                    await asyncio.sleep(delay)
+                elif isinstance(exc, APIStatusError):
+                    logger.error(f"Groq API error (feature=ask): {exc}")
+                    yield "❌ AI service error. Please try again later."
+                    return
+                else:
+                    logger.error(f"Unexpected AI error (feature=ask): {exc}", exc_info=True)
+                    yield "❌ Something went wrong with the AI service. Please try again later."
+                    return
+
+            finally:
+                # Streams carry no usage block; count what came back instead
+                self.limiter.settle(estimate, prompt_used + self.tokenizer.count(streamed))
+
+        logger.error(
+            f"All {self.MAX_RETRIES} retries exhausted (feature=ask): {last_exception}"
         )
+        yield "❌ AI service is currently busy. Please try again in a moment."
 
     async def summarize(
         self,
         messages_text: str,
         channel_name: str = "channel",
+        guild_id: Optional[int] = None,
     ) -> str:
         """
         Generate a concise bullet-point summary of a block of messages.
@@ -138,6 +295,7 @@ class AIService:
         Args:
             messages_text:  Pre-formatted string of messages to summarise.
             channel_name:  Name of the source channel (used in prompt only).
+            guild_id:      Guild asking, for fair queueing (None for DMs).
 
         Returns:
             The summary text, or a user-friendly error string.
@@ -145,57 +303,198 @@ class AIService:
         if not self.is_ready:
             return "⚠️ AI features are currently unavailable (API key not configured)."
 
-        # Chunk if the input is very large (rough heuristic: ~4 chars per token)
-        chunks = self._chunk_text(messages_text, max_chars=12000)
+        # Chunk on message boundaries if the input outgrows one prompt
+        chunks = self._chunk_text(messages_text, self._summary_chunk_tokens(channel_name))
         if not chunks:
             return "⚠️ No messages to summarise."
 
         # If there's only one chunk, summarise directly
         if len(chunks) == 1:
-            return await self._summarise_single(chunks[0], channel_name)
-
-        # Multiple chunks: summarise each, then merge
-        partial_summaries: List[str] = []
-        for idx, chunk in enumerate(chunks, 1):
-            summary = await self._summarise_single(
-                chunk, channel_name, part_label=f" (part {idx}/{len(chunks)})"
-            )
-            if summary.startswith("⚠️") or summary.startswith("❌"):
-                return summary  # propagate error
-            partial_summaries.append(summary)
-
-        merged = "\n\n".join(partial_summaries)
-        return await self._summarise_single(
-            merged, channel_name, part_label=" (merged summary)"
-        )
+            return await self._summarise_single(chunks[0], channel_name, guild_id=guild_id)
+
+        # Map: summarise every chunk concurrently (bounded by _summary_slots)
+        total = len(chunks)
+        results = await asyncio.gather(*(
+            self._summarise_single(chunk, channel_name, part_label=f" (part {idx}/{total})", guild_id=guild_id)
+            for idx, chunk in enumerate(chunks, 1)
+        ))
+
+        # Keep going with whatever succeeded; each partial covers one chunk
+        partials = [(summary, 1) for summary in results if not self._is_error(summary)]
+        if not partials:
+            return results[0]  # every part failed — propagate the first error
+
+        # Reduce: merge partials level by level into one summary
+        summary, covered = await self._reduce(partials, channel_name, guild_id)
+        if self._is_error(summary):
+            return summary
+        if covered < total:
+            logger.warning(f"Summary of #{channel_name} is missing {total - covered}/{total} parts")
+            summary += f"\n\n_⚠️ {total - covered} of {total} parts could not be summarised._"
+        return summary
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    async def _summarise_single(
+    def _prompt_budget(self, model: str, max_tokens: int, cap: int) -> int:
+        """Tokens a prompt may use: the configured cap, within the model's window minus the reply."""
+        window = self.CONTEXT_WINDOW_TOKENS.get(model, self.DEFAULT_CONTEXT_WINDOW_TOKENS)
+        return min(cap, window - max_tokens)
+
+    def _chat_messages(
         self,
-        text: str,
-        channel_name: str,
-        part_label: str = "",
-    ) -> str:
-        """Summarise a single chunk of messages."""
+        user_message: str,
+        context_messages: Optional[List[Dict[str, str]]],
+    ) -> List[Dict[str, str]]:
+        """
+        Build the chat prompt: system prompt, recent context, then the question.
+
+        Context is packed newest first until the chat token budget is spent,
+        so a few long messages or many short ones both fill it without
+        overflowing.
+        """
+        budget = self._prompt_budget(self.CHAT_MODEL, self.CHAT_MAX_TOKENS, self.CHAT_PROMPT_TOKENS)
+        system = {"role": "system", "content": CHAT_SYSTEM_PROMPT}
+        question = {"role": "user", "content": user_message}
+
+        used = self.tokenizer.count_messages([system, question])
+        if used > budget:
+            # Only an enormous question gets here; keep as much of it as fits
+            room = budget - self.tokenizer.count_messages([system, {"role": "user", "content": ""}])
+            question["content"] = self.tokenizer.truncate(user_message, max(room, 0))
+            used = self.tokenizer.count_messages([system, question])
+
+        context: List[Dict[str, str]] = []
+        for message in reversed(context_messages or []):
+            cost = self.tokenizer.count_message(message)
+            if used + cost > budget:
+                break
+            context.append(message)
+            used += cost
+
+        return [system, *reversed(context), question]
+
+    @staticmethod
+    def _summary_messages(text: str, channel_name: str, part_label: str = "") -> List[Dict[str, str]]:
+        """Build the prompt summarising one chunk (or merge group) of messages."""
         user_content = (
             f"Summarise the following messages from #{channel_name}{part_label}:\n\n{text}"
         )
-
-        messages: List[Dict[str, str]] = [
+        return [
             {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
             {"role": "user", "content": user_content},
         ]
 
-        return await self._call(
-            messages=messages,
-            model=self.SUMMARY_MODEL,
-            max_tokens=self.SUMMARY_MAX_TOKENS,
-            temperature=self.SUMMARY_TEMPERATURE,
-            feature="summarize",
+    def _summary_chunk_tokens(self, channel_name: str) -> int:
+        """Tokens of messages one summary prompt has room for, after its own instructions."""
+        budget = self._prompt_budget(self.SUMMARY_MODEL, self.SUMMARY_MAX_TOKENS, self.SUMMARY_PROMPT_TOKENS)
+        overhead = max(
+            self.tokenizer.count_messages(self._summary_messages("", channel_name, label))
+            for label in (" (part 999/999)", " (merged summary)")
         )
+        return max(budget - overhead, 1)
+
+    async def _reduce(
+        self,
+        partials: List[Tuple[str, int]],
+        channel_name: str,
+        guild_id: Optional[int] = None,
+    ) -> Tuple[str, int]:
+        """
+        Tree-reduce partial summaries into one.
+
+        Partials are merged in groups that fit one summary prompt, all groups
+        of a level at once, until a single summary remains — so no merge prompt
+        outgrows the model window however many chunks there were. A failed
+        merge drops only its own group.
+
+        Args:
+            partials: (summary, chunks covered) pairs.
+            channel_name: Name of the source channel (used in prompt only).
+            guild_id: Guild asking, for fair queueing.
+
+        Returns:
+            (summary or error string, number of chunks the summary covers)
+        """
+        while len(partials) > 1:
+            groups = self._group_partials(partials, self._summary_chunk_tokens(channel_name))
+            merges = [group for group in groups if len(group) > 1]
+            merged = await asyncio.gather(*(
+                self._summarise_single(
+                    "\n\n".join(text for text, _ in group),
+                    channel_name,
+                    part_label=" (merged summary)",
+                    guild_id=guild_id,
+                )
+                for group in merges
+            ))
+
+            # Groups of one carry over to the next level unchanged
+            next_level = [group[0] for group in groups if len(group) == 1]
+            for group, summary in zip(merges, merged):
+                if not self._is_error(summary):
+                    next_level.append((summary, sum(covered for _, covered in group)))
+            if not next_level:
+                return merged[0], 0
+            partials = next_level
+
+        return partials[0]
+
+    def _group_partials(
+        self,
+        partials: List[Tuple[str, int]],
+        max_tokens: int,
+    ) -> List[List[Tuple[str, int]]]:
+        """
+        Split partial summaries into merge groups of at most max_tokens.
+
+        Every group but a trailing leftover holds at least two partials, so
+        each reduce level shrinks the list even if partials are oversized.
+        """
+        groups: List[List[Tuple[str, int]]] = []
+        current: List[Tuple[str, int]] = []
+        current_len = 0
+
+        for partial in partials:
+            length = self.tokenizer.count(partial[0]) + 1  # +1 for the blank line between partials
+            if current_len + length > max_tokens and len(current) >= 2:
+                groups.append(current)
+                current = []
+                current_len = 0
+            current.append(partial)
+            current_len += length
+
+        if current:
+            groups.append(current)
+
+        return groups
+
+    @staticmethod
+    def _is_error(text: str) -> bool:
+        """Whether a reply is one of our user-facing error strings."""
+        return text.startswith("⚠️") or text.startswith("❌")
+
+    async def _summarise_single(
+        self,
+        text: str,
+        channel_name: str,
+        part_label: str = "",
+        guild_id: Optional[int] = None,
+    ) -> str:
+        """Summarise a single chunk of messages, holding one summary slot."""
+        messages = self._summary_messages(text, channel_name, part_label)
+
+        async with self._summary_slots:
+            return await self._call(
+                messages=messages,
+                model=self.SUMMARY_MODEL,
+                max_tokens=self.SUMMARY_MAX_TOKENS,
+                temperature=self.SUMMARY_TEMPERATURE,
+                feature="summarize",
+                priority=PRIORITY_BULK,
+                guild_id=guild_id,
+            )
 
     async def _call(
         self,
@@ -204,25 +503,39 @@ class AIService:
         max_tokens: int,
         temperature: float,
         feature: str,
+        priority: int = PRIORITY_INTERACTIVE,
+        guild_id: Optional[int] = None,
     ) -> str:
         """
         Low-level Groq API call with exponential-backoff retry on rate limits.
 
+        Each attempt first waits its turn in the rate limiter, reserving the
+        prompt plus max_tokens. Each attempt settles exactly once: with the
+        reply's usage, the whole reservation if the request got through but
+        usage is unknown, or nothing if it was rejected.
+
         Returns:
             The assistant's reply content, or a user-friendly error string.
         """
         last_exception: Optional[Exception] = None
+        estimate = self.tokenizer.count_messages(messages) + max_tokens
 
         for attempt in range(1, self.MAX_RETRIES + 1):
+            await self.limiter.acquire(estimate, priority, guild_id)
+            used = 0  # Refunded in full unless the request got through
             try:
-                # Groq SDK is synchronous — run in executor to avoid blocking
-                response = await asyncio.to_thread(
-                    self._client.chat.completions.create,
+                raw = await self._client.chat.completions.with_raw_response.create(
                     model=model,
                     messages=messages,
                     max_tokens=max_tokens,
                     temperature=temperature,
                 )
+                used = estimate
+                self.limiter.update(raw.headers)
+                response = await raw.parse()
+                usage = getattr(response, "usage", None)
+                if usage:
+                    used = usage.total_tokens
 
                 content = response.choices[0].message.content
                 if content:
@@ -238,23 +551,23 @@ class AIService:
 
             except RateLimitError as exc:
                 last_exception = exc
-                delay = min(self.BASE_DELAY * (2 ** (attempt - 1)), self.MAX_DELAY)
+                self._update_limits(exc)
+                delay = self._start_cooldown(exc, attempt)
                 logger.warning(
                     f"Rate limited (feature={feature}, attempt={attempt}/{self.MAX_RETRIES}, "
                     f"retry_in={delay:.1f}s): {exc}"
                 )
-                await asyncio.sleep(delay)
 
             except APIStatusError as exc:
                 last_exception = exc
+                self._update_limits(exc)
                 if exc.status_code == 429:
                     # Some 429s come as APIStatusError instead of RateLimitError
-                    delay = min(self.BASE_DELAY * (2 ** (attempt - 1)), self.MAX_DELAY)
+                    delay = self._start_cooldown(exc, attempt)
                     logger.warning(
                         f"HTTP 429 via APIStatusError (feature={feature}, attempt={attempt}, "
                         f"retry_in={delay:.1f}s)"
                     )
-                    await asyncio.sleep(delay)
                 elif 500 <= exc.status_code < 600:
                     # Transient server error — retry
                     delay = min(self.BASE_DELAY * (2 ** (attempt - 1)), self.MAX_DELAY)
@@ -270,33 +583,69 @@ class AIService:
 
             except Exception as exc:
                 last_exception = exc
+                self._update_limits(exc)
                 logger.error(f"Unexpected AI error (feature={feature}): {exc}", exc_info=True)
                 return "❌ Something went wrong with the AI service. Please try again later."
 
+            finally:
+                self.limiter.settle(estimate, used)
+
         # All retries exhausted
         logger.error(
             f"All {self.MAX_RETRIES} retries exhausted (feature={feature}): {last_exception}"
         )
         return "❌ AI service is currently busy. Please try again in a moment."
 
-    @staticmethod
-    def _chunk_text(text: str, max_chars: int = 12000) -> List[str]:
+    def stats(self) -> Dict[str, Any]:
+        """Rate-limiter queue depth and budgets, for /health."""
+        return self.limiter.stats()
+
+    def _update_limits(self, exc: Exception) -> None:
+        """Feed a failed call's rate-limit headers back to the limiter."""
+        response = getattr(exc, "response", None)
+        if response is not None:
+            self.limiter.update(response.headers)
+
+    def _start_cooldown(self, exc: Exception, attempt: int) -> float:
+        """
+        Hold back every request after a 429, not just the one that got it.
+
+        Uses the server's Retry-After when present, otherwise exponential
+        back-off, and never shortens a cooldown that is already running.
+
+        Returns:
+            The delay in seconds.
+        """
+        delay = min(self.BASE_DELAY * (2 ** (attempt - 1)), self.MAX_DELAY)
+        response = getattr(exc, "response", None)
+        if response is not None:
+            try:
+                delay = min(float(response.headers["retry-after"]), self.MAX_DELAY)
+            except (KeyError, TypeError, ValueError):
+                pass
+        self.limiter.pause(delay)
+        return delay
+
+    def _chunk_text(self, text: str, max_tokens: int) -> List[str]:
         """
-        Split text into chunks that fit within the token budget.
+        Split text into chunks of at most max_tokens.
 
-        Uses a simple character-count heuristic (~4 chars per token).
-        Splits on double-newlines to keep message boundaries intact.
+        Splits between lines so messages stay intact; a single message too
+        long for a chunk is truncated to fit.
         """
-        if len(text) <= max_chars:
-            return [text]
+        if self.tokenizer.count(text) <= max_tokens:
+            return [text] if text else []
 
         chunks: List[str] = []
         current: List[str] = []
         current_len = 0
 
         for line in text.split("\n"):
-            line_len = len(line) + 1  # +1 for the newline
-            if current_len + line_len > max_chars and current:
+            line_len = self.tokenizer.count(line) + 1  # +1 for the newline
+            if line_len > max_tokens:
+                line = self.tokenizer.truncate(line, max_tokens - 1)
+                line_len = max_tokens
+            if current_len + line_len > max_tokens and current:
                 chunks.append("\n".join(current))
                 current = []
                 current_len = 0
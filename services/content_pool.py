@@ -0,0 +1,261 @@
+"""
+Content pools for Cereal Bot
+Keeps a few prefetched items warm for single-item random APIs (jokes, facts,
+quotes...), refilled in the background with back-off while an upstream is
+failing, so commands serve from memory instead of waiting on a third party.
+"""
+
+import asyncio
+import random
+import time
+import weakref
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar('T')
+
+POOL_SIZE: int = 10
+MAX_AGE_SECONDS: float = 3600      # Rotate content even if nobody asks for it
+BACKOFF_BASE_SECONDS: float = 2.0  # Doubled per consecutive failure
+BACKOFF_MAX_SECONDS: float = 300.0
+
+# Every pool created, for metrics reporting
+_registry: "weakref.WeakSet[ContentPool]" = weakref.WeakSet()
+
+
+class ContentPool(Generic[T]):
+    """
+    Prefetch buffer for one content source.
+
+    fetch() returns a single item (or, with batch=True, a list of items),
+    or None / raises when the upstream has nothing usable. Items are served
+    oldest first and never duplicated within the pool.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[Optional[T]]],
+        size: int = POOL_SIZE,
+        max_age: Optional[float] = MAX_AGE_SECONDS,
+        min_interval: float = 0.0,
+        batch: bool = False,
+    ):
+        """
+        Args:
+            name: Source name used in logs and metrics
+            fetch: Coroutine function producing one item (a list of items if batch)
+            size: Items to keep warm
+            max_age: Seconds before an unserved item is discarded (None keeps items forever)
+            min_interval: Minimum seconds between upstream requests, for rate-limited APIs
+            batch: fetch returns many items per request
+        """
+        self.name = name
+        self.fetch = fetch
+        self.size = size
+        self.max_age = max_age
+        self.min_interval = min_interval
+        self.batch = batch
+
+        self._items: Deque[Tuple[float, T]] = deque()
+        self._wake: Optional[asyncio.Event] = None  # Made in start(), inside the running loop
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._retry_at = 0.0
+        self._next_request_at = 0.0
+        self.consecutive_failures = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.fetched = 0
+        self.failures = 0
+        self.duplicates = 0
+        self.expired = 0
+
+        _registry.add(self)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def backing_off(self) -> bool:
+        """True while the upstream is failing and we're waiting to retry"""
+        return time.monotonic() < self._retry_at
+
+    @property
+    def pacing(self) -> bool:
+        """True while min_interval holds back the next upstream request"""
+        return time.monotonic() < self._next_request_at
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the background refill task"""
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name=f"content-pool:{self.name}")
+
+    async def stop(self) -> None:
+        """Stop the refill task (pooled items are kept)"""
+        # Checked by _run in case wait_for() swallows the cancel (possible before 3.12)
+        self._stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ------------------------------------------------------------------
+    # Serving
+    # ------------------------------------------------------------------
+
+    def pop(self) -> Optional[T]:
+        """
+        Take a pooled item without waiting
+
+        Returns:
+            The oldest fresh item, or None if the pool is empty
+        """
+        self._expire()
+        if self._wake is not None:
+            self._wake.set()
+        if not self._items:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._items.popleft()[1]
+
+    async def get(self) -> Optional[T]:
+        """
+        Take a pooled item, fetching live only on a miss
+
+        A miss while the upstream is backing off or paced returns None straight
+        away, so callers can show their fallback instead of waiting.
+
+        Returns:
+            An item, or None if none is available
+        """
+        item = self.pop()
+        if item is not None or self.backing_off or self.pacing:
+            return item
+        return await self._fetch_one()
+
+    # ------------------------------------------------------------------
+    # Refilling
+    # ------------------------------------------------------------------
+
+    def _expire(self) -> None:
+        if self.max_age is None:
+            return
+        cutoff = time.monotonic() - self.max_age
+        while self._items and self._items[0][0] < cutoff:
+            self._items.popleft()
+            self.expired += 1
+
+    def _add(self, items: List[T]) -> None:
+        """Pool fetched items up to size, skipping ones already pooled"""
+        for item in items:
+            if len(self._items) >= self.size:
+                return
+            if any(pooled == item for _, pooled in self._items):
+                self.duplicates += 1
+                continue
+            self._items.append((time.monotonic(), item))
+
+    async def _request(self) -> List[T]:
+        """One upstream request, paced by min_interval; tracks failures for back-off"""
+        wait = self._next_request_at - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._next_request_at = time.monotonic() + self.min_interval
+
+        try:
+            result = await self.fetch()
+        except Exception as e:
+            logger.debug(f"Content pool '{self.name}' fetch failed: {e}")
+            result = None
+        if self.batch:
+            items = [item for item in result or () if item is not None]
+        else:
+            items = [result] if result is not None else []
+
+        if not items:
+            self.failures += 1
+            self.consecutive_failures += 1
+            delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (self.consecutive_failures - 1))
+            self._retry_at = time.monotonic() + random.uniform(delay / 2, delay)
+            if self.consecutive_failures == 1:
+                logger.warning(f"Content pool '{self.name}' upstream failing, backing off")
+            return []
+
+        if self.consecutive_failures:
+            logger.info(f"Content pool '{self.name}' upstream recovered after {self.consecutive_failures} failure(s)")
+        self.consecutive_failures = 0
+        self._retry_at = 0.0
+        self.fetched += len(items)
+        return items
+
+    async def _fetch_one(self) -> Optional[T]:
+        """Fetch live for a miss, pooling the rest of a batch"""
+        items = await self._request()
+        if not items:
+            return None
+        self._add(items[1:])
+        return items[0]
+
+    async def _fill(self) -> None:
+        # Duplicates count as attempts so a tiny upstream can't spin us forever
+        attempts = 0
+        while len(self._items) < self.size and attempts < 2 * self.size:
+            attempts += 1
+            if self.backing_off:
+                await asyncio.sleep(self._retry_at - time.monotonic())
+            self._add(await self._request())
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            self._wake.clear()
+            self._expire()
+            await self._fill()
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.max_age)
+            except asyncio.TimeoutError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, hit rate, freshness and upstream health"""
+        now = time.monotonic()
+        requests = self.hits + self.misses
+        return {
+            'size': len(self._items),
+            'capacity': self.size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / requests, 3) if requests else None,
+            'oldest_age_seconds': round(now - self._items[0][0], 1) if self._items else None,
+            'newest_age_seconds': round(now - self._items[-1][0], 1) if self._items else None,
+            'fetched': self.fetched,
+            'failures': self.failures,
+            'duplicates': self.duplicates,
+            'expired': self.expired,
+            'backing_off': self.backing_off,
+        }
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every live content pool, keyed by name"""
+    return {pool.name: pool.stats() for pool in sorted(_registry, key=lambda p: p.name)}
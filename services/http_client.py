@@ -0,0 +1,293 @@
+"""
+Shared HTTP client for Cereal Bot
+One bot-owned aiohttp session with bounded pools, DNS caching, per-call time
+budgets, Retry-After-aware retries for GETs and per-host latency/error metrics,
+which cogs and services borrow instead of opening their own ClientSession.
+"""
+
+import asyncio
+import random
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+import aiohttp
+from yarl import URL
+
+from core.config import config
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Responses worth retrying: rate limited or a transient upstream failure
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_BASE_DELAY: float = 0.1   # seconds — doubled on each retry
+RETRY_MAX_DELAY: float = 1.0    # cap for the back-off window
+# Statuses whose Retry-After header says how long to wait
+RETRY_AFTER_STATUSES = frozenset({429, 503})
+
+# Overall limit for requests made directly on .session (aiohttp's own default);
+# get() applies its per-call budget instead
+SESSION_TIMEOUT_SECONDS: float = 300.0
+
+# Latency samples kept per host for percentiles
+LATENCY_WINDOW: int = 256
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delay in seconds, or an HTTP date) into seconds
+
+    Returns:
+        Seconds to wait, or None if the value is missing or unrecognised
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class HostStats:
+    """Request counters and a rolling latency window for one upstream host"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0      # Connection errors, timeouts and 5xx responses
+        self.retries = 0
+        self.statuses: Dict[str, int] = {}
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, elapsed: float, status: Optional[int]) -> None:
+        self.requests += 1
+        self.latencies.append(elapsed)
+        if status is None or status >= 500:
+            self.errors += 1
+        bucket = f"{status // 100}xx" if status is not None else 'failed'
+        self.statuses[bucket] = self.statuses.get(bucket, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'statuses': dict(self.statuses),
+            'avg_ms': round(sum(ordered) / len(ordered) * 1000, 1) if ordered else None,
+            'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1) if ordered else None,
+            'max_ms': round(ordered[-1] * 1000, 1) if ordered else None,
+        }
+
+
+class HttpClient:
+    """
+    Pooled aiohttp session shared by the whole bot.
+
+    Every GET through get() must finish within a time budget (retries
+    included), so a slow upstream can't hold an interaction past Discord's
+    3-second response window or tie up sockets indefinitely.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        dns_cache_seconds: Optional[int] = None,
+        keepalive_seconds: Optional[float] = None,
+        budget: Optional[float] = None,
+        connect_timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+    ):
+        """
+        Args:
+            limit: Total open connections (defaults to config.HTTP_POOL_LIMIT)
+            limit_per_host: Open connections per host (defaults to config.HTTP_POOL_LIMIT_PER_HOST)
+            dns_cache_seconds: DNS result lifetime (defaults to config.HTTP_DNS_CACHE_SECONDS)
+            keepalive_seconds: Idle keep-alive time (defaults to config.HTTP_KEEPALIVE_SECONDS)
+            budget: Default seconds for a whole get() call (defaults to config.HTTP_TIMEOUT_SECONDS)
+            connect_timeout: Seconds to establish a connection (defaults to config.HTTP_CONNECT_TIMEOUT_SECONDS)
+            max_retries: Default GET retries (defaults to config.HTTP_MAX_RETRIES)
+        """
+        self.limit = limit if limit is not None else config.HTTP_POOL_LIMIT
+        self.limit_per_host = limit_per_host if limit_per_host is not None else config.HTTP_POOL_LIMIT_PER_HOST
+        self.dns_cache_seconds = dns_cache_seconds if dns_cache_seconds is not None else config.HTTP_DNS_CACHE_SECONDS
+        self.keepalive_seconds = keepalive_seconds if keepalive_seconds is not None else config.HTTP_KEEPALIVE_SECONDS
+        self.budget = budget if budget is not None else config.HTTP_TIMEOUT_SECONDS
+        self.connect_timeout = connect_timeout if connect_timeout is not None else config.HTTP_CONNECT_TIMEOUT_SECONDS
+        self.max_retries = max_retries if max_retries is not None else config.HTTP_MAX_RETRIES
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._hosts: Dict[str, HostStats] = {}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Open the connection pool (called once during bot startup)"""
+        if self._session is not None and not self._session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_seconds,
+            keepalive_timeout=self.keepalive_seconds,
+        )
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_request_exception.append(self._on_request_exception)
+
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            # Budgets are per call (see get()), so the session only bounds the connect phase
+            timeout=aiohttp.ClientTimeout(total=SESSION_TIMEOUT_SECONDS, connect=self.connect_timeout),
+            headers={'User-Agent': 'Cereal Bot 1.0'},
+            trace_configs=[trace],
+        )
+        logger.info(f"HTTP client ready (pool {self.limit}, {self.limit_per_host} per host)")
+
+    async def close(self) -> None:
+        """Close the connection pool"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        The shared session, for non-GET requests
+
+        It carries no time budget of its own beyond SESSION_TIMEOUT_SECONDS;
+        pass timeout= on each request that needs a tighter one.
+        """
+        if self._session is None or self._session.closed:
+            raise RuntimeError("HTTP client is not started")
+        return self._session
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def get(
+        self,
+        url: str,
+        *,
+        retries: Optional[int] = None,
+        budget: Optional[float] = None,
+        **kwargs,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        GET with jittered retries on connection errors, timeouts and 429/5xx
+
+        Use like session.get(): `async with http_client.get(url) as resp:`.
+        A Retry-After header on a 429/503 sets the wait before the next try;
+        if that wait doesn't fit in the budget, the response is returned
+        straight away. The last response is returned as-is when retries run out.
+
+        Args:
+            url: Request URL
+            retries: Retries after the first attempt (defaults to max_retries)
+            budget: Seconds the whole call may take, retries included (defaults to budget)
+            **kwargs: Passed through to ClientSession.get (params, headers, ...)
+
+        Raises:
+            aiohttp.ClientError: If every attempt failed to connect
+            asyncio.TimeoutError: If the budget ran out
+        """
+        response = await self._get_with_retry(url, retries, budget, kwargs)
+        try:
+            yield response
+        finally:
+            response.release()
+
+    async def _get_with_retry(
+        self, url: str, retries: Optional[int], budget: Optional[float], kwargs: Dict[str, Any]
+    ) -> aiohttp.ClientResponse:
+        loop = asyncio.get_running_loop()
+        retries = self.max_retries if retries is None else retries
+        deadline = loop.time() + (self.budget if budget is None else budget)
+
+        attempt = 0
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError(f"GET {url} ran out of time")
+            timeout = aiohttp.ClientTimeout(total=remaining, connect=min(self.connect_timeout, remaining))
+
+            response = None
+            retry_after = None
+            try:
+                response = await self.session.get(url, timeout=timeout, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if not self._may_retry(attempt, retries, deadline, loop.time()):
+                    raise
+            else:
+                if response.status not in RETRY_STATUSES or not self._may_retry(attempt, retries, deadline, loop.time()):
+                    return response
+                if response.status in RETRY_AFTER_STATUSES:
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    # The upstream won't answer before the budget runs out; don't wait for nothing
+                    resume = loop.time() + (retry_after or 0.0)
+                    if not self._may_retry(attempt, retries, deadline, resume):
+                        return response
+                response.release()
+
+            delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            self._host_stats(response.url.host if response is not None else URL(url).host).retries += 1
+            await asyncio.sleep(min(delay, max(deadline - loop.time(), 0)))
+            attempt += 1
+
+    @staticmethod
+    def _may_retry(attempt: int, retries: int, deadline: float, now: float) -> bool:
+        # Leave room for at least a connect attempt, or don't bother
+        return attempt < retries and deadline - now > RETRY_BASE_DELAY
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _host_stats(self, host: Optional[str]) -> HostStats:
+        host = host or 'unknown'
+        stats = self._hosts.get(host)
+        if stats is None:
+            stats = self._hosts[host] = HostStats()
+        return stats
+
+    async def _on_request_start(self, session, context, params) -> None:
+        context.started = asyncio.get_running_loop().time()
+
+    async def _on_request_end(self, session, context, params) -> None:
+        elapsed = asyncio.get_running_loop().time() - context.started
+        self._host_stats(params.url.host).record(elapsed, params.response.status)
+
+    async def _on_request_exception(self, session, context, params) -> None:
+        elapsed = asyncio.get_running_loop().time() - context.started
+        self._host_stats(params.url.host).record(elapsed, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool usage and per-host metrics, for /health"""
+        return {
+            'open': self._session is not None and not self._session.closed,
+            'limit': self.limit,
+            'limit_per_host': self.limit_per_host,
+            'hosts': {host: stats.snapshot() for host, stats in sorted(self._hosts.items())},
+        }
+
+
+# Global HTTP client
+http_client = HttpClient()
@@ -0,0 +1,240 @@
+"""
+Meme buffer for Cereal Bot
+Keeps a ring buffer of pre-filtered, de-duplicated image posts per subreddit,
+topped up by a background task before it runs low, so /meme is a memory pop
+instead of a ~100-post hot.json download per command.
+"""
+
+import asyncio
+import random
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, List, NamedTuple, Optional, Set
+
+import aiohttp
+
+from .http_client import HttpClient, http_client
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+MEME_SUBREDDITS = ['darkjokes', 'shitpost', 'dankmemes', 'me_irl', 'funny', 'shitposting']
+REDDIT_URL = 'https://www.reddit.com'
+
+BUFFER_SIZE: int = 100        # Posts kept per subreddit
+LOW_WATERMARK: int = 20       # Refill a subreddit once it drops below this
+SEEN_LIMIT: int = 1000        # Post IDs remembered per subreddit for de-duplication
+REFRESH_SECONDS: float = 900  # Top everything up at least this often, as hot pages change
+FETCH_BUDGET: float = 10.0    # Background refills aren't racing an interaction
+
+
+class Meme(NamedTuple):
+    id: str
+    subreddit: str
+    title: str
+    url: str
+    permalink: str
+    ups: int
+
+
+class MemeBuffer:
+    """
+    Per-subreddit ring buffers of image posts.
+
+    Posts are shuffled on insert, so popping from the front is O(1) and still
+    random. Concurrent refills of the same subreddit share one fetch.
+    """
+
+    def __init__(
+        self,
+        subreddits: Iterable[str] = MEME_SUBREDDITS,
+        client: Optional[HttpClient] = None,
+        base_url: str = REDDIT_URL,
+        capacity: int = BUFFER_SIZE,
+        low_watermark: int = LOW_WATERMARK,
+    ):
+        """
+        Args:
+            subreddits: Subreddits to serve memes from
+            client: HTTP client (defaults to the shared http_client)
+            base_url: Reddit root, overridable for tests
+            capacity: Posts kept per subreddit
+            low_watermark: Buffer size that triggers a background refill
+        """
+        self.subreddits = list(subreddits)
+        self.client = client or http_client
+        self.base_url = base_url.rstrip('/')
+        self.capacity = capacity
+        self.low_watermark = low_watermark
+
+        self._buffers: Dict[str, Deque[Meme]] = {sub: deque(maxlen=capacity) for sub in self.subreddits}
+        self._seen: Dict[str, "OrderedDict[str, None]"] = {sub: OrderedDict() for sub in self.subreddits}
+        self._refilling: Dict[str, asyncio.Task] = {}
+        self._low: Set[str] = set()
+        self._wake: Optional[asyncio.Event] = None  # Made in start(): pre-3.10 Events bind to a loop
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        self.served = 0
+        self.live_fetches = 0
+        self.refills = 0
+        self.refill_errors = 0
+
+    def __len__(self) -> int:
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'buffered': {sub: len(buffer) for sub, buffer in self._buffers.items()},
+            'served': self.served,
+            'live_fetches': self.live_fetches,
+            'refills': self.refills,
+            'refill_errors': self.refill_errors,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the background refill task"""
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="meme-buffer")
+
+    async def stop(self) -> None:
+        """Stop the refill task (buffered posts are kept)"""
+        # Before 3.12, wait_for() can swallow a cancel that lands as the wake
+        # event fires; the flag still ends the loop when that happens
+        self._stopping = True
+        tasks = [task for task in (self._task, *self._refilling.values()) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    # ------------------------------------------------------------------
+    # Serving
+    # ------------------------------------------------------------------
+
+    def pop(self) -> Optional[Meme]:
+        """
+        Take a buffered meme from a random subreddit that has one
+
+        Returns:
+            A meme, or None if every buffer is empty
+        """
+        stocked = [sub for sub, buffer in self._buffers.items() if buffer]
+        if not stocked:
+            return None
+
+        subreddit = random.choice(stocked)
+        meme = self._buffers[subreddit].popleft()
+        if len(self._buffers[subreddit]) < self.low_watermark:
+            self._low.add(subreddit)
+            if self._wake is not None:
+                self._wake.set()
+
+        self.served += 1
+        return meme
+
+    async def get(self) -> Optional[Meme]:
+        """
+        Get a meme, fetching live only when nothing is buffered
+
+        Returns:
+            A meme, or None if Reddit couldn't provide one
+        """
+        meme = self.pop()
+        if meme is not None:
+            return meme
+
+        self.live_fetches += 1
+        for subreddit in random.sample(self.subreddits, len(self.subreddits)):
+            # Interaction-bound: use the client's default (short) budget
+            if await self.refill(subreddit, budget=None):
+                return self.pop()
+        return None
+
+    # ------------------------------------------------------------------
+    # Refilling
+    # ------------------------------------------------------------------
+
+    async def refill(self, subreddit: str, budget: Optional[float] = FETCH_BUDGET) -> int:
+        """
+        Top up one subreddit's buffer from its hot page
+
+        Returns:
+            Number of new posts buffered
+        """
+        task = self._refilling.get(subreddit)
+        if task is None:
+            task = asyncio.create_task(self._refill(subreddit, budget))
+            self._refilling[subreddit] = task
+            task.add_done_callback(lambda _: self._refilling.pop(subreddit, None))
+        return await asyncio.shield(task)
+
+    async def _refill(self, subreddit: str, budget: Optional[float]) -> int:
+        try:
+            posts = await self._fetch(subreddit, budget)
+        except (aiohttp.ClientError, asyncio.TimeoutError, KeyError, TypeError, ValueError) as e:
+            self.refill_errors += 1
+            logger.warning(f"Meme refill for r/{subreddit} failed: {e}")
+            return 0
+
+        seen = self._seen[subreddit]
+        fresh = [post for post in posts if post.id not in seen]
+        buffer = self._buffers[subreddit]
+        if not fresh and not buffer:
+            # Nothing new on the hot page and nothing left: start over rather than run dry
+            seen.clear()
+            fresh = posts
+
+        fresh = fresh[:self.capacity - len(buffer)]
+        random.shuffle(fresh)
+        for post in fresh:
+            buffer.append(post)
+            seen[post.id] = None
+        while len(seen) > SEEN_LIMIT:
+            seen.popitem(last=False)
+
+        self.refills += 1
+        self._low.discard(subreddit)
+        return len(fresh)
+
+    async def _fetch(self, subreddit: str, budget: Optional[float]) -> List[Meme]:
+        url = f"{self.base_url}/r/{subreddit}/hot.json"
+        async with self.client.get(url, params={'limit': 100}, budget=budget) as resp:
+            if resp.status != 200:
+                raise ValueError(f"HTTP {resp.status}")
+            data = await resp.json()
+
+        return [
+            Meme(
+                id=post['id'],
+                subreddit=subreddit,
+                title=post['title'][:256],  # Discord limit
+                url=post['url'],
+                permalink=post['permalink'],
+                ups=post.get('ups', 0),
+            )
+            for post in (child['data'] for child in data['data']['children'])
+            if post.get('post_hint') == 'image' and not post.get('over_18', False)
+        ]
+
+    async def _run(self) -> None:
+        # Warm every buffer at startup, then refill whatever pop() flags as low
+        self._low.update(self.subreddits)
+        while not self._stopping:
+            self._wake.clear()
+            for subreddit in list(self._low):
+                await self.refill(subreddit)
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), REFRESH_SECONDS)
+            except asyncio.TimeoutError:
+                self._low.update(self.subreddits)
+
+
+# Global meme buffer
+meme_buffer = MemeBuffer()
@@ -0,0 +1,291 @@
+"""
+Client-side rate limiting for Cereal Bot's AI calls
+Token buckets for requests and tokens per minute, kept in step with Groq's
+x-ratelimit-* response headers and each reply's usage, so a burst of
+commands waits its turn here instead of bouncing off 429s. Waiting calls
+are served by priority (interactive before bulk), then round-robin across
+guilds so one busy server can't starve the rest.
+"""
+
+import asyncio
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Mapping, Optional
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+PRIORITY_INTERACTIVE: int = 0  # /ask — a user is watching
+PRIORITY_BULK: int = 1         # /summarize chunks and merges
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {'h': 3600.0, 'm': 60.0, 's': 1.0, 'ms': 0.001}
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Groq reset header ("7.66s", "2m59.56s", "120ms") into seconds
+
+    Returns:
+        Seconds, or None if the value is missing or unrecognised
+    """
+    if not value:
+        return None
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_SECONDS[unit] for amount, unit in parts)
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    try:
+        return int(float(headers[name]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Capacity refilled evenly over a window (per minute by default)"""
+
+    def __init__(self, capacity: float, window: float = 60.0):
+        self.capacity = capacity
+        self.window = window
+        self.level = capacity
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        """Refill per second"""
+        return self.capacity / self.window
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self.level
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount
+
+    def give(self, amount: float) -> None:
+        """Return unused budget (negative amounts take more)"""
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount is available"""
+        self._refill()
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def sync(self, limit: Optional[int] = None, remaining: Optional[int] = None) -> None:
+        """Adopt the server's view: its limit, and never more than it says remains"""
+        self._refill()
+        if limit:
+            self.capacity = limit
+            self.level = min(self.level, limit)
+        if remaining is not None:
+            self.level = min(self.level, remaining)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class _Ticket:
+    __slots__ = ('future', 'cost', 'queued_at')
+
+    def __init__(self, future: asyncio.Future, cost: int):
+        self.future = future
+        self.cost = cost
+        self.queued_at = time.monotonic()
+
+
+class RateLimiter:
+    """
+    Proactive limiter for one API key.
+
+    Call acquire() before each request, then update() with the response
+    headers and settle() with the tokens it really used.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """
+        Args:
+            requests_per_minute: Starting RPM budget
+            tokens_per_minute: Starting TPM budget (replaced by the server's limit once seen)
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+        # priority -> guild -> waiting tickets; guild order is the round-robin order
+        self._queues: Dict[int, "OrderedDict[Optional[int], Deque[_Ticket]]"] = {}
+        self._paused_until = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self.granted = 0
+        self.queued = 0
+        self.waited_seconds = 0.0
+        self.pauses = 0
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    async def acquire(
+        self,
+        cost: int,
+        priority: int = PRIORITY_INTERACTIVE,
+        guild_id: Optional[int] = None,
+    ) -> None:
+        """
+        Wait until one request of cost tokens may be sent
+
+        Args:
+            cost: Estimated tokens (prompt + max reply); capped at the bucket size
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BULK (lower is served first)
+            guild_id: Guild the call is for, for fairness (None for DMs)
+        """
+        cost = min(cost, int(self.tokens.capacity))
+        if not self.depth and self._wait_for(cost) == 0:
+            self._grant(cost)
+            return
+
+        ticket = _Ticket(asyncio.get_running_loop().create_future(), cost)
+        self._queues.setdefault(priority, OrderedDict()).setdefault(guild_id, deque()).append(ticket)
+        self.queued += 1
+        self._pump()
+        # A cancelled waiter stays queued until _pump reaches it and skips it
+        await ticket.future
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request for seconds (after a 429); never shortens a running pause"""
+        until = time.monotonic() + seconds
+        if until > self._paused_until:
+            self._paused_until = until
+            self.pauses += 1
+        self._pump()
+
+    # ------------------------------------------------------------------
+    # Feedback from responses
+    # ------------------------------------------------------------------
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """
+        Sync budgets with Groq's x-ratelimit-* headers
+
+        Groq's token headers are per minute; its request headers are per day,
+        so they only matter once the daily allowance runs out.
+        """
+        self.tokens.sync(
+            limit=_header_int(headers, 'x-ratelimit-limit-tokens'),
+            remaining=_header_int(headers, 'x-ratelimit-remaining-tokens'),
+        )
+        if _header_int(headers, 'x-ratelimit-remaining-requests') == 0:
+            reset = parse_reset(headers.get('x-ratelimit-reset-requests'))
+            if reset:
+                logger.warning(f"AI daily request allowance used up; pausing for {reset:.0f}s")
+                self.pause(reset)
+
+    def settle(self, estimated: int, used: int) -> None:
+        """Correct the token bucket once a call's real usage is known"""
+        self.tokens.give(min(estimated, int(self.tokens.capacity)) - used)
+        self._pump()
+
+    # ------------------------------------------------------------------
+    # Queue
+    # ------------------------------------------------------------------
+
+    @property
+    def depth(self) -> int:
+        """Calls waiting for budget"""
+        return sum(
+            1
+            for guilds in self._queues.values()
+            for tickets in guilds.values()
+            for ticket in tickets
+            if not ticket.future.done()
+        )
+
+    def _wait_for(self, cost: int) -> float:
+        return max(
+            self._paused_until - time.monotonic(),
+            self.requests.wait_time(1),
+            self.tokens.wait_time(cost),
+            0.0,
+        )
+
+    def _grant(self, cost: int) -> None:
+        self.requests.take(1)
+        self.tokens.take(cost)
+        self.granted += 1
+
+    def _next(self) -> Optional[_Ticket]:
+        """Head ticket: highest priority first, then the guild whose turn it is"""
+        for priority in sorted(self._queues):
+            guilds = self._queues[priority]
+            while guilds:
+                guild_id, tickets = next(iter(guilds.items()))
+                while tickets and tickets[0].future.done():
+                    tickets.popleft()  # cancelled while waiting
+                if tickets:
+                    return tickets[0]
+                del guilds[guild_id]
+            del self._queues[priority]
+        return None
+
+    def _pop(self, ticket: _Ticket) -> None:
+        for guilds in self._queues.values():
+            for guild_id, tickets in guilds.items():
+                if tickets and tickets[0] is ticket:
+                    tickets.popleft()
+                    if tickets:
+                        guilds.move_to_end(guild_id)  # next guild's turn
+                    else:
+                        del guilds[guild_id]
+                    return
+
+    def _pump(self) -> None:
+        """Grant queued tickets while budget allows, then sleep until it refills"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while (ticket := self._next()) is not None:
+            wait = self._wait_for(ticket.cost)
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._pump)
+                return
+            self._pop(ticket)
+            self._grant(ticket.cost)
+            self.waited_seconds += time.monotonic() - ticket.queued_at
+            ticket.future.set_result(None)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth by priority, remaining budget and throttling totals"""
+        by_priority = {
+            priority: sum(1 for tickets in guilds.values() for t in tickets if not t.future.done())
+            for priority, guilds in self._queues.items()
+        }
+        return {
+            'queue_depth': sum(by_priority.values()),
+            'queued_interactive': by_priority.get(PRIORITY_INTERACTIVE, 0),
+            'queued_bulk': by_priority.get(PRIORITY_BULK, 0),
+            'guilds_waiting': len({g for guilds in self._queues.values() for g in guilds}),
+            'requests_available': int(self.requests.available),
+            'tokens_available': int(self.tokens.available),
+            'tokens_per_minute': int(self.tokens.capacity),
+            'paused_seconds': round(max(self._paused_until - time.monotonic(), 0.0), 1),
+            'granted': self.granted,
+            'queued': self.queued,
+            'avg_wait_ms': round(self.waited_seconds / self.queued * 1000, 1) if self.queued else None,
+            'pauses': self.pauses,
+        }
@@ -0,0 +1,162 @@
+"""
+Deadline scheduler for Cereal Bot
+Fires callbacks at absolute deadlines (giveaway ends, reminders, timers) from an
+in-memory min-heap, instead of polling the database on a fixed interval.
+"""
+
+import asyncio
+import heapq
+import itertools
+import re
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Re-check the wall clock at least this often, so clock adjustments can't
+# leave a far-off deadline sleeping past its time
+MAX_SLEEP_SECONDS: float = 3600.0
+
+_DURATION_PART = re.compile(r'(\d+)\s*([smhdw])')
+_DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def parse_duration(text: str) -> Optional[timedelta]:
+    """
+    Parse a duration such as '10s', '5m', '2h', '1d' or '1h30m'
+
+    Returns:
+        The duration, or None if text is not a valid positive duration
+    """
+    text = text.strip().lower()
+    parts = _DURATION_PART.findall(text)
+    if not parts or _DURATION_PART.sub('', text).strip():
+        return None
+
+    seconds = sum(int(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+    return timedelta(seconds=seconds) if seconds > 0 else None
+
+
+class DeadlineScheduler:
+    """
+    Min-heap of (deadline, key) served by a single sleeping task.
+
+    Scheduling and cancelling are O(log n) / O(1): cancelled or rescheduled
+    entries stay in the heap and are skipped when they surface. The task sleeps
+    exactly until the earliest deadline and is woken early when an earlier one
+    is added. Everything due at the same moment is handed to the callback as
+    one batch.
+
+    Deadlines are naive UTC datetimes, matching the database columns.
+    """
+
+    def __init__(self, name: str, callback: Callable[[List[Hashable]], Awaitable[None]]):
+        """
+        Args:
+            name: Scheduler name used in logs
+            callback: Coroutine called with the keys whose deadlines have passed
+        """
+        self.name = name
+        self.callback = callback
+
+        self._heap: List[Tuple[datetime, int, Hashable]] = []
+        self._deadlines: Dict[Hashable, datetime] = {}  # Live deadline per key
+        self._counter = itertools.count()  # Tie-breaker so keys are never compared
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def schedule(self, key: Hashable, deadline: datetime) -> None:
+        """Schedule (or reschedule) key to fire at deadline"""
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._counter), key))
+
+        # Only an earlier head changes how long the runner should sleep
+        if self._heap[0][2] == key:
+            self._wake.set()
+
+        self._compact()
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancel a pending key; returns True if it was scheduled"""
+        return self._deadlines.pop(key, None) is not None
+
+    def next_deadline(self) -> Optional[datetime]:
+        """Earliest pending deadline, if any"""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def start(self) -> None:
+        """Start the runner task"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"scheduler:{self.name}")
+
+    async def stop(self) -> None:
+        """Stop the runner task (pending deadlines are kept)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _is_stale(self, entry: Tuple[datetime, int, Hashable]) -> bool:
+        deadline, _, key = entry
+        return self._deadlines.get(key) != deadline
+
+    def _discard_stale(self) -> None:
+        while self._heap and self._is_stale(self._heap[0]):
+            heapq.heappop(self._heap)
+
+    def _compact(self) -> None:
+        """Rebuild the heap once cancelled entries dominate it"""
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [entry for entry in self._heap if not self._is_stale(entry)]
+            heapq.heapify(self._heap)
+
+    def _pop_due(self, now: datetime) -> List[Hashable]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not self._is_stale(entry):
+                del self._deadlines[entry[2]]
+                due.append(entry[2])
+        return due
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            due = self._pop_due(datetime.utcnow())
+
+            if due:
+                try:
+                    await self.callback(due)
+                except Exception as e:
+                    logger.error(f"Scheduler '{self.name}' callback failed for {len(due)} item(s): {e}", exc_info=True)
+                continue
+
+            deadline = self.next_deadline()
+            timeout = None
+            if deadline is not None:
+                timeout = min(max((deadline - datetime.utcnow()).total_seconds(), 0), MAX_SLEEP_SECONDS)
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,339 @@
+"""
+Timezone service for Cereal Bot
+Precomputed prefix and trigram indexes over location aliases and IANA names,
+so /timezone lookups and autocomplete never scan or fuzzy-match the whole list,
+plus memoised zoneinfo resolution and per-minute cached time rendering.
+"""
+
+import heapq
+import re
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+except ImportError:  # Python 3.8: the backports.zoneinfo package provides the same API
+    from backports.zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+
+# Autocomplete can show at most 25 choices
+MAX_RESULTS: int = 25
+
+# Shortest prefix resolve() will accept on its own
+MIN_RESOLVE_PREFIX: int = 3
+
+# Minimum trigram similarity for a fuzzy match
+FUZZY_CUTOFF: float = 0.3
+
+_SEPARATORS = re.compile(r'[\s_/\-]+')
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse separators, so 'America/New_York' matches 'america new york'"""
+    return _SEPARATORS.sub(' ', text.lower()).strip()
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TimezoneMatch(NamedTuple):
+    value: str     # What the command receives (alias key or IANA name)
+    display: str   # What autocomplete shows
+    timezone: str  # IANA timezone name
+
+
+class TimezoneIndex:
+    """
+    Ranked search over timezone aliases and IANA names.
+
+    Built once; each query is a dict lookup for prefixes plus, only when
+    prefixes don't fill the result list, a trigram inverted-index scan over
+    the handful of entries that share a trigram with the query.
+    """
+
+    def __init__(
+        self,
+        aliases: Mapping[str, str],
+        display_names: Optional[Mapping[str, str]] = None,
+        iana_names: Iterable[str] = (),
+    ):
+        """
+        Args:
+            aliases: Lowercase location or abbreviation -> IANA name (e.g. TIMEZONE_MAP)
+            display_names: Optional alias -> label shown in autocomplete (e.g. DISPLAY_MAP)
+            iana_names: IANA timezone names to index alongside the aliases
+        """
+        display_names = display_names or {}
+
+        # Entry order is rank order: curated aliases first, in the order given
+        self.entries: List[TimezoneMatch] = []
+        self._search_keys: List[str] = []
+        seen = set()
+        for alias, tz_name in aliases.items():
+            self._add(TimezoneMatch(alias, display_names.get(alias, alias.title()), tz_name), normalize(alias))
+            seen.add(alias)
+        for tz_name in iana_names:
+            key = normalize(tz_name)
+            if key not in seen:
+                self._add(TimezoneMatch(tz_name, tz_name, tz_name), key)
+                seen.add(key)
+
+        self._exact: Dict[str, int] = {}
+        for entry_id, key in enumerate(self._search_keys):
+            self._exact.setdefault(key, entry_id)
+            self._exact.setdefault(self.entries[entry_id].value.lower(), entry_id)
+
+        self._prefixes = self._build_prefixes()
+        self._trigram_postings, self._trigram_counts = self._build_trigrams()
+
+    def _add(self, match: TimezoneMatch, key: str) -> None:
+        self.entries.append(match)
+        self._search_keys.append(key)
+
+    def _build_prefixes(self) -> Dict[str, List[int]]:
+        """Map every prefix of every key (and of each word) to its top-ranked entries"""
+        ranked: Dict[str, List[Tuple[tuple, int]]] = defaultdict(list)
+        for entry_id, key in enumerate(self._search_keys):
+            words = key.split(' ')
+            candidates = {key: 0}
+            for position, word in enumerate(words[1:], 1):
+                # Word-start matches ('york' -> 'new york') rank below whole-key matches
+                candidates.setdefault(' '.join(words[position:]), 1)
+            for text, tier in candidates.items():
+                for end in range(1, len(text) + 1):
+                    ranked[text[:end]].append(((tier, len(key), entry_id), entry_id))
+
+        prefixes = {}
+        for prefix, items in ranked.items():
+            best = {}
+            for rank, entry_id in sorted(items):
+                best.setdefault(entry_id, rank)
+                if len(best) == MAX_RESULTS:
+                    break
+            prefixes[prefix] = list(best)
+        return prefixes
+
+    def _build_trigrams(self) -> Tuple[Dict[str, List[int]], List[int]]:
+        postings: Dict[str, List[int]] = defaultdict(list)
+        counts = []
+        for entry_id, key in enumerate(self._search_keys):
+            grams = _trigrams(key)
+            counts.append(len(grams))
+            for gram in grams:
+                postings[gram].append(entry_id)
+        return dict(postings), counts
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def fuzzy(self, query: str, limit: int = MAX_RESULTS, exclude: Iterable[int] = ()) -> List[int]:
+        """
+        Rank entries by trigram similarity to query
+
+        Returns:
+            Entry IDs with Jaccard similarity >= FUZZY_CUTOFF, best first
+        """
+        grams = _trigrams(normalize(query))
+        overlap: Counter = Counter()
+        for gram in grams:
+            overlap.update(self._trigram_postings.get(gram, ()))
+
+        excluded = set(exclude)
+        scored = []
+        for entry_id, shared in overlap.items():
+            if entry_id in excluded:
+                continue
+            score = shared / (len(grams) + self._trigram_counts[entry_id] - shared)
+            if score >= FUZZY_CUTOFF:
+                scored.append((score, -entry_id))
+        return [-neg_id for _, neg_id in heapq.nlargest(limit, scored)]
+
+    def search(self, query: str, limit: int = MAX_RESULTS) -> List[TimezoneMatch]:
+        """
+        Autocomplete search: exact, then prefix, then fuzzy matches
+
+        Args:
+            query: What the user has typed so far
+            limit: Maximum number of results
+
+        Returns:
+            Ranked matches
+        """
+        key = normalize(query)
+        if not key:
+            return self.entries[:limit]
+
+        ids: List[int] = []
+        exact = self._exact.get(key)
+        if exact is not None:
+            ids.append(exact)
+        for entry_id in self._prefixes.get(key, ()):
+            if entry_id != exact:
+                ids.append(entry_id)
+
+        if len(ids) < limit:
+            ids.extend(self.fuzzy(key, limit - len(ids), exclude=ids))
+
+        return [self.entries[entry_id] for entry_id in ids[:limit]]
+
+    def resolve(self, location: str) -> Optional[str]:
+        """
+        Resolve user input to an IANA timezone name
+
+        Exact aliases and IANA names win. A prefix or word-start match is
+        only accepted when it is at least MIN_RESOLVE_PREFIX characters and
+        every entry it matches is the same timezone; ambiguous or short
+        prefixes return None so the caller can show suggest() hints. Fuzzy
+        matches are never auto-accepted.
+
+        Returns:
+            IANA timezone name, or None if nothing matches unambiguously
+        """
+        key = normalize(location)
+        if not key:
+            return None
+
+        entry_id = self._exact.get(key)
+        if entry_id is not None:
+            return self.entries[entry_id].timezone
+
+        prefixed = self._prefixes.get(key)
+        if not prefixed or len(key) < MIN_RESOLVE_PREFIX:
+            return None
+        zones = {self.entries[entry_id].timezone for entry_id in prefixed}
+        # A full list may hide further matches, so it can't be proven unambiguous
+        if len(zones) != 1 or len(prefixed) >= MAX_RESULTS:
+            return None
+        return zones.pop()
+
+    def suggest(self, location: str, limit: int = 5) -> List[str]:
+        """Display names of the closest fuzzy matches, for 'did you mean' hints"""
+        return [self.entries[entry_id].display for entry_id in self.fuzzy(location, limit)]
+
+
+# ---------------------------------------------------------------------------
+# Resolution and rendering
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=1)
+def iana_timezones() -> Tuple[str, ...]:
+    """All IANA timezone names known to zoneinfo, sorted (scans tzdata once)"""
+    return tuple(sorted(available_timezones()))
+
+
+@lru_cache(maxsize=None)
+def get_zone(name: str) -> Optional[ZoneInfo]:
+    """
+    Resolve an IANA name to a ZoneInfo, memoised (including failures)
+
+    Returns:
+        The zone, or None if the name is unknown
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+class ZoneTime(NamedTuple):
+    timezone: str      # IANA name
+    abbreviation: str  # e.g. 'JST', or the offset where the zone has no abbreviation
+    date: str          # e.g. 'Monday, January 01, 2024'
+    time_12h: str      # e.g. '09:05:07 PM'
+    time_24h: str      # e.g. '21:05:07'
+    utc_offset: str    # e.g. 'UTC+09:00'
+    local: datetime    # Aware local time
+
+
+class _MinuteFields(NamedTuple):
+    date: str
+    hm_12h: str
+    meridiem: str
+    hm_24h: str
+    utc_offset: str
+    abbreviation: str
+
+
+# (zone name) -> (UTC minute it was rendered for, fields); everything except seconds
+# is fixed within a minute, so each zone is strftime-formatted at most once a minute
+_minute_cache: Dict[str, Tuple[datetime, _MinuteFields]] = {}
+
+
+def _minute_fields(name: str, zone: ZoneInfo, now: datetime) -> _MinuteFields:
+    minute = now.replace(second=0, microsecond=0)
+    cached = _minute_cache.get(name)
+    if cached is not None and cached[0] == minute:
+        return cached[1]
+
+    local = now.astimezone(zone)
+    offset = local.strftime("%z")
+    fields = _MinuteFields(
+        date=local.strftime("%A, %B %d, %Y"),
+        hm_12h=local.strftime("%I:%M"),
+        meridiem=local.strftime("%p"),
+        hm_24h=local.strftime("%H:%M"),
+        utc_offset=f"UTC{offset[:3]}:{offset[3:]}",
+        abbreviation=local.tzname() or f"UTC{offset[:3]}:{offset[3:]}",
+    )
+    _minute_cache[name] = (minute, fields)
+    return fields
+
+
+def render(name: str, now: Optional[datetime] = None) -> Optional[ZoneTime]:
+    """
+    Current time in a zone, formatted for display
+
+    Args:
+        name: IANA timezone name
+        now: Aware UTC instant to render (defaults to now)
+
+    Returns:
+        Rendered time, or None if the zone is unknown
+    """
+    zone = get_zone(name)
+    if zone is None:
+        return None
+
+    now = now or datetime.now(timezone.utc)
+    fields = _minute_fields(name, zone, now)
+    seconds = f"{now.second:02d}"
+    return ZoneTime(
+        timezone=name,
+        abbreviation=fields.abbreviation,
+        date=fields.date,
+        time_12h=f"{fields.hm_12h}:{seconds} {fields.meridiem}",
+        time_24h=f"{fields.hm_24h}:{seconds}",
+        utc_offset=fields.utc_offset,
+        local=now.astimezone(zone),
+    )
+
+
+def times_in(names: Iterable[str], now: Optional[datetime] = None) -> List[Tuple[str, Optional[ZoneTime]]]:
+    """
+    Render several zones at the same instant (for world clocks)
+
+    Returns:
+        (name, rendered time or None if unknown) in input order
+    """
+    now = now or datetime.now(timezone.utc)
+    return [(name, render(name, now)) for name in names]
+
+
+def to_local(utc_time: datetime, name: str) -> Optional[datetime]:
+    """
+    Convert a naive UTC datetime (as stored in the database) to a zone's local time
+
+    Returns:
+        Aware local datetime, or None if the zone is unknown
+    """
+    zone = get_zone(name)
+    if zone is None:
+        return None
+    return utc_time.replace(tzinfo=timezone.utc).astimezone(zone)
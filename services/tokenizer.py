@@ -0,0 +1,203 @@
+"""
+Token counting for Cereal Bot
+Pure-Python byte-level BPE over a local tiktoken-format vocabulary (one
+"<base64 token> <rank>" pair per line — the format of Llama 3's
+tokenizer.model), read from TOKENIZER_PATH (data/llama3.tiktoken by default;
+the README shows how to fetch it). Nothing is downloaded at runtime.
+Without a vocabulary file, counts fall back to a conservative estimate so
+budgets still hold, just less tightly, and a warning is logged at startup.
+"""
+
+import base64
+import heapq
+import math
+import re
+from typing import Dict, List, Optional
+
+from core.config import config
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Llama 3's pre-tokenizer split, with \p{L} / \p{N} spelled for the stdlib re module
+PRETOKENIZE = re.compile(
+    r"(?i:'s|'t|'re|'ve|'m|'ll|'d)"
+    r"|(?:[^\r\n\w]|_)?[^\W\d_]+"
+    r"|\d{1,3}"
+    r"| ?(?:[^\s\w]|_)+[\r\n]*"
+    r"|\s*[\r\n]+"
+    r"|\s+(?!\S)"
+    r"|\s+"
+)
+
+FALLBACK_BYTES_PER_TOKEN: float = 3.0  # Llama 3 averages ~4 on English; err on the high side
+MESSAGE_OVERHEAD_TOKENS: int = 4       # <|start_header_id|>role<|end_header_id|>\n\n ... <|eot_id|>
+REPLY_OVERHEAD_TOKENS: int = 5         # <|begin_of_text|> plus the assistant header the reply opens with
+PIECE_CACHE_LIMIT: int = 50_000        # memoised pre-token counts (chat text repeats a lot)
+
+
+class Tokenizer:
+    """
+    Byte-level BPE token counter.
+
+    Built without ranks it estimates from UTF-8 length instead; check
+    `exact` to tell the two apart.
+    """
+
+    def __init__(self, ranks: Optional[Dict[bytes, int]] = None):
+        """
+        Args:
+            ranks: Token bytes -> merge rank, or None to estimate counts
+        """
+        self.ranks = ranks
+        self._piece_counts: Dict[bytes, int] = {}
+
+    @classmethod
+    def from_file(cls, path: str) -> 'Tokenizer':
+        """
+        Load a tiktoken-format vocabulary file
+
+        Raises:
+            OSError: If the file can't be read
+            ValueError: If it isn't a tiktoken vocabulary
+        """
+        ranks: Dict[bytes, int] = {}
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                token, rank = line.split()
+                ranks[base64.b64decode(token)] = int(rank)
+
+        if not ranks:
+            raise ValueError(f"{path} holds no tokens")
+        return cls(ranks)
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from a real vocabulary rather than an estimate"""
+        return self.ranks is not None
+
+    # ------------------------------------------------------------------
+    # Counting
+    # ------------------------------------------------------------------
+
+    def count(self, text: str) -> int:
+        """Number of tokens in text"""
+        if not text:
+            return 0
+        if self.ranks is None:
+            return math.ceil(len(text.encode()) / FALLBACK_BYTES_PER_TOKEN)
+        return sum(self._count_piece(piece.encode()) for piece in PRETOKENIZE.findall(text))
+
+    def count_message(self, message: Dict[str, str]) -> int:
+        """Tokens one chat message adds to a prompt, template included"""
+        return MESSAGE_OVERHEAD_TOKENS + self.count(message['content'])
+
+    def count_messages(self, messages: List[Dict[str, str]]) -> int:
+        """Tokens a whole chat prompt takes, up to where the reply starts"""
+        return REPLY_OVERHEAD_TOKENS + sum(self.count_message(m) for m in messages)
+
+    def encode(self, text: str) -> List[int]:
+        """
+        Token ids for text
+
+        Raises:
+            RuntimeError: If no vocabulary is loaded
+        """
+        if self.ranks is None:
+            raise RuntimeError("encode() needs a vocabulary file")
+        return [self.ranks[part] for piece in PRETOKENIZE.findall(text) for part in self._merge(piece.encode())]
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Longest prefix of text, cut between pre-tokens, that fits in max_tokens"""
+        if self.count(text) <= max_tokens:
+            return text
+
+        kept: List[str] = []
+        used = 0
+        for piece in PRETOKENIZE.findall(text):
+            cost = self.count(piece)
+            if used + cost > max_tokens:
+                break
+            kept.append(piece)
+            used += cost
+        return "".join(kept)
+
+    # ------------------------------------------------------------------
+    # BPE
+    # ------------------------------------------------------------------
+
+    def _count_piece(self, piece: bytes) -> int:
+        count = self._piece_counts.get(piece)
+        if count is None:
+            count = 1 if piece in self.ranks else len(self._merge(piece))
+            if len(self._piece_counts) >= PIECE_CACHE_LIMIT:
+                self._piece_counts.clear()
+            self._piece_counts[piece] = count
+        return count
+
+    def _merge(self, piece: bytes) -> List[bytes]:
+        """
+        Apply merges lowest rank first (leftmost on ties) until no adjacent pair is in the vocabulary
+
+        Candidate pairs wait in a heap over a linked list of parts, so a long
+        pre-token (a pasted hash, a run of one letter) costs O(n log n) instead
+        of rescanning every pair after each merge.
+        """
+        parts: List[Optional[bytes]] = [piece[i:i + 1] for i in range(len(piece))]
+        following = list(range(1, len(parts))) + [-1]
+        preceding = list(range(-1, len(parts) - 1))
+
+        heap = []
+        for i in range(len(parts) - 1):
+            rank = self.ranks.get(parts[i] + parts[i + 1])
+            if rank is not None:
+                heap.append((rank, i))
+        heapq.heapify(heap)
+
+        while heap:
+            rank, i = heapq.heappop(heap)
+            j = following[i] if parts[i] is not None else -1
+            # Skip pairs a previous merge has already changed
+            if j == -1 or self.ranks.get(parts[i] + parts[j]) != rank:
+                continue
+
+            parts[i] += parts[j]
+            parts[j] = None
+            following[i] = following[j]
+            if following[j] != -1:
+                preceding[following[j]] = i
+
+            for left in (preceding[i], i):
+                if left != -1 and following[left] != -1:
+                    rank = self.ranks.get(parts[left] + parts[following[left]])
+                    if rank is not None:
+                        heapq.heappush(heap, (rank, left))
+
+        return [part for part in parts if part is not None]
+
+
+def load_tokenizer(path: Optional[str] = None) -> Tokenizer:
+    """
+    Tokenizer from the configured vocabulary, or an estimating one if unavailable
+
+    Args:
+        path: Overrides TOKENIZER_PATH
+    """
+    path = path or config.TOKENIZER_PATH
+    if not path:
+        logger.warning("TOKENIZER_PATH is not set — AI token budgets use estimated counts")
+        return Tokenizer()
+
+    try:
+        tokenizer = Tokenizer.from_file(path)
+    except (OSError, ValueError) as e:
+        logger.warning(
+            f"Tokenizer vocabulary unavailable ({e}) — AI token budgets use estimated counts; "
+            f"the README's setup steps show how to fetch it"
+        )
+        return Tokenizer()
+
+    logger.info(f"✓ Tokenizer loaded ({len(tokenizer.ranks)} tokens)")
+    return tokenizer
@@ -0,0 +1,214 @@
+"""
+Weather service for Cereal Bot
+OpenWeatherMap lookups with a long-lived geocode cache, a short-lived weather
+cache and coalescing of identical in-flight requests, so a popular city costs
+one upstream call per TTL no matter how many people ask.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional
+
+import aiohttp
+
+from .http_client import HttpClient, http_client
+from core.cache import MISSING, CacheBackend, get_cache
+from core.config import config
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Cities don't move; only re-geocode once a week
+GEOCODE_TTL_SECONDS: float = 7 * 24 * 3600
+# Remember unknown cities for a while so typos don't burn quota
+GEOCODE_MISS_TTL_SECONDS: float = 3600
+# OpenWeatherMap refreshes current conditions roughly every 10 minutes
+WEATHER_TTL_SECONDS: float = 600
+
+
+class WeatherError(Exception):
+    """Upstream lookup failed"""
+
+
+class CityNotFound(WeatherError):
+    """The geocoder doesn't know the city"""
+
+
+class WeatherReport(NamedTuple):
+    city: str
+    country: str
+    temp: float         # °C
+    feels_like: float   # °C
+    humidity: int       # %
+    pressure: int       # hPa
+    wind_speed: float   # m/s
+    description: str
+    icon: str
+
+
+def normalize_city(city: str) -> str:
+    """Cache key for a city name: lowercase with collapsed whitespace"""
+    return ' '.join(city.lower().split())
+
+
+class WeatherService:
+    """
+    Cached, coalesced OpenWeatherMap client.
+
+    Geocodes are keyed by normalised city name; weather is keyed by rounded
+    coordinates, so different spellings of one place share an entry.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        geocode_cache: Optional[CacheBackend] = None,
+        weather_cache: Optional[CacheBackend] = None,
+        client: Optional[HttpClient] = None,
+    ):
+        """
+        Args:
+            api_key: OpenWeatherMap key (defaults to config.WEATHER_API_KEY)
+            base_url: API root (defaults to config.WEATHER_API_BASE_URL)
+            geocode_cache: Cache for city -> location (defaults to the 'weather_geocode' namespace)
+            weather_cache: Cache for location -> conditions (defaults to the 'weather' namespace)
+            client: HTTP client for upstream calls (defaults to the shared http_client)
+        """
+        self.api_key = api_key if api_key is not None else config.WEATHER_API_KEY
+        self.base_url = (base_url or config.WEATHER_API_BASE_URL).rstrip('/')
+        self.geocode_cache = geocode_cache or get_cache('weather_geocode', ttl=GEOCODE_TTL_SECONDS)
+        self.weather_cache = weather_cache or get_cache('weather', ttl=WEATHER_TTL_SECONDS)
+        self.client = client or http_client
+
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.upstream_requests = 0
+        self.coalesced = 0
+
+    @property
+    def is_configured(self) -> bool:
+        return bool(self.api_key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'upstream_requests': self.upstream_requests,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._inflight),
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get_weather(self, city: str) -> WeatherReport:
+        """
+        Current conditions for a city
+
+        Args:
+            city: City name as typed by the user
+
+        Returns:
+            Weather report
+
+        Raises:
+            CityNotFound: If the city can't be geocoded
+            WeatherError: If OpenWeatherMap fails
+        """
+        location = await self.geocode(city)
+        conditions = await self._cached(
+            self.weather_cache,
+            f"{location['lat']:.2f},{location['lon']:.2f}",
+            lambda: self._fetch_weather(location['lat'], location['lon']),
+        )
+        return WeatherReport(city=location['name'], country=location['country'], **conditions)
+
+    async def geocode(self, city: str) -> Dict[str, Any]:
+        """
+        Resolve a city name to {'name', 'country', 'lat', 'lon'}
+
+        Raises:
+            CityNotFound: If the geocoder has no match
+            WeatherError: If the geocoder fails
+        """
+        key = normalize_city(city)
+        if not key:
+            raise CityNotFound(city)
+
+        location = await self._cached(self.geocode_cache, key, lambda: self._fetch_geocode(key))
+        if location is None:
+            raise CityNotFound(city)
+        return location
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _cached(self, cache: CacheBackend, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Read through cache, sharing one upstream fetch between concurrent misses"""
+        value = await cache.get(key)
+        if value is not MISSING:
+            return value
+
+        inflight_key = (id(cache), key)
+        future = self._inflight.get(inflight_key)
+        if future is None:
+            future = asyncio.ensure_future(self._fill(cache, key, fetch))
+            self._inflight[inflight_key] = future
+            future.add_done_callback(lambda done: self._settle(inflight_key, done))
+        else:
+            self.coalesced += 1
+
+        # Shield so one caller timing out doesn't cancel the fetch for everyone else
+        return await asyncio.shield(future)
+
+    def _settle(self, inflight_key: Hashable, future: asyncio.Future) -> None:
+        self._inflight.pop(inflight_key, None)
+        # Mark the error as retrieved even if every waiter was cancelled
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(f"Weather lookup failed: {future.exception()}")
+
+    async def _fill(self, cache: CacheBackend, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        value = await fetch()
+        ttl = GEOCODE_MISS_TTL_SECONDS if value is None else None
+        await cache.set(key, value, ttl)
+        return value
+
+    async def _get_json(self, path: str, params: Dict[str, Any]) -> Any:
+        self.upstream_requests += 1
+        try:
+            async with self.client.get(f"{self.base_url}{path}", params={**params, 'appid': self.api_key}) as resp:
+                if resp.status != 200:
+                    raise WeatherError(f"OpenWeatherMap returned HTTP {resp.status} for {path}")
+                return await resp.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise WeatherError(f"OpenWeatherMap request to {path} failed: {e}") from e
+
+    async def _fetch_geocode(self, city: str) -> Optional[Dict[str, Any]]:
+        results = await self._get_json('/geo/1.0/direct', {'q': city, 'limit': 1})
+        if not results:
+            return None
+        match = results[0]
+        return {
+            'name': match['name'],
+            'country': match.get('country', ''),
+            'lat': match['lat'],
+            'lon': match['lon'],
+        }
+
+    async def _fetch_weather(self, lat: float, lon: float) -> Dict[str, Any]:
+        data = await self._get_json('/data/2.5/weather', {'lat': lat, 'lon': lon, 'units': 'metric'})
+        try:
+            return {
+                'temp': data['main']['temp'],
+                'feels_like': data['main']['feels_like'],
+                'humidity': data['main']['humidity'],
+                'pressure': data['main']['pressure'],
+                'wind_speed': data['wind']['speed'],
+                'description': data['weather'][0]['description'].title(),
+                'icon': data['weather'][0]['icon'],
+            }
+        except (KeyError, IndexError, TypeError) as e:
+            raise WeatherError(f"Unexpected OpenWeatherMap response: {e}") from e
+
+
+# Global weather service
+weather_service = WeatherService()
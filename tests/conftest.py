@@ -0,0 +1,28 @@
+"""
+Shared pytest fixtures for Cereal Bot tests
+"""
+
+import pytest
+import pytest_asyncio
+
+from db.base import Database
+
+
+@pytest.fixture
+def sqlite_url(tmp_path):
+    """URL for a throwaway SQLite database file"""
+    return f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
+
+
+@pytest_asyncio.fixture
+async def database(sqlite_url, monkeypatch):
+    """Fresh database swapped in for the global instance used by repositories"""
+    import db.repository
+
+    database = Database(sqlite_url)
+    await database.initialize()
+    monkeypatch.setattr(db.repository, 'db', database)
+    await db.repository.guild_repo.cache.clear()
+    yield database
+    await db.repository.guild_repo.cache.clear()
+    await database.close()
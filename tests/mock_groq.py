@@ -0,0 +1,108 @@
+"""
+Local mock of the Groq chat-completions endpoint
+Used by the AI service tests and scripts/bench_ai.py; never talks to the network.
+"""
+
+import asyncio
+import itertools
+import json
+import time
+from typing import Dict, List, Optional
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+COMPLETIONS_PATH = '/openai/v1/chat/completions'
+
+
+class MockGroq:
+    """
+    OpenAI-compatible /chat/completions stub.
+
+    Replies echo the last user message, after an optional delay. Set
+    fail_with to a list of status codes to fail the next requests in order,
+    and headers to add e.g. x-ratelimit-* headers to every response.
+    Streaming requests get the reply word by word as server-sent events,
+    chunk_delay apart.
+    """
+
+    def __init__(self, delay: float = 0.0, chunk_delay: float = 0.0):
+        self.delay = delay
+        self.chunk_delay = chunk_delay
+        self.fail_with: List[int] = []
+        self.headers: Dict[str, str] = {}
+        self.requests: List[dict] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._ids = itertools.count(1)
+        self._server: Optional[TestServer] = None
+
+    @property
+    def url(self) -> str:
+        return str(self._server.make_url(''))
+
+    async def start(self) -> 'MockGroq':
+        app = web.Application()
+        app.router.add_post(COMPLETIONS_PATH, self.completions)
+        self._server = TestServer(app)
+        await self._server.start_server()
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            await self._server.close()
+
+    async def completions(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.requests.append(body)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_with:
+                status = self.fail_with.pop(0)
+                return web.json_response(
+                    {'error': {'message': f'mock {status}', 'type': 'mock'}}, status=status, headers=self.headers
+                )
+
+            reply = f"echo: {body['messages'][-1]['content'][-50:]}"
+            if body.get('stream'):
+                return await self._stream(request, body, reply)
+            return web.json_response({
+                'id': f"chatcmpl-{next(self._ids)}",
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': body['model'],
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': reply},
+                    'finish_reason': 'stop',
+                }],
+                'usage': {'prompt_tokens': 10, 'completion_tokens': 5, 'total_tokens': 15},
+            }, headers=self.headers)
+        finally:
+            self.in_flight -= 1
+
+    async def _stream(self, request: web.Request, body: dict, reply: str) -> web.StreamResponse:
+        response = web.StreamResponse(headers={**self.headers, 'Content-Type': 'text/event-stream'})
+        await response.prepare(request)
+
+        completion_id = f"chatcmpl-{next(self._ids)}"
+        words = reply.split(' ')
+        deltas = [{'role': 'assistant', 'content': ''}] + [
+            {'content': word if i == 0 else f" {word}"} for i, word in enumerate(words)
+        ]
+        for i, delta in enumerate(deltas + [{}]):
+            chunk = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': body['model'],
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': 'stop' if not delta else None}],
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            if delta:
+                await asyncio.sleep(self.chunk_delay)
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
@@ -0,0 +1,262 @@
+"""
+AI service tests for Cereal Bot
+Run with: python -m pytest tests/
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+from mock_groq import MockGroq
+from services.ai_service import AIService
+from services.rate_limiter import RateLimiter
+
+
+@pytest_asyncio.fixture
+async def groq_mock():
+    mock = await MockGroq().start()
+    yield mock
+    await mock.close()
+
+
+@pytest_asyncio.fixture
+async def service(groq_mock, monkeypatch):
+    monkeypatch.setattr(AIService, 'BASE_DELAY', 0.01)
+    ai = AIService()
+    ai.initialize(api_key='test', base_url=groq_mock.url)
+    ai.limiter = RateLimiter(requests_per_minute=100_000, tokens_per_minute=100_000_000)
+    yield ai
+    await ai.close()
+
+
+class TestAIService:
+    """Async Groq client against a local completions server"""
+
+    @pytest.mark.asyncio
+    async def test_ask_round_trip(self, groq_mock, service):
+        """The question and system prompt reach the API; the reply comes back trimmed"""
+        reply = await service.ask("what is cereal?", [{'role': 'user', 'content': 'hi'}])
+
+        assert reply == "echo: what is cereal?"
+        sent = groq_mock.requests[0]
+        assert [m['role'] for m in sent['messages']] == ['system', 'user', 'user']
+        assert sent['model'] == AIService.CHAT_MODEL
+
+    @pytest.mark.asyncio
+    async def test_requests_run_concurrently(self, groq_mock, service):
+        """Concurrent calls share the event loop, not a small executor thread pool"""
+        groq_mock.delay = 0.2
+        replies = await asyncio.gather(*(service.ask(f"question {i}") for i in range(40)))
+
+        assert replies == [f"echo: question {i}" for i in range(40)]
+        assert groq_mock.max_in_flight >= 20  # capped by AI_MAX_CONNECTIONS, not threads
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried(self, groq_mock, service):
+        """429s and 5xx are retried with back-off; the SDK itself doesn't retry"""
+        groq_mock.fail_with = [429, 503]
+        assert await service.ask("again?") == "echo: again?"
+        assert len(groq_mock.requests) == 3
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, groq_mock, service):
+        """A 400 is reported to the user straight away"""
+        groq_mock.fail_with = [400]
+        assert (await service.ask("bad")).startswith("❌")
+        assert len(groq_mock.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_context_is_packed_to_the_token_budget(self, groq_mock, service, monkeypatch):
+        """Newest context is kept until the chat budget is spent, whatever the message count"""
+        monkeypatch.setattr(AIService, 'CHAT_PROMPT_TOKENS', 200)
+        context = [{'role': 'user', 'content': f"message {i} " + "blah " * 10} for i in range(30)]
+
+        await service.ask("what did I miss?", context)
+
+        sent = groq_mock.requests[0]['messages']
+        assert service.tokenizer.count_messages(sent) <= 200
+        assert 1 < len(sent) - 2 < 30
+        assert sent[-2] == context[-1]  # the newest context survives
+        assert sent[-1]['content'] == "what did I miss?"
+
+    @pytest.mark.asyncio
+    async def test_limits_follow_response_headers_and_usage(self, groq_mock, service):
+        """Groq's TPM headers replace the configured budget; usage refunds the unused reservation"""
+        groq_mock.headers = {'x-ratelimit-limit-tokens': '6000', 'x-ratelimit-remaining-tokens': '5000'}
+        await service.ask("hi")
+
+        stats = service.stats()
+        assert stats['tokens_per_minute'] == 6000
+        # 5000 left per the server, then the reservation beyond the 15 tokens used is refunded
+        assert 5000 < stats['tokens_available'] <= 6000
+        assert (stats['granted'], stats['queue_depth']) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_each_attempt_settles_once(self, groq_mock, service, monkeypatch):
+        """Rejected attempts are refunded, and a failure after the reply doesn't settle twice"""
+        settled = []
+        monkeypatch.setattr(service.limiter, 'settle', lambda estimate, used: settled.append(used))
+
+        groq_mock.fail_with = [429, 503]
+        await service.ask("again?")
+        assert settled == [0, 0, 15]
+
+        settled.clear()
+        monkeypatch.setattr(service.limiter, 'update', lambda headers: 1 / 0)
+        assert (await service.ask("boom")).startswith("❌")
+        assert len(settled) == 1 and settled[0] > 15  # answered, usage unknown: the reservation stands
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_service(self):
+        """Without an API key the service reports itself unavailable"""
+        ai = AIService()
+        assert not ai.is_ready
+        assert (await ai.ask("hello")).startswith("⚠️")
+
+
+def channel_log(lines: int) -> str:
+    return "\n".join(f"[12:{i % 60:02d}] user{i % 7}: message number {i} about cereal" for i in range(lines))
+
+
+class TestSummarize:
+    """Map-reduce summarisation of long channels"""
+
+    @pytest.mark.asyncio
+    async def test_chunks_are_summarised_concurrently(self, groq_mock, service, monkeypatch):
+        """Chunk calls overlap, bounded by SUMMARY_CONCURRENCY, then merge once"""
+        monkeypatch.setattr(AIService, 'SUMMARY_PROMPT_TOKENS', 450)
+        groq_mock.delay = 0.1
+        text = channel_log(120)
+        chunks = service._chunk_text(text, service._summary_chunk_tokens("general"))
+        assert 4 < len(chunks) < 10
+
+        start = time.perf_counter()
+        summary = await service.summarize(text, "general")
+        elapsed = time.perf_counter() - start
+
+        assert summary.startswith("echo:")
+        assert len(groq_mock.requests) == len(chunks) + 1
+        assert groq_mock.max_in_flight == AIService.SUMMARY_CONCURRENCY
+        assert elapsed < 0.1 * (len(chunks) + 1) * 0.75
+
+    @pytest.mark.asyncio
+    async def test_tree_reduce_keeps_merge_prompts_small(self, groq_mock, service, monkeypatch):
+        """Many partials are merged over several levels, each prompt within the chunk size"""
+        monkeypatch.setattr(AIService, 'SUMMARY_PROMPT_TOKENS', 180)
+        text = channel_log(200)
+        chunks = service._chunk_text(text, service._summary_chunk_tokens("general"))
+
+        summary = await service.summarize(text, "general")
+
+        merges = [r for r in groq_mock.requests if "(merged summary)" in r['messages'][1]['content']]
+        assert summary.startswith("echo:")
+        assert len(merges) > 1
+        assert all(service.tokenizer.count_messages(r['messages']) <= 180 for r in groq_mock.requests)
+        assert len(groq_mock.requests) == len(chunks) + len(merges)
+
+    @pytest.mark.asyncio
+    async def test_failed_parts_are_skipped(self, groq_mock, service, monkeypatch):
+        """One bad chunk doesn't sink the summary; the gap is noted"""
+        monkeypatch.setattr(AIService, 'SUMMARY_PROMPT_TOKENS', 450)
+        groq_mock.fail_with = [400]
+        text = channel_log(120)
+        total = len(service._chunk_text(text, service._summary_chunk_tokens("general")))
+
+        summary = await service.summarize(text, "general")
+
+        assert summary.startswith("echo:")
+        assert summary.endswith(f"1 of {total} parts could not be summarised._")
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_cools_down_every_request(self, groq_mock, service):
+        """After a 429, concurrent callers wait out the same cooldown instead of piling on"""
+        groq_mock.fail_with = [429]
+        replies = await asyncio.gather(*(service.ask(f"q{i}") for i in range(5)))
+
+        assert replies == [f"echo: q{i}" for i in range(5)]
+        assert service.limiter.pauses == 1
+        assert len(groq_mock.requests) == 6
+
+
+class TestAskStreaming:
+    """Token streaming for /ask"""
+
+    @pytest.mark.asyncio
+    async def test_deltas_arrive_before_generation_ends(self, groq_mock, service):
+        """The first delta shows up long before the full answer has been generated"""
+        groq_mock.chunk_delay = 0.05
+        start = time.perf_counter()
+        deltas, first_at = [], None
+        async for delta in service.ask_stream("one two three four five six"):
+            first_at = first_at or time.perf_counter() - start
+            deltas.append(delta)
+        total = time.perf_counter() - start
+
+        assert "".join(deltas) == "echo: one two three four five six"
+        assert len(deltas) == 7
+        assert first_at < total / 3
+        assert groq_mock.requests[0]['stream'] is True
+
+    @pytest.mark.asyncio
+    async def test_accepted_stream_charges_the_prompt(self, groq_mock, service, monkeypatch):
+        """A stream that fails before its first delta still pays for the prompt it sent"""
+        settled = []
+        monkeypatch.setattr(service.limiter, 'settle', lambda estimate, used: settled.append(used))
+        monkeypatch.setattr(service.limiter, 'update', lambda headers: 1 / 0)
+
+        deltas = [d async for d in service.ask_stream("hi")]
+        assert deltas[0].startswith("❌")
+        assert settled == [service.tokenizer.count_messages(groq_mock.requests[0]['messages'])]
+
+    @pytest.mark.asyncio
+    async def test_errors_before_first_token_are_retried(self, groq_mock, service):
+        """A 429 before anything was streamed is retried; a 400 is reported once"""
+        groq_mock.fail_with = [429]
+        assert "".join([d async for d in service.ask_stream("hi")]) == "echo: hi"
+
+        groq_mock.fail_with = [400]
+        deltas = [d async for d in service.ask_stream("bad")]
+        assert len(deltas) == 1 and deltas[0].startswith("❌")
+        assert len(groq_mock.requests) == 3
+
+    @pytest.mark.asyncio
+    async def test_embed_edits_are_throttled(self, monkeypatch):
+        """The cog edits one followup at a bounded rate and finishes with the full text"""
+        from cogs import ai as ai_cog
+
+        # Discord allows 5 edits per 5s on a message
+        assert ai_cog.STREAM_EDIT_INTERVAL >= 1.0
+        monkeypatch.setattr(ai_cog, 'STREAM_EDIT_INTERVAL', 0.05)
+        loop = asyncio.get_running_loop()
+        sent, edits, edited_at = [], [], []
+
+        async def edit(embed):
+            edits.append(embed.description)
+            edited_at.append(loop.time())
+
+        async def send(embed, wait=False):
+            sent.append(embed.description)
+            return SimpleNamespace(edit=edit)
+
+        interaction = SimpleNamespace(
+            created_at=datetime.now(timezone.utc),
+            followup=SimpleNamespace(send=send),
+        )
+
+        async def deltas():
+            for i in range(40):
+                await asyncio.sleep(0.005)
+                yield f"w{i} "
+
+        await ai_cog.AI(bot=None)._stream_response(interaction, "question?", deltas())
+
+        expected = " ".join(f"w{i}" for i in range(40))
+        assert len(sent) == 1 and sent[0].endswith(ai_cog.STREAM_CURSOR)
+        assert edits[-1] == expected
+        assert len(edits) <= 8  # ~0.2s of streaming at one edit per 0.05s, plus the final edit
+        gaps = [later - earlier for earlier, later in zip(edited_at, edited_at[1:])]
+        assert min(gaps) >= 0.05 - 0.005  # Spaced out, the final edit included
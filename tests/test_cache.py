@@ -0,0 +1,164 @@
+"""
+Cache tests for Cereal Bot
+Run with: python -m pytest tests/
+"""
+
+import asyncio
+
+import pytest
+
+from core import cache as cache_module
+from core.cache import TTLCache, MemoryCache, RedisCache, MISSING, cache_stats, get_cache
+
+
+class FakeClock:
+    """Controllable replacement for time.monotonic"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze cache time so expiry is deterministic"""
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module.time, 'monotonic', fake)
+    return fake
+
+
+async def wait_for_invalidations(cache: RedisCache, count: int):
+    """Wait until a cache has received count pub/sub invalidations"""
+    for _ in range(200):
+        if cache.invalidations_received >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"{cache.name} received {cache.invalidations_received} invalidations")
+
+
+class TestTTLCache:
+    """LRU + TTL behaviour and counters"""
+
+    def test_hits_misses_and_expiry(self, clock):
+        """Entries expire after their TTL and lookups are counted"""
+        cache = TTLCache('test_expiry', maxsize=10, ttl=5)
+        cache.set('a', 1)
+        cache.set('none', None)
+
+        assert cache.get('a') == 1
+        assert cache.get('none') is None  # None is a cacheable value
+        assert cache.get('missing') is MISSING
+
+        clock.now += 6
+        assert cache.get('a') is MISSING
+
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses']) == (2, 2)
+        assert stats['hit_rate'] == 0.5
+        assert 'test_expiry' in cache_stats()
+
+    def test_lru_eviction(self, clock):
+        """The least recently used entry is evicted when full"""
+        cache = TTLCache('test_lru', maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')  # 'b' is now least recently used
+        cache.set('c', 3)
+
+        assert cache.get('b') is MISSING
+        assert cache.get('a') == 1 and cache.get('c') == 3
+        assert cache.stats()['evictions'] == 1
+
+
+class TestCacheBackends:
+    """Async backends shared across processes"""
+
+    @pytest.mark.asyncio
+    async def test_memory_backend(self):
+        """The memory backend behaves like the TTLCache it wraps"""
+        cache = MemoryCache('test_memory', maxsize=10, ttl=60)
+        await cache.set('a', {'x': 1})
+        assert await cache.get('a') == {'x': 1}
+        await cache.delete('a')
+        assert await cache.get('a') is MISSING
+        assert cache.stats()['backend'] == 'memory'
+
+    def test_get_cache_reuses_namespace(self):
+        """get_cache returns one backend per namespace"""
+        assert get_cache('test_shared') is get_cache('test_shared')
+
+    @pytest.mark.asyncio
+    async def test_redis_invalidation_across_processes(self):
+        """A write in one process drops the other's near-cached copy over pub/sub"""
+        fakeredis = pytest.importorskip('fakeredis')
+        server = fakeredis.FakeServer()
+        first = RedisCache('test_redis', fakeredis.FakeAsyncRedis(server=server), ttl=60, near_ttl=60)
+        second = RedisCache('test_redis', fakeredis.FakeAsyncRedis(server=server), ttl=60, near_ttl=60)
+
+        try:
+            await first.set(1, {'prefix': '!'})
+            assert await second.get(1) == {'prefix': '!'}  # Shared via Redis
+            assert await second.get(1) == {'prefix': '!'}  # Now from the near cache
+            assert second.stats()['near']['hits'] == 1
+
+            await first.set(1, {'prefix': '?'})
+            await wait_for_invalidations(second, 1)
+            assert await second.get(1) == {'prefix': '?'}
+
+            await first.delete(1)
+            await first.set(2, None)
+            assert await first.get(2) is None  # None is cached, not a miss
+            await second.clear()
+            await wait_for_invalidations(first, 1)
+            assert await first.get(2) is MISSING
+        finally:
+            await first.close()
+            await second.close()
+
+    def test_redis_built_outside_the_event_loop(self):
+        """A cache made at import time still subscribes once a loop is running"""
+        fakeredis = pytest.importorskip('fakeredis')
+        cache = RedisCache('test_redis_import', fakeredis.FakeAsyncRedis(), ttl=60, near_ttl=60)
+        assert cache._subscribed is None
+
+        async def use():
+            try:
+                await cache.set(1, 'a')
+                return await cache.get(1)
+            finally:
+                await cache.close()
+
+        assert asyncio.run(use()) == 'a'
+
+
+class TestRepositoryCache:
+    """Read-through caching of guild settings"""
+
+    @pytest.mark.asyncio
+    async def test_settings_cached_and_invalidated(self, database):
+        """Reads hit the cache until a write through the repository invalidates it"""
+        from db.repository import guild_repo
+
+        await guild_repo.create(id=1, name="Guild", owner_id=1)
+        hits = guild_repo.cache.stats()['hits']
+
+        assert (await guild_repo.get_guild_settings(1))['prefix'] == '!'
+        assert (await guild_repo.get_guild_settings(1))['prefix'] == '!'
+        assert guild_repo.cache.stats()['hits'] == hits + 1
+
+        await guild_repo.update({'id': 1}, prefix='?')
+        assert (await guild_repo.get_guild_settings(1))['prefix'] == '?'
+
+        await guild_repo.delete(id=1)
+        assert await guild_repo.get_guild_settings(1) is None
+
+    @pytest.mark.asyncio
+    async def test_missing_guild_cached_until_created(self, database):
+        """A cached 'not found' is dropped when the guild is created"""
+        from db.repository import guild_repo
+
+        assert await guild_repo.get_guild_settings(2) is None
+        await guild_repo.create(id=2, name="Guild", owner_id=1)
+        assert await guild_repo.get_guild_settings(2) is not None
@@ -0,0 +1,125 @@
+"""
+Content pool tests for Cereal Bot
+Run with: python -m pytest tests/
+"""
+
+import asyncio
+import itertools
+
+import pytest
+
+from services import content_pool as pool_module
+from services.content_pool import ContentPool, pool_stats
+
+
+class FakeSource:
+    """Upstream stand-in that returns numbered items, or fails on demand"""
+
+    def __init__(self, items=None):
+        self.items = items if items is not None else itertools.count()
+        self.calls = 0
+        self.failing = False
+
+    async def __call__(self):
+        self.calls += 1
+        if self.failing:
+            raise ConnectionError("upstream down")
+        return f"item {next(self.items)}"
+
+
+async def wait_for_size(pool: ContentPool, size: int):
+    for _ in range(200):
+        if len(pool) >= size:
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError(f"pool '{pool.name}' has {len(pool)} items, expected {size}")
+
+
+class TestContentPool:
+    """Prefetching, hit rates, freshness and back-off"""
+
+    @pytest.mark.asyncio
+    async def test_serves_from_memory_and_refills(self):
+        """Items are prefetched, served oldest first, and topped up after each pop"""
+        source = FakeSource()
+        pool = ContentPool('test_refill', source, size=3)
+        pool.start()
+        try:
+            await wait_for_size(pool, 3)
+            assert await pool.get() == 'item 0'
+            assert pool.pop() == 'item 1'
+            await wait_for_size(pool, 3)
+            assert source.calls == 5
+        finally:
+            await pool.stop()
+
+        stats = pool.stats()
+        assert (stats['hits'], stats['misses'], stats['hit_rate']) == (2, 0, 1.0)
+        assert stats['oldest_age_seconds'] is not None
+        assert 'test_refill' in pool_stats()
+
+    @pytest.mark.asyncio
+    async def test_duplicates_are_skipped(self):
+        """An upstream repeating itself doesn't fill the pool with copies, nor spin forever"""
+        source = FakeSource(itertools.cycle([1, 2]))
+        pool = ContentPool('test_dupes', source, size=5)
+        await pool._fill()
+
+        assert len(pool) == 2
+        assert source.calls == 10
+        assert pool.duplicates == 8
+
+    @pytest.mark.asyncio
+    async def test_miss_fetches_live(self):
+        """An empty pool falls back to one live fetch"""
+        source = FakeSource()
+        pool = ContentPool('test_live', source)
+
+        assert await pool.get() == 'item 0'
+        assert pool.stats()['misses'] == 1
+
+    @pytest.mark.asyncio
+    async def test_failing_upstream_backs_off(self, monkeypatch):
+        """While the upstream fails, misses return None at once instead of retrying"""
+        monkeypatch.setattr(pool_module, 'BACKOFF_BASE_SECONDS', 60)
+        source = FakeSource()
+        source.failing = True
+        pool = ContentPool('test_backoff', source)
+
+        assert await pool.get() is None
+        assert pool.backing_off
+        assert await pool.get() is None
+        assert source.calls == 1
+
+        # Recovery resets the back-off
+        source.failing = False
+        pool._retry_at = 0
+        assert await pool.get() == 'item 0'
+        assert (pool.backing_off, pool.consecutive_failures) == (False, 0)
+
+    @pytest.mark.asyncio
+    async def test_batches_are_pooled_and_paced(self):
+        """A bulk fetch fills the pool in one request, and min_interval spaces requests out"""
+        source = FakeSource()
+
+        async def batch():
+            return [await source() for _ in range(3)]
+
+        pool = ContentPool('test_batch', batch, size=5, min_interval=60, batch=True)
+        assert await pool.get() == 'item 0'
+        assert len(pool) == 2 and pool.pacing
+
+        assert [await pool.get() for _ in range(3)] == ['item 1', 'item 2', None]
+        assert source.calls == 3  # One batch; the paced miss didn't request another
+
+    @pytest.mark.asyncio
+    async def test_stale_items_expire(self, monkeypatch):
+        """Items older than max_age are dropped instead of served"""
+        now = [1000.0]
+        monkeypatch.setattr(pool_module.time, 'monotonic', lambda: now[0])
+        pool = ContentPool('test_expiry', FakeSource(), size=2, max_age=60)
+        await pool._fill()
+
+        now[0] += 61
+        assert pool.pop() is None
+        assert pool.stats()['expired'] == 2
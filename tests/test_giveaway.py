@@ -0,0 +1,53 @@
+"""
+Giveaway cog tests for Cereal Bot
+Run with: python -m pytest tests/
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from cogs.giveaway import Giveaways
+from db.repository import giveaway_repo
+
+
+class StubBot:
+    """Just enough of commands.Bot for the giveaway cog's ending path"""
+
+    async def wait_until_ready(self):
+        pass
+
+
+class TestGiveawayEnding:
+    """Ending a giveaway survives a failed announcement"""
+
+    @pytest.mark.asyncio
+    async def test_failed_announcement_is_retried(self, database):
+        """A giveaway stays active and rescheduled until its winners are announced"""
+        giveaway = await giveaway_repo.create(
+            guild_id=1, channel_id=2, message_id=3, title="Giveaway", prize="Prize",
+            winner_count=1, end_time=datetime.utcnow() - timedelta(minutes=1), created_by=4
+        )
+        await giveaway_repo.add_participant(giveaway.id, 10)
+
+        cog = Giveaways(StubBot())
+        announced = []
+
+        async def announce(giveaway, winners, entrants):
+            if not announced:
+                announced.append(None)
+                raise RuntimeError("Discord is down")
+            announced.append((winners, entrants))
+
+        cog._announce = announce
+
+        assert not await cog._finish(giveaway.id)
+        assert await giveaway_repo.get_value('active', id=giveaway.id)
+        assert giveaway.id in cog.scheduler  # Retry scheduled with backoff
+        assert [row[0] for row in await giveaway_repo.get_active_deadlines()] == [giveaway.id]
+
+        assert await cog._finish(giveaway.id)
+        assert announced[1] == ([10], 1)
+        assert not await giveaway_repo.get_value('active', id=giveaway.id)
+        assert not await cog._finish(giveaway.id)  # Already over
+        assert len(announced) == 2
@@ -0,0 +1,139 @@
+"""
+Shared HTTP client tests for Cereal Bot
+Run with: python -m pytest tests/
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from services.http_client import HttpClient, parse_retry_after
+
+
+class FlakyUpstream:
+    """Stub server that fails a set number of times before answering"""
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.status = 503
+        self.delay = 0.0
+        self.retry_after = None
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/data', self.handle)
+        return app
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.calls <= self.failures:
+            headers = {'Retry-After': self.retry_after} if self.retry_after is not None else None
+            return web.json_response({'error': 'try again'}, status=self.status, headers=headers)
+        return web.json_response({'ok': True, 'calls': self.calls})
+
+
+@pytest_asyncio.fixture
+async def upstream():
+    stub = FlakyUpstream()
+    server = TestServer(stub.app())
+    await server.start_server()
+    stub.url = str(server.make_url('/data'))
+    stub.host = server.host
+    yield stub
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def client():
+    http = HttpClient(budget=2.0, max_retries=2)
+    await http.start()
+    yield http
+    await http.close()
+
+
+class TestHttpClient:
+    """Retries, time budgets and per-host metrics"""
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried(self, upstream, client):
+        """503s are retried with back-off until the upstream recovers"""
+        upstream.failures = 2
+        async with client.get(upstream.url) as resp:
+            assert resp.status == 200
+            assert (await resp.json())['calls'] == 3
+
+        host = client.stats()['hosts'][upstream.host]
+        assert (host['requests'], host['retries'], host['errors']) == (3, 2, 2)
+        assert host['statuses'] == {'5xx': 2, '2xx': 1}
+
+    @pytest.mark.asyncio
+    async def test_last_response_returned_when_retries_run_out(self, upstream, client):
+        """Once retries are spent the caller sees the failing response"""
+        upstream.failures = 10
+        async with client.get(upstream.url, retries=1) as resp:
+            assert resp.status == 503
+        assert upstream.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, upstream, client):
+        """A 404 is an answer, not a transient failure"""
+        upstream.failures, upstream.status = 10, 404
+        async with client.get(upstream.url) as resp:
+            assert resp.status == 404
+        assert upstream.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_budget_bounds_the_whole_call(self, upstream, client):
+        """A hung upstream times out within the budget, retries included"""
+        upstream.delay = 1.0
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with pytest.raises(asyncio.TimeoutError):
+            async with client.get(upstream.url, budget=0.3):
+                pass
+        assert loop.time() - started < 0.8
+        assert client.stats()['hosts'][upstream.host]['statuses'] == {'failed': upstream.calls}
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_honoured(self, upstream, client):
+        """A 429's Retry-After sets the wait before the next attempt"""
+        upstream.failures, upstream.status, upstream.retry_after = 1, 429, '0.4'
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        async with client.get(upstream.url) as resp:
+            assert resp.status == 200
+        assert loop.time() - started >= 0.4
+
+    @pytest.mark.asyncio
+    async def test_retry_after_past_budget_returns_response(self, upstream, client):
+        """A wait longer than the remaining budget isn't slept through"""
+        upstream.failures, upstream.status, upstream.retry_after = 10, 503, '30'
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        async with client.get(upstream.url) as resp:
+            assert resp.status == 503
+        assert upstream.calls == 1
+        assert loop.time() - started < 0.5
+
+    def test_parse_retry_after(self):
+        """Both delay-seconds and HTTP-date forms are understood"""
+        assert parse_retry_after('2') == 2.0
+        assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+        assert parse_retry_after('soon') is None
+        assert parse_retry_after(None) is None
+
+    @pytest.mark.asyncio
+    async def test_session_has_no_call_budget(self, client):
+        """The per-call budget isn't imposed on direct users of .session"""
+        assert client.session.timeout.total > client.budget
+
+    @pytest.mark.asyncio
+    async def test_requires_start(self):
+        """Borrowing the session before startup is a programming error"""
+        with pytest.raises(RuntimeError):
+            HttpClient().session
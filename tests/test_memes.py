@@ -0,0 +1,149 @@
+"""
+Meme buffer tests for Cereal Bot
+Run with: python -m pytest tests/
+"""
+
+import asyncio
+from collections import Counter
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from services.http_client import HttpClient
+from services.memes import MemeBuffer
+
+
+def listing(subreddit: str, count: int, start: int = 0):
+    """A hot.json page with count image posts plus some posts that must be filtered out"""
+    children = [
+        {'data': {
+            'id': f"{subreddit}{i}", 'title': f"meme {i}", 'url': f"https://i.example/{i}.png",
+            'permalink': f"/r/{subreddit}/{i}", 'ups': i, 'post_hint': 'image',
+        }}
+        for i in range(start, start + count)
+    ]
+    children.append({'data': {'id': 'text', 'title': 'self post', 'url': '', 'permalink': '', 'post_hint': 'self'}})
+    children.append({'data': {
+        'id': 'nsfw', 'title': 'nope', 'url': '', 'permalink': '', 'post_hint': 'image', 'over_18': True,
+    }})
+    return {'data': {'children': children}}
+
+
+class StubReddit:
+    """Serves /r/<subreddit>/hot.json from an editable set of pages"""
+
+    def __init__(self):
+        self.pages = {}
+        self.calls = Counter()
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/r/{subreddit}/hot.json', self.hot)
+        return app
+
+    async def hot(self, request: web.Request) -> web.Response:
+        subreddit = request.match_info['subreddit']
+        self.calls[subreddit] += 1
+        if subreddit not in self.pages:
+            return web.json_response({'error': 404}, status=404)
+        return web.json_response(self.pages[subreddit])
+
+
+@pytest_asyncio.fixture
+async def reddit():
+    stub = StubReddit()
+    server = TestServer(stub.app())
+    await server.start_server()
+    stub.url = str(server.make_url(''))
+    yield stub
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def buffer(reddit):
+    client = HttpClient(max_retries=0)
+    await client.start()
+    memes = MemeBuffer(['a', 'b'], client=client, base_url=reddit.url, capacity=10, low_watermark=3)
+    yield memes
+    await memes.stop()
+    await client.close()
+
+
+class TestMemeBuffer:
+    """Prefetching, de-duplication and live fallback"""
+
+    @pytest.mark.asyncio
+    async def test_refill_filters_and_deduplicates(self, reddit, buffer):
+        """Only SFW image posts are buffered, and a re-fetched page adds nothing new"""
+        reddit.pages['a'] = listing('a', 5)
+
+        assert await buffer.refill('a') == 5
+        assert await buffer.refill('a') == 0
+        assert len(buffer) == 5
+        assert {buffer.pop().id for _ in range(5)} == {f"a{i}" for i in range(5)}
+
+    @pytest.mark.asyncio
+    async def test_capacity_bounds_the_ring(self, reddit, buffer):
+        """A subreddit never holds more than capacity posts"""
+        reddit.pages['a'] = listing('a', 25)
+        assert await buffer.refill('a') == 10
+        assert len(buffer) == 10
+
+    @pytest.mark.asyncio
+    async def test_low_buffer_triggers_background_refill(self, reddit, buffer):
+        """Dropping below the watermark wakes the refill task, which tops up from new posts"""
+        reddit.pages['a'] = listing('a', 4)
+        reddit.pages['b'] = listing('b', 4)
+        buffer.start()
+        for _ in range(100):
+            if len(buffer) == 8:
+                break
+            await asyncio.sleep(0.01)
+        assert len(buffer) == 8
+
+        reddit.pages['a'] = listing('a', 4, start=4)
+        reddit.pages['b'] = listing('b', 4, start=4)
+        for _ in range(4):
+            buffer.pop()
+        for _ in range(100):
+            if len(buffer) >= 8:
+                break
+            await asyncio.sleep(0.01)
+
+        ids = set()
+        while (meme := buffer.pop()) is not None:
+            ids.add(meme.id)
+        assert len(ids) >= 8
+        assert reddit.calls['a'] + reddit.calls['b'] >= 3
+
+    @pytest.mark.asyncio
+    async def test_live_fallback_when_empty(self, reddit, buffer):
+        """With nothing buffered, get() fetches live and skips failing subreddits"""
+        reddit.pages['b'] = listing('b', 2)
+
+        meme = await buffer.get()
+        assert meme.subreddit == 'b'
+        assert buffer.live_fetches == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refills_share_a_fetch(self, reddit, buffer):
+        """Two refills of the same subreddit in flight make one request"""
+        reddit.pages['a'] = listing('a', 3)
+        results = await asyncio.gather(buffer.refill('a'), buffer.refill('a'))
+        assert results == [3, 3]
+        assert reddit.calls['a'] == 1
+
+    def test_built_outside_the_event_loop(self):
+        """The module-level buffer is made at import time and started in the bot's loop later"""
+        memes = MemeBuffer(['a'], base_url='http://127.0.0.1:9')
+        assert memes.pop() is None
+
+        async def run():
+            memes.start()
+            await asyncio.sleep(0)
+            await memes.stop()
+
+        asyncio.run(run())
+        asyncio.run(run())  # A second loop gets its own event
@@ -0,0 +1,108 @@
+"""
+AI rate limiter tests for Cereal Bot
+Run with: python -m pytest tests/
+"""
+
+import asyncio
+
+import pytest
+
+from services.rate_limiter import PRIORITY_BULK, PRIORITY_INTERACTIVE, RateLimiter, TokenBucket, parse_reset
+
+
+def drained_limiter(window: float = 0.02) -> RateLimiter:
+    """A limiter with one request per window and no budget left right now"""
+    limiter = RateLimiter(requests_per_minute=1, tokens_per_minute=1_000_000)
+    limiter.requests = TokenBucket(1, window=window)
+    limiter.requests.take(1)
+    return limiter
+
+
+async def run_in_order(limiter: RateLimiter, calls):
+    """Queue (label, priority, guild) calls and return labels in the order they're granted"""
+    granted = []
+
+    async def call(label, priority, guild_id):
+        await limiter.acquire(10, priority, guild_id)
+        granted.append(label)
+
+    tasks = []
+    for label, priority, guild_id in calls:
+        tasks.append(asyncio.create_task(call(label, priority, guild_id)))
+        await asyncio.sleep(0)  # enqueue in this order
+    await asyncio.gather(*tasks)
+    return granted
+
+
+class TestRateLimiter:
+    """Token buckets, priorities, guild fairness and header sync"""
+
+    @pytest.mark.asyncio
+    async def test_interactive_calls_jump_the_bulk_queue(self):
+        limiter = drained_limiter()
+        calls = [(f"bulk{i}", PRIORITY_BULK, 1) for i in range(3)] + [("ask", PRIORITY_INTERACTIVE, 1)]
+
+        assert await run_in_order(limiter, calls) == ["ask", "bulk0", "bulk1", "bulk2"]
+
+    @pytest.mark.asyncio
+    async def test_guilds_take_turns(self):
+        """A guild that queued five calls first can't hold back one that queued two later"""
+        limiter = drained_limiter()
+        calls = [(f"a{i}", PRIORITY_BULK, 1) for i in range(5)] + [(f"b{i}", PRIORITY_BULK, 2) for i in range(2)]
+
+        assert await run_in_order(limiter, calls) == ["a0", "b0", "a1", "b1", "a2", "a3", "a4"]
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_and_cancelled_waiters(self):
+        limiter = drained_limiter(window=60)
+        waiters = [asyncio.create_task(limiter.acquire(10, PRIORITY_BULK, guild)) for guild in (1, 2, 2)]
+        await asyncio.sleep(0)
+
+        stats = limiter.stats()
+        assert (stats['queue_depth'], stats['queued_bulk'], stats['guilds_waiting']) == (3, 3, 2)
+
+        waiters[0].cancel()
+        await asyncio.sleep(0)
+        assert limiter.depth == 2
+
+        limiter.requests.give(1)
+        limiter._pump()  # the cancelled head is skipped; the next guild is served
+        await asyncio.sleep(0)
+        assert waiters[1].done() and not waiters[2].done()
+        waiters[2].cancel()
+
+    @pytest.mark.asyncio
+    async def test_token_budget_and_settling(self):
+        """Calls wait for token budget; usage below the reservation is refunded"""
+        limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=600)
+
+        await limiter.acquire(500)
+        waiter = asyncio.create_task(limiter.acquire(500))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        limiter.settle(estimated=500, used=100)  # 400 tokens come back
+        await asyncio.sleep(0)
+        assert waiter.done()
+
+    def test_headers_sync_budgets(self):
+        limiter = RateLimiter(requests_per_minute=30, tokens_per_minute=12000)
+        limiter.update({
+            'x-ratelimit-limit-tokens': '6000',
+            'x-ratelimit-remaining-tokens': '250',
+            'x-ratelimit-remaining-requests': '0',
+            'x-ratelimit-reset-requests': '2m59.5s',
+        })
+
+        stats = limiter.stats()
+        assert stats['tokens_per_minute'] == 6000
+        assert stats['tokens_available'] < 300
+        assert 170 < stats['paused_seconds'] <= 179.5
+
+    def test_parse_reset(self):
+        assert parse_reset("7.66s") == pytest.approx(7.66)
+        assert parse_reset("2m59.56s") == pytest.approx(179.56)
+        assert parse_reset("1h0m0s") == 3600
+        assert parse_reset("120ms") == pytest.approx(0.12)
+        assert parse_reset("soon") is None
+        assert parse_reset(None) is None
@@ -0,0 +1,82 @@
+"""
+Reminder delivery tests for Cereal Bot
+Run with: python -m pytest tests/
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from cogs.utility import Utility
+from db.repository import reminder_repo
+
+
+def http_error(cls, status):
+    return cls(SimpleNamespace(status=status, reason="stub"), "stub")
+
+
+class StubUser:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content, **kwargs):
+        self.sent.append(content)
+
+
+class StubBot:
+    """A bot whose cache knows no channels, so delivery has to fetch"""
+
+    def __init__(self, channel_error):
+        self.channel_error = channel_error
+        self.user = StubUser()
+
+    async def wait_until_ready(self):
+        pass
+
+    def get_channel(self, channel_id):
+        return None
+
+    async def fetch_channel(self, channel_id):
+        raise self.channel_error
+
+    def get_user(self, user_id):
+        return None
+
+    async def fetch_user(self, user_id):
+        return self.user
+
+
+async def due_reminder():
+    return await reminder_repo.add_reminder(
+        user_id=7, channel_id=8, message="Stretch", remind_at=datetime.utcnow() - timedelta(seconds=1)
+    )
+
+
+class TestReminderDelivery:
+    """Reminders reach the user or stay queued"""
+
+    @pytest.mark.asyncio
+    async def test_gone_channel_falls_back_to_dms(self, database):
+        """A channel that can't be fetched still gets the reminder to the user's DMs"""
+        reminder = await due_reminder()
+        bot = StubBot(http_error(discord.NotFound, 404))
+        cog = Utility(bot)
+
+        await cog._on_due([('reminder', reminder.id)])
+
+        assert bot.user.sent == ["<@7>"]
+        assert await reminder_repo.get_many([reminder.id]) == []
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_keeps_the_row(self, database):
+        """A Discord outage keeps the reminder and reschedules it with backoff"""
+        reminder = await due_reminder()
+        cog = Utility(StubBot(http_error(discord.DiscordServerError, 503)))
+
+        await cog._on_due([('reminder', reminder.id)])
+
+        assert [row.id for row in await reminder_repo.get_many([reminder.id])] == [reminder.id]
+        assert ('reminder', reminder.id) in cog.scheduler
+        assert cog._failed_attempts[('reminder', reminder.id)] == 1
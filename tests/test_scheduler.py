@@ -0,0 +1,117 @@
+"""
+Scheduler tests for Cereal Bot
+Run with: python -m pytest tests/
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.scheduler import DeadlineScheduler, parse_duration
+
+
+def soon(ms: int) -> datetime:
+    return datetime.utcnow() + timedelta(milliseconds=ms)
+
+
+class Recorder:
+    """Scheduler callback that records each batch"""
+
+    def __init__(self):
+        self.batches = []
+        self.fired = asyncio.Event()
+
+    async def __call__(self, keys):
+        self.batches.append(sorted(keys))
+        self.fired.set()
+
+    @property
+    def keys(self):
+        return [key for batch in self.batches for key in batch]
+
+
+class TestDeadlineScheduler:
+    """Heap-driven deadlines fire in order, once, without polling"""
+
+    @pytest.mark.asyncio
+    async def test_fires_in_deadline_order(self):
+        """Keys fire by deadline regardless of insertion order; past deadlines fire at once"""
+        recorder = Recorder()
+        scheduler = DeadlineScheduler('test', recorder)
+        scheduler.schedule('late', soon(120))
+        scheduler.schedule('early', soon(40))
+        scheduler.schedule('overdue', datetime.utcnow() - timedelta(hours=1))
+        scheduler.start()
+
+        try:
+            await asyncio.sleep(0.25)
+        finally:
+            await scheduler.stop()
+
+        assert recorder.keys == ['overdue', 'early', 'late']
+        assert len(scheduler) == 0
+
+    @pytest.mark.asyncio
+    async def test_earlier_deadline_wakes_sleeping_runner(self):
+        """Adding an earlier deadline interrupts a long sleep"""
+        recorder = Recorder()
+        scheduler = DeadlineScheduler('test', recorder)
+        scheduler.schedule('far', datetime.utcnow() + timedelta(hours=1))
+        scheduler.start()
+
+        try:
+            await asyncio.sleep(0.02)
+            scheduler.schedule('near', soon(20))
+            await asyncio.wait_for(recorder.fired.wait(), 1)
+        finally:
+            await scheduler.stop()
+
+        assert recorder.keys == ['near']
+        assert 'far' in scheduler
+
+    @pytest.mark.asyncio
+    async def test_cancel_and_reschedule(self):
+        """Cancelled keys never fire; rescheduled keys fire only at the new deadline"""
+        recorder = Recorder()
+        scheduler = DeadlineScheduler('test', recorder)
+        scheduler.schedule('cancelled', soon(30))
+        scheduler.schedule('moved', soon(30))
+        scheduler.schedule('kept', soon(30))
+        assert scheduler.cancel('cancelled')
+        assert not scheduler.cancel('unknown')
+        scheduler.schedule('moved', datetime.utcnow() + timedelta(hours=1))
+        scheduler.start()
+
+        try:
+            await asyncio.sleep(0.15)
+        finally:
+            await scheduler.stop()
+
+        assert recorder.batches == [['kept']]
+        assert scheduler.next_deadline() > datetime.utcnow() + timedelta(minutes=59)
+
+    @pytest.mark.asyncio
+    async def test_simultaneous_deadlines_are_batched(self):
+        """Everything due together reaches the callback in one call"""
+        recorder = Recorder()
+        scheduler = DeadlineScheduler('test', recorder)
+        deadline = soon(30)
+        for i in range(100):
+            scheduler.schedule(i, deadline)
+        scheduler.start()
+
+        try:
+            await asyncio.wait_for(recorder.fired.wait(), 1)
+        finally:
+            await scheduler.stop()
+
+        assert recorder.batches == [list(range(100))]
+
+    def test_parse_duration(self):
+        """Durations accept single and combined units"""
+        assert parse_duration('10s') == timedelta(seconds=10)
+        assert parse_duration('1h30m') == timedelta(minutes=90)
+        assert parse_duration('2d') == timedelta(days=2)
+        for invalid in ('', 'abc', '5x', '0m', '5m later'):
+            assert parse_duration(invalid) is None
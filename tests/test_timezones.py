@@ -0,0 +1,98 @@
+"""
+Timezone search and rendering tests for Cereal Bot
+Run with: python -m pytest tests/
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from services import timezones
+from services.timezones import TimezoneIndex, get_zone, render, times_in
+
+ALIASES = {
+    'tokyo': 'Asia/Tokyo',
+    'new york': 'America/New_York',
+    'est': 'America/New_York',
+    'london': 'Europe/London',
+}
+DISPLAY = {'est': 'EST(Eastern Standard Time)'}
+IANA = ['Asia/Tokyo', 'America/New_York', 'America/Nome', 'Europe/London', 'UTC']
+
+
+@pytest.fixture
+def index():
+    return TimezoneIndex(ALIASES, DISPLAY, IANA)
+
+
+class TestTimezoneIndex:
+    """Prefix, word-start and fuzzy matching over aliases and IANA names"""
+
+    def test_prefix_ranks_aliases_first(self, index):
+        """Aliases outrank IANA names; display names come from the display map"""
+        assert [m.value for m in index.search('tok')] == ['tokyo', 'Asia/Tokyo']
+        assert index.search('es')[0].display == 'EST(Eastern Standard Time)'
+
+    def test_word_start_and_iana_forms(self, index):
+        """Later words and IANA separators match too"""
+        assert index.search('york')[0].value == 'new york'
+        assert index.search('america/new')[0].value == 'America/New_York'
+        assert index.resolve('America/New_York') == 'America/New_York'
+        assert index.resolve('utc') == 'UTC'
+
+    def test_fuzzy_suggestions_are_not_auto_resolved(self, index):
+        """Typos show up in autocomplete and hints, but never resolve on their own"""
+        assert index.search('tokio')[0].value == 'tokyo'
+        assert index.suggest('londn')[0] == 'London'
+        assert index.resolve('tokio') is None
+        assert index.search('qqqq') == []
+
+    def test_only_unambiguous_prefixes_resolve(self, index):
+        """A prefix resolves only if it is long enough and names one timezone"""
+        assert index.resolve('tok') == 'Asia/Tokyo'
+        assert index.resolve('new') == 'America/New_York'
+        assert index.resolve('to') is None
+        assert index.resolve('america n') is None
+
+    def test_empty_query_lists_aliases(self, index):
+        """With no input, the curated aliases are listed in order"""
+        assert [m.value for m in index.search('', limit=2)] == ['tokyo', 'new york']
+
+
+class TestZoneRendering:
+    """Memoised zoneinfo lookups and per-minute cached formatting"""
+
+    def test_render_fields(self):
+        """Offsets, abbreviations and both clock formats follow DST"""
+        winter = render('America/New_York', datetime(2024, 1, 15, 17, 5, 7, tzinfo=timezone.utc))
+        summer = render('America/New_York', datetime(2024, 7, 15, 17, 5, 7, tzinfo=timezone.utc))
+
+        assert (winter.time_12h, winter.time_24h) == ('12:05:07 PM', '12:05:07')
+        assert (winter.utc_offset, winter.abbreviation) == ('UTC-05:00', 'EST')
+        assert winter.date == 'Monday, January 15, 2024'
+        assert (summer.utc_offset, summer.abbreviation) == ('UTC-04:00', 'EDT')
+
+    def test_minute_fields_are_cached(self):
+        """Within a minute only the seconds change; a new minute re-renders"""
+        first = render('Asia/Tokyo', datetime(2024, 1, 1, 0, 0, 1, tzinfo=timezone.utc))
+        cached = timezones._minute_cache['Asia/Tokyo']
+        second = render('Asia/Tokyo', datetime(2024, 1, 1, 0, 0, 59, tzinfo=timezone.utc))
+
+        assert timezones._minute_cache['Asia/Tokyo'] is cached
+        assert (first.time_24h, second.time_24h) == ('09:00:01', '09:00:59')
+
+        later = render('Asia/Tokyo', datetime(2024, 1, 1, 0, 1, 0, tzinfo=timezone.utc))
+        assert timezones._minute_cache['Asia/Tokyo'] is not cached
+        assert later.time_24h == '09:01:00'
+
+    def test_batch_and_unknown_zones(self):
+        """The batch API renders every zone at one instant and keeps input order"""
+        now = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+        results = times_in(['UTC', 'Not/AZone', 'Asia/Kolkata'], now)
+
+        assert [name for name, _ in results] == ['UTC', 'Not/AZone', 'Asia/Kolkata']
+        assert results[0][1].time_24h == '12:00:00'
+        assert results[1][1] is None
+        assert results[2][1].utc_offset == 'UTC+05:30'
+        assert get_zone('Not/AZone') is None
+        assert get_zone('UTC') is get_zone('UTC')
@@ -0,0 +1,81 @@
+"""
+Tokenizer tests for Cereal Bot
+Run with: python -m pytest tests/
+"""
+
+import base64
+import logging
+import time
+
+import pytest
+
+from services.tokenizer import MESSAGE_OVERHEAD_TOKENS, REPLY_OVERHEAD_TOKENS, Tokenizer, load_tokenizer
+
+# Every single byte, then merges building "cereal" the way BPE would: ce, re, al, cere, cereal
+MERGES = [b"ce", b"re", b"al", b"cere", b"cereal", b" c"]
+
+
+@pytest.fixture
+def vocab_file(tmp_path):
+    tokens = [bytes([i]) for i in range(256)] + MERGES
+    path = tmp_path / "tiny.tiktoken"
+    path.write_bytes(b"".join(base64.b64encode(token) + b" %d\n" % rank for rank, token in enumerate(tokens)))
+    return str(path)
+
+
+class TestTokenizer:
+    """Byte-level BPE from a local vocabulary, with an estimating fallback"""
+
+    def test_bpe_merges_by_rank(self, vocab_file):
+        """Merges apply lowest rank first, and pre-tokens split on words and spaces"""
+        tokenizer = Tokenizer.from_file(vocab_file)
+
+        assert tokenizer.exact
+        assert tokenizer.encode("cereal") == [260]
+        assert tokenizer.encode("cereals") == [260, ord("s")]
+        # "ce" (256) outranks " c" (261), so the space is left on its own
+        assert tokenizer.encode(" cereal") == [ord(" "), 260]
+        assert tokenizer.encode(" cat") == [261, ord("a"), ord("t")]
+        assert tokenizer.count("cereal cereal") == 1 + 2
+        assert tokenizer.count("") == 0
+
+    def test_long_pre_token_merges_quickly(self, vocab_file):
+        """A 10k-character word merges in well under a second, with the same result"""
+        tokenizer = Tokenizer.from_file(vocab_file)
+        word = "cereal" * 1700
+
+        start = time.perf_counter()
+        assert tokenizer.encode(word) == [260] * 1700
+        assert time.perf_counter() - start < 1.0
+        assert tokenizer.encode("cecece") == [256] * 3  # Equal ranks merge leftmost first
+
+    def test_message_overheads(self, vocab_file):
+        """Chat template tokens are included in message counts"""
+        tokenizer = Tokenizer.from_file(vocab_file)
+        messages = [{'role': 'system', 'content': 'cereal'}, {'role': 'user', 'content': ''}]
+
+        assert tokenizer.count_messages(messages) == REPLY_OVERHEAD_TOKENS + 2 * MESSAGE_OVERHEAD_TOKENS + 1
+
+    def test_truncate_cuts_between_pre_tokens(self, vocab_file):
+        tokenizer = Tokenizer.from_file(vocab_file)
+
+        assert tokenizer.truncate("cereal is great", 100) == "cereal is great"
+        assert tokenizer.truncate("cereal is great", 4) == "cereal is"  # 1 + " ", "i", "s"
+        assert tokenizer.truncate("cereal is great", 3) == "cereal"
+
+    def test_fallback_estimates_on_the_high_side(self):
+        """Without a vocabulary, counts come from UTF-8 length and never undercount English"""
+        tokenizer = Tokenizer()
+        text = "The quick brown fox jumps over the lazy dog. " * 10
+
+        assert not tokenizer.exact
+        assert tokenizer.count(text) >= len(text) / 4
+        with pytest.raises(RuntimeError):
+            tokenizer.encode(text)
+
+    def test_missing_vocabulary_falls_back(self, tmp_path, vocab_file, caplog):
+        """A missing vocabulary degrades to estimates, loudly"""
+        with caplog.at_level(logging.WARNING, logger='services.tokenizer'):
+            assert not load_tokenizer(str(tmp_path / "missing.tiktoken")).exact
+        assert "estimated counts" in caplog.text
+        assert load_tokenizer(vocab_file).exact
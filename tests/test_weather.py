@@ -0,0 +1,127 @@
+"""
+Weather service tests for Cereal Bot
+Run with: python -m pytest tests/
+"""
+
+import asyncio
+from collections import Counter
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from core.cache import MemoryCache
+from services.http_client import HttpClient
+from services.weather import CityNotFound, WeatherError, WeatherService
+
+GEOCODES = {
+    'london': [{'name': 'London', 'country': 'GB', 'lat': 51.5073, 'lon': -0.1276}],
+}
+CONDITIONS = {
+    'main': {'temp': 12.5, 'feels_like': 11.0, 'humidity': 80, 'pressure': 1012},
+    'wind': {'speed': 4.1},
+    'weather': [{'description': 'light rain', 'icon': '10d'}],
+}
+
+
+class StubOpenWeatherMap:
+    """Local stand-in for the OpenWeatherMap geocode and weather endpoints"""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.delay = 0.0
+        self.fail = False
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/geo/1.0/direct', self.geocode)
+        app.router.add_get('/data/2.5/weather', self.weather)
+        return app
+
+    async def geocode(self, request: web.Request) -> web.Response:
+        self.calls['geocode'] += 1
+        await asyncio.sleep(self.delay)
+        return web.json_response(GEOCODES.get(request.query['q'], []))
+
+    async def weather(self, request: web.Request) -> web.Response:
+        self.calls['weather'] += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            return web.json_response({'message': 'boom'}, status=500)
+        return web.json_response(CONDITIONS)
+
+
+@pytest_asyncio.fixture
+async def upstream():
+    stub = StubOpenWeatherMap()
+    server = TestServer(stub.app())
+    await server.start_server()
+    stub.url = str(server.make_url(''))
+    yield stub
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def client():
+    # No retries, so upstream call counts are exact
+    http = HttpClient(max_retries=0)
+    await http.start()
+    yield http
+    await http.close()
+
+
+@pytest.fixture
+def service(upstream, client):
+    return WeatherService(
+        api_key='test',
+        base_url=upstream.url,
+        geocode_cache=MemoryCache('test_geocode', ttl=60),
+        weather_cache=MemoryCache('test_weather', ttl=60),
+        client=client,
+    )
+
+
+class TestWeatherService:
+    """Caching and coalescing of OpenWeatherMap lookups"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_lookups_are_cached(self, upstream, service):
+        """Differently typed names for one city share the geocode and the weather entry"""
+        first = await service.get_weather('London')
+        second = await service.get_weather('  LONDON ')
+
+        assert first == second
+        assert (first.city, first.country, first.temp, first.description) == ('London', 'GB', 12.5, 'Light Rain')
+        assert upstream.calls == {'geocode': 1, 'weather': 1}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_coalesced(self, upstream, service):
+        """Fifty simultaneous requests cost one geocode and one weather call"""
+        upstream.delay = 0.05
+        reports = await asyncio.gather(*(service.get_weather('london') for _ in range(50)))
+
+        assert len(set(reports)) == 1
+        assert upstream.calls == {'geocode': 1, 'weather': 1}
+        assert service.coalesced == 98
+        assert service.stats()['in_flight'] == 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_city_is_negatively_cached(self, upstream, service):
+        """A city the geocoder doesn't know raises without asking twice"""
+        for _ in range(3):
+            with pytest.raises(CityNotFound):
+                await service.get_weather('atlantis')
+        assert upstream.calls == {'geocode': 1}
+
+    @pytest.mark.asyncio
+    async def test_upstream_errors_are_not_cached(self, upstream, service):
+        """A failed weather call is retried on the next request"""
+        upstream.fail = True
+        with pytest.raises(WeatherError):
+            await service.get_weather('london')
+
+        upstream.fail = False
+        report = await service.get_weather('london')
+        assert report.city == 'London'
+        assert upstream.calls == {'geocode': 1, 'weather': 2}